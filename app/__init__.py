@@ -1,12 +1,29 @@
 """Main application module for calculator REPL interface."""
 
-import importlib
+import contextlib
+import io
 import logging
-import logging.handlers
 import os
-import pkgutil
-from dotenv import load_dotenv
-from app.commands import Command, CommandHandler
+import sys
+from pathlib import Path
+from app.commands import CommandHandler, execute_timed
+from app.logging_setup import DEFAULT_LOG_OUTPUT, configure_logging
+from app.plugin_manifest import LazyCommand, load_manifest
+from app.settings import get_settings
+from app.calculator_config import Config
+from calculator.history.history import OperationHistory
+
+SCRIPT_FLUSH_LINES = 1000
+
+
+class _DiscardOutput(io.TextIOBase):
+    """Text sink used to suppress per-command prints in quiet script mode."""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return len(text)
 
 
 class App:
@@ -19,6 +36,10 @@ class App:
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
         self.logger.info("Application is Starting")
+        OperationHistory.configure(**Config.history_options())
+        Config.configure_engine()
+        Config.configure_journal()
+        Config.configure_metrics()
         self.command_handler = CommandHandler()
         self.load_plugins()
         self.logger.info("Application initialized")
@@ -26,34 +47,17 @@ class App:
             self.run_repl()
 
     def setup_logging(self):
-        """Configure logging using environment variables."""
-        log_level = self.settings.get('LOG_LEVEL', 'INFO').upper()
-        log_output = self.settings.get('LOG_OUTPUT', './logs/app.log')
-
-        os.makedirs(os.path.dirname(log_output), exist_ok=True)
-        numeric_level = getattr(logging, log_level, logging.INFO)
-
-        logging.basicConfig(
-            level=numeric_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.handlers.RotatingFileHandler(
-                    filename=log_output,
-                    maxBytes=1048576,
-                    backupCount=5
-                )
-            ]
-        )
-
-        # Test logger
-        test_logger = logging.getLogger("setup_test")
-        test_logger.info("Logging configured successfully with level %s at %s", log_level, log_output)
+        """Configure the shared queue-based logging pipeline from the settings."""
+        configure_logging()
+        logging.getLogger("setup_test").info(
+            "Logging configured successfully with level %s at %s",
+            self.settings.get('LOG_LEVEL', 'INFO').upper(),
+            self.settings.get('LOG_OUTPUT', DEFAULT_LOG_OUTPUT))
 
     def load_environment(self):
         """Load environment variables from .env file."""
         try:
-            load_dotenv()
-            self.settings = dict(os.environ)
+            self.settings = get_settings()
             environment = self.get_environment_variable('ENVIRONMENT')
             print("Environment variables loaded successfully")
             print(f"Current environment: {environment}")
@@ -69,7 +73,7 @@ class App:
         return value
 
     def load_plugins(self):
-        """Discover and register plugin commands from plugins directory."""
+        """Register plugin commands from the cached manifest; plugins import on first use."""
         plugins_package = 'app.plugins'
         self.logger.info("Starting plugin loading process")
         plugins_path = plugins_package.replace('.', '/')
@@ -77,25 +81,12 @@ class App:
             self.logger.error("Plugin directory %s not found", plugins_path)
             return
 
-        for module_info in pkgutil.iter_modules([plugins_path]):
-            self._process_plugin_module(plugins_package, module_info.name)
-
-    def _process_plugin_module(self, plugins_package: str, plugin_name: str):
-        try:
-            plugin_module = importlib.import_module(f'{plugins_package}.{plugin_name}')
-            self._register_commands_from_module(plugin_module)
-        except Exception as error:
-            self.logger.error("Error loading plugin %s: %s", plugin_name, str(error), exc_info=True)
-
-    def _register_commands_from_module(self, plugin_module):
-        for item_name in dir(plugin_module):
-            item = getattr(plugin_module, item_name)
-            if not isinstance(item, type) or not issubclass(item, Command) or item == Command:
-                continue
-            command_instance = item() if item_name != 'MenuCommand' else item(self.command_handler)
-            # Use lowercase class name without 'Command' suffix as command key
-            command_key = item_name.replace('Command', '').lower()
-            self.command_handler.register_command(command_key, command_instance)
+        manifest_path = Path(self.settings.get('PLUGIN_MANIFEST', './.cache/plugin_manifest.json'))
+        manifest = load_manifest(Path(plugins_path), plugins_package, manifest_path)
+        for command_key, entry in manifest['commands'].items():
+            init_args = (self.command_handler,) if entry['class'] == 'MenuCommand' else ()
+            command = LazyCommand(command_key, entry['module'], entry['class'], *init_args)
+            self.command_handler.register_command(command_key, command)
             self.logger.info("Registered command: %s", command_key)
 
     def show_commands(self):
@@ -140,6 +131,52 @@ class App:
             self.logger.critical("REPL session failed", exc_info=True)
             raise e
 
+    def run_script(self, stream, quiet: bool = False, log_commands: bool = False,
+                   output=None, flush_lines: int = SCRIPT_FLUSH_LINES) -> int:
+        """Run commands from a file-like object without prompting.
+
+        Output is buffered and written every `flush_lines` commands, and
+        history appends are batched. Blank lines and lines starting with '#'
+        are skipped; 'exit' stops the script.
+
+        Args:
+            stream: Iterable of command lines (file, sys.stdin, list)
+            quiet: Suppress command output entirely
+            log_commands: Log every command line at DEBUG level
+            output: Destination for command output, defaults to sys.stdout
+            flush_lines: Commands executed between output flushes
+
+        Returns:
+            Number of commands executed
+        """
+        output = output or sys.stdout
+        buffer = _DiscardOutput() if quiet else io.StringIO()
+        executed = 0
+        self.logger.info("Running script mode (quiet=%s)", quiet)
+        try:
+            with contextlib.redirect_stdout(buffer), OperationHistory.batched(flush_lines):
+                for line in stream:
+                    user_input = line.strip()
+                    if not user_input or user_input.startswith('#'):
+                        continue
+                    if log_commands:
+                        self.logger.debug("Script input: %s", user_input)
+                    if user_input.lower() == "exit":
+                        break
+                    self._execute_command(user_input)
+                    executed += 1
+                    if not quiet and executed % flush_lines == 0:
+                        output.write(buffer.getvalue())
+                        buffer.seek(0)
+                        buffer.truncate()
+        finally:
+            # Output of the commands before an uncaught exception is not lost
+            if not quiet:
+                output.write(buffer.getvalue())
+            output.flush()
+        self.logger.info("Script mode executed %d commands", executed)
+        return executed
+
     def _execute_command(self, user_input: str):
         parts = user_input.split()
         if not parts:
@@ -149,7 +186,7 @@ class App:
         command = self.command_handler.commands.get(command_name)
         if command and callable(command.execute):
             try:
-                command.execute(*args) if args else command.execute()
+                execute_timed(command_name, command, *args)
             except TypeError as e:
                 print(f"Error: {e}")
         else:
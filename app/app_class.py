@@ -1,13 +1,15 @@
-from app.history import History
 from app.logger import Logger
 from app.calculator_config import Config
+from app.commands import CommandHandler, execute_timed
 from decimal import Decimal
-from app.plugins import square, power, modulus
+from app.plugins import square, power, powmod, modulus
 from calculator.engine import CalcEngine
+from calculator.history.history import OperationHistory
 from app.plugins.root import Root
 from app.plugins.int_divide import IntDivide
 from app.plugins.percent import Percent
 from app.plugins.abs_diff import AbsDiff
+from app.plugins.history_facade import HistoryFacade
 
 
 class App:
@@ -15,9 +17,16 @@ class App:
 
     def __init__(self):
         print("Calculator App Started\n")
+        OperationHistory.configure(**Config.history_options())
+        Config.configure_engine()
+        Config.configure_metrics()
         self.show_welcome()
         self.run_demo()
-	self.history = History()
+        # The demo only illustrates the plugins: keep it out of the history
+        # and open the journal afterwards so it is never persisted.
+        OperationHistory.clear_records()
+        Config.configure_journal()
+        self.register_commands()
         self.command_loop()  # <-- Add this
 
     def show_welcome(self):
@@ -29,6 +38,7 @@ class App:
         print(" - divide")
         print(" - square")
         print(" - power")
+        print(" - powmod")
         print(" - modulus")
         print(" - root")
         print(" - int_divide")
@@ -41,6 +51,8 @@ class App:
         print("Plugin Demo:")
         print("Square 5:", square.square_number(Decimal(5)))
         print("2 ^ 3:", power.power_numbers(Decimal(2), Decimal(3)))
+        print("7 ^ 10000000 mod 13:",
+              powmod.powmod_numbers(Decimal(7), Decimal(10000000), Decimal(13)))
         print("10 % 3:", modulus.mod_numbers(Decimal(10), Decimal(3)))
         print("Cube root of 27:", Root().calculate(Decimal(27), Decimal(3)))
         print("Integer Divide 10 // 3:", IntDivide().calculate(Decimal(10), Decimal(3)))
@@ -48,8 +60,52 @@ class App:
         print("Absolute Difference 10 and 3:", AbsDiff().calculate(Decimal(10), Decimal(3)))
 
 
+    def register_commands(self):
+        """Build the dispatch table: command -> (callable, arity, argument parser)."""
+        handler = self.command_handler = CommandHandler()
+        for name, func, arity in (
+            ("square", square.square_number, 1),
+            ("power", power.power_numbers, 2),
+            ("powmod", powmod.powmod_numbers, 3),
+            ("modulus", modulus.mod_numbers, 2),
+            ("add", CalcEngine.sum_values, 2),
+            ("subtract", CalcEngine.difference, 2),
+            ("multiply", CalcEngine.product, 2),
+            ("divide", CalcEngine.quotient, 2),
+            # Plugin instances are created once, not per command
+            ("root", Root().calculate, 2),
+            ("int_divide", IntDivide().calculate, 2),
+            ("percent", Percent().calculate, 2),
+            ("abs_diff", AbsDiff().calculate, 2),
+        ):
+            handler.register_function(name, func, arity)
+        for name, func in (
+            ("undo", self.undo),
+            ("redo", self.redo),
+            ("history", self.show_history),
+            ("clear", self.clear_history),
+        ):
+            handler.register_function(name, func, 0, parser=None)
+
+    def undo(self):
+        undone = HistoryFacade.undo()
+        return f"Undid: {undone[0]}" if undone else "Nothing to undo."
+
+    def redo(self):
+        redone = HistoryFacade.redo()
+        return f"Redid: {redone[0]}" if redone else "Nothing to redo."
+
+    def show_history(self):
+        for item in HistoryFacade.get_formatted_history():
+            print(item)
+
+    def clear_history(self):
+        HistoryFacade.clear_history()
+        return "History cleared."
+
     def command_loop(self):
         """Interactive loop for user input."""
+        commands = self.command_handler.commands
         while True:
             user_input = input("> ").strip()
             if not user_input:
@@ -62,57 +118,19 @@ class App:
                 continue
 
             # Split command and arguments
-            parts = user_input.split()
-            command, *args = parts
+            command, *args = user_input.split()
+            entry = commands.get(command)
+            if entry is None or len(args) != entry.arity:
+                print("Unknown command or wrong number of arguments.")
+                continue
 
             try:
-                args = [Decimal(a) for a in args]
-                if command == "square" and len(args) == 1:
-                    print(square.square_number(args[0]))
-                elif command == "power" and len(args) == 2:
-                    print(power.power_numbers(args[0], args[1]))
-                elif command == "modulus" and len(args) == 2:
-                    print(modulus.mod_numbers(args[0], args[1]))
-                elif command == "add" and len(args) == 2:
-                    print(CalcEngine.sum_values(args[0], args[1]))
-                elif command == "subtract" and len(args) == 2:
-                    print(CalcEngine.difference(args[0], args[1]))
-                elif command == "multiply" and len(args) == 2:
-                    print(CalcEngine.product(args[0], args[1]))
-                elif command == "divide" and len(args) == 2:
-                    print(CalcEngine.quotient(args[0], args[1]))
-                elif command == "root" and len(args) == 2:
-                    print(Root().calculate(args[0], args[1]))
-                elif command == "int_divide" and len(args) == 2:
-                    print(IntDivide().calculate(args[0], args[1]))
-                elif command == "percent" and len(args) == 2:
-                    print(Percent().calculate(args[0], args[1]))
-                elif command == "abs_diff" and len(args) == 2:
-                    print(AbsDiff().calculate(args[0], args[1]))
-                elif command == "undo":
-		    undone = self.history.undo()
-		    print(f"Undid: {undone}" if undone else "Nothing to undo.")
-		elif command == "redo":
-		    redone = self.history.redo()
-		    print(f"Redid: {redone}" if redone else "Nothing to redo.")
-		elif command == "history":
-		    for item in self.history.get_all():
-		        print(item)
-		elif command == "clear":
-		    self.history.clear()
-		    print("History cleared.")
-		else:
-                    print("Unknown command or wrong number of arguments.")
-		    result = None
-
-    		# If calculation succeeded, log and save to history
-    		if result is not None:
-		        Logger.log(f"{command} {args} = {result}")
-		        self.history.add(f"{command} {args} = {result}")
-		        print(result)
-	except Exception as e:
+                result = execute_timed(command, entry, *args)
+                if result is not None:
+                    print(result)
+            except Exception as e:
                 print("Error:", e)
-		Logger.log(f"Error performing {command} {args}: {e}")
+                Logger.log(f"Error performing {command} {args}: {e}")
 
     def run(self):
         while True:
@@ -1,18 +1,140 @@
-import os
-from dotenv import load_dotenv
-
-# Load .env
-load_dotenv()
-
-class Config:
-    LOG_DIR = os.getenv("CALCULATOR_LOG_DIR", "logs")
-    HISTORY_DIR = os.getenv("CALCULATOR_HISTORY_DIR", "history")
-    MAX_HISTORY_SIZE = int(os.getenv("CALCULATOR_MAX_HISTORY_SIZE", 50))
-    AUTO_SAVE = os.getenv("CALCULATOR_AUTO_SAVE", "true").lower() == "true"
-    PRECISION = int(os.getenv("CALCULATOR_PRECISION", 4))
-    MAX_INPUT_VALUE = float(os.getenv("CALCULATOR_MAX_INPUT_VALUE", 100000))
-    DEFAULT_ENCODING = os.getenv("CALCULATOR_DEFAULT_ENCODING", "utf-8")
-
-# Ensure directories exist
-os.makedirs(Config.LOG_DIR, exist_ok=True)
-os.makedirs(Config.HISTORY_DIR, exist_ok=True)
+import atexit
+import logging
+from pathlib import Path
+
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_bool(value) -> bool:
+    return str(value).lower() == "true"
+
+
+# Attribute name -> (environment variable, parser, default)
+_FIELDS = {
+    "LOG_DIR": ("CALCULATOR_LOG_DIR", str, "logs"),
+    "HISTORY_DIR": ("CALCULATOR_HISTORY_DIR", str, "history"),
+    "MAX_HISTORY_SIZE": ("CALCULATOR_MAX_HISTORY_SIZE", int, 50),
+    "AUTO_SAVE": ("CALCULATOR_AUTO_SAVE", _parse_bool, "true"),
+    "PRECISION": ("CALCULATOR_PRECISION", int, 4),
+    "NUMERIC_MODE": ("CALCULATOR_NUMERIC_MODE", str, "exact"),
+    "MAX_INPUT_VALUE": ("CALCULATOR_MAX_INPUT_VALUE", float, 100000),
+    "DEFAULT_ENCODING": ("CALCULATOR_DEFAULT_ENCODING", str, "utf-8"),
+    "HISTORY_BACKEND": ("CALCULATOR_HISTORY_BACKEND", str, "object"),
+    "HISTORY_POLICY": ("CALCULATOR_HISTORY_POLICY", str, "fifo"),
+    "HISTORY_TTL_SECONDS": ("CALCULATOR_HISTORY_TTL_SECONDS", float, 3600),
+    "HISTORY_PER_OPERATION_CAP": ("CALCULATOR_HISTORY_PER_OPERATION_CAP", int, 10),
+    "HISTORY_UNDO_DEPTH": ("CALCULATOR_HISTORY_UNDO_DEPTH", int, 100),
+    "RESULT_CACHE_BYTES": ("CALCULATOR_RESULT_CACHE_BYTES", int, 0),
+    "WORKER_PROCESSES": ("CALCULATOR_WORKER_PROCESSES", int, 2),
+    "OPERATION_TIMEOUT_SECONDS": ("CALCULATOR_OPERATION_TIMEOUT_SECONDS", float, 10),
+    "SERVER_IO_WORKERS": ("CALCULATOR_SERVER_IO_WORKERS", int, 4),
+    "SERVER_MAX_LINE_BYTES": ("CALCULATOR_SERVER_MAX_LINE_BYTES", int, 65536),
+    "JOURNAL_FSYNC_SECONDS": ("CALCULATOR_JOURNAL_FSYNC_SECONDS", float, 0.1),
+    "JOURNAL_COMPACT_RECORDS": ("CALCULATOR_JOURNAL_COMPACT_RECORDS", int, 10000),
+    "METRICS_ENABLED": ("CALCULATOR_METRICS_ENABLED", _parse_bool, "true"),
+    "METRICS_FILE": ("CALCULATOR_METRICS_FILE", str, ""),
+    "METRICS_INTERVAL_SECONDS": ("CALCULATOR_METRICS_INTERVAL_SECONDS", float, 15),
+}
+
+
+class _LazyConfig(type):
+    """Resolves Config attributes from the shared settings on first access."""
+
+    def __getattr__(cls, name):
+        try:
+            env_var, parse, default = _FIELDS[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = parse(get_settings().get(env_var, default))
+        setattr(cls, name, value)
+        return value
+
+
+class Config(metaclass=_LazyConfig):
+    _metrics_exporter = None
+
+    @classmethod
+    def reload(cls) -> None:
+        """Drop cached values so they are read again from the settings."""
+        for name in _FIELDS:
+            if name in cls.__dict__:
+                delattr(cls, name)
+
+    @classmethod
+    def configure_engine(cls) -> None:
+        """Apply the numeric mode, result cache and worker pool settings to CalcEngine."""
+        from calculator import CalcEngine  # pylint: disable=import-outside-toplevel
+        mode = cls.NUMERIC_MODE.strip().lower()
+        CalcEngine.configure_numeric(None if mode == "off" else mode, cls.PRECISION)
+        CalcEngine.configure_result_cache(cls.RESULT_CACHE_BYTES)
+        CalcEngine.configure_worker_pool(cls.WORKER_PROCESSES, cls.OPERATION_TIMEOUT_SECONDS)
+
+    @classmethod
+    def configure_journal(cls) -> int:
+        """
+        With AUTO_SAVE, replay the history journal and journal new operations.
+
+        The journal lives in HISTORY_DIR/journal. Without AUTO_SAVE any
+        open journal is closed and nothing is replayed.
+
+        Returns:
+            Number of records replayed into the history.
+        """
+        # pylint: disable=import-outside-toplevel
+        from calculator import CalcEngine
+        from calculator.history.history import OperationHistory
+        from calculator.history.journal import HistoryJournal
+        CalcEngine.configure_journal(None)
+        if not cls.AUTO_SAVE:
+            return 0
+        journal = HistoryJournal(Path(cls.HISTORY_DIR) / "journal",
+                                 fsync_interval=cls.JOURNAL_FSYNC_SECONDS,
+                                 compact_records=cls.JOURNAL_COMPACT_RECORDS,
+                                 keep=cls.MAX_HISTORY_SIZE)
+        records = list(journal.replay())
+        OperationHistory.add_records(records)
+        CalcEngine.configure_journal(journal)
+        atexit.register(journal.close)
+        logger.info("Replayed %d records from the history journal", len(records))
+        return len(records)
+
+    @classmethod
+    def configure_metrics(cls):
+        """
+        Enable or disable latency metrics and start the Prometheus file exporter.
+
+        The exporter only runs when METRICS_FILE is set; it rewrites the file
+        every METRICS_INTERVAL_SECONDS and once more at exit.
+
+        Returns:
+            The running PrometheusFileExporter, or None.
+        """
+        # pylint: disable=import-outside-toplevel
+        from calculator.metrics import METRICS, PrometheusFileExporter
+        if cls._metrics_exporter is not None:
+            atexit.unregister(cls._metrics_exporter.stop)
+            cls._metrics_exporter.stop()
+            cls._metrics_exporter = None
+        METRICS.enabled = cls.METRICS_ENABLED
+        if not (cls.METRICS_ENABLED and cls.METRICS_FILE):
+            return None
+        exporter = PrometheusFileExporter(METRICS, cls.METRICS_FILE,
+                                          cls.METRICS_INTERVAL_SECONDS)
+        exporter.start()
+        atexit.register(exporter.stop)
+        cls._metrics_exporter = exporter
+        return exporter
+
+    @classmethod
+    def history_options(cls) -> dict:
+        """Keyword arguments for OperationHistory.configure."""
+        return {
+            "max_size": cls.MAX_HISTORY_SIZE,
+            "policies": cls.HISTORY_POLICY.split(","),
+            "ttl": cls.HISTORY_TTL_SECONDS,
+            "per_operation_cap": cls.HISTORY_PER_OPERATION_CAP,
+            "backend": cls.HISTORY_BACKEND,
+            "undo_depth": cls.HISTORY_UNDO_DEPTH,
+        }
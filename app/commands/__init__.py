@@ -1,11 +1,30 @@
 """Commands"""
 from abc import ABC, abstractmethod
+from decimal import Decimal
+from time import perf_counter_ns
+from typing import Callable, Optional
+from calculator.metrics import METRICS
 
 class Command(ABC): # pylint: disable=too-few-public-methods
     """Abstract Class"""
     @abstractmethod
     def execute(self):
         """Pass"""        
+class FunctionCommand(Command): # pylint: disable=too-few-public-methods
+    """Dispatch table entry: a callable, its arity and the parser applied to each argument"""
+    def __init__(self, func: Callable, arity: int, parser: Optional[Callable] = Decimal):
+        self.func = func
+        self.arity = arity
+        self.parser = parser
+
+    def execute(self, *args):  # pylint: disable=arguments-differ
+        """Check the arity, then parse the arguments and call the function."""
+        if len(args) != self.arity:
+            raise TypeError(f"expected {self.arity} arguments, got {len(args)}")
+        if self.parser is not None:
+            args = map(self.parser, args)
+        return self.func(*args)
+
 class CommandHandler:
     """Handler"""
     def __init__(self):
@@ -15,8 +34,27 @@ class CommandHandler:
         """Registration of Commands"""
         self.commands[command_name] = command
 
-    def execute_command(self, command_name: str):
+    def register_function(self, command_name: str, func: Callable, arity: int,
+                          parser: Optional[Callable] = Decimal):
+        """Register a callable taking `arity` arguments, each converted by `parser`"""
+        self.register_command(command_name, FunctionCommand(func, arity, parser))
+
+    def execute_command(self, command_name: str, *args):
         try:
-            self.commands[command_name].execute()
+            command = self.commands[command_name]
         except KeyError:
             print(f"No such command: {command_name}")
+            return None
+        return execute_timed(command_name, command, *args)
+
+
+def execute_timed(command_name: str, command: Command, *args):
+    """Execute a command, recording its latency and failures in METRICS."""
+    started = perf_counter_ns()
+    failed = True
+    try:
+        result = command.execute(*args)
+        failed = False
+        return result
+    finally:
+        METRICS.observe("command", command_name, perf_counter_ns() - started, failed)
@@ -1,16 +1,13 @@
 import logging
-import os
-from app.calculator_config import Config
+from app.logging_setup import configure_logging, is_configured
 
-log_file = os.path.join(Config.LOG_DIR, "calculator.log")
+logger = logging.getLogger("calculator")
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
 
 class Logger:
     @staticmethod
     def log(message: str):
-        logging.info(message)
+        # Shares the app's queue-based pipeline; set up on first use
+        if not is_configured():
+            configure_logging()
+        logger.info(message)
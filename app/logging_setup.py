@@ -0,0 +1,183 @@
+"""Unified, non-blocking logging setup.
+
+Log calls only put records on an in-memory queue; a background
+QueueListener thread formats them and writes the rotating log file, so no
+disk I/O happens on the command path. High-volume messages are throttled
+per message template by RateLimitFilter and, optionally, sampled by
+SampleFilter before they are queued.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from app.settings import get_settings
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_LOG_OUTPUT = './logs/app.log'
+MAX_LOG_BYTES = 1048576
+LOG_BACKUPS = 5
+# Message templates tracked per filter; the least recently seen are forgotten
+MAX_TRACKED_TEMPLATES = 1024
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_lock = threading.Lock()
+
+
+def template_key(record: logging.LogRecord) -> Hashable:
+    """Group records by logger and message template.
+
+    %-style calls share their format string. A message without arguments,
+    e.g. an f-string, is already formatted, so its call site is used instead
+    of the text.
+    """
+    if record.args:
+        return record.name, record.msg
+    return record.name, record.pathname, record.lineno
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per (logger, message template) for records below max_level.
+
+    Args:
+        rate: Records per second allowed for each message template
+        burst: Records allowed at once before throttling starts
+        max_level: Records at this level or above are never throttled
+        max_templates: Buckets kept; the least recently used are dropped
+    """
+
+    def __init__(self, rate: float = 100.0, burst: int = 200,
+                 max_level: int = logging.ERROR, max_templates: int = MAX_TRACKED_TEMPLATES):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_level = max_level
+        self.max_templates = max(1, max_templates)
+        self.suppressed = 0
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.max_level or self.rate <= 0:
+            return True
+        now = time.monotonic()
+        key = template_key(record)
+        with self._lock:
+            # bucket: [tokens, last refill time, suppressed since last pass]
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+                if len(self._buckets) > self.max_templates:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.msg = f"{record.getMessage()} ({dropped} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Keep one of every `every` records per message template at or below max_level.
+
+    At most `max_templates` counters are kept; a forgotten template starts
+    again with a kept record.
+    """
+
+    def __init__(self, every: int = 1, max_level: int = logging.DEBUG,
+                 max_templates: int = MAX_TRACKED_TEMPLATES):
+        super().__init__()
+        self.every = max(1, every)
+        self.max_level = max_level
+        self.max_templates = max(1, max_templates)
+        self._counts: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or record.levelno > self.max_level:
+            return True
+        key = template_key(record)
+        with self._lock:
+            count = self._counts.pop(key, 0)
+            self._counts[key] = count + 1
+            if len(self._counts) > self.max_templates:
+                self._counts.popitem(last=False)
+        return count % self.every == 0
+
+
+def configure_logging(level: Optional[str] = None, output: Optional[str] = None,
+                      rate_limit: Optional[float] = None,
+                      sample_every: Optional[int] = None) -> logging.Handler:
+    """Install the queue-based logging pipeline on the root logger.
+
+    Values not given are read from the LOG_LEVEL, LOG_OUTPUT, LOG_RATE_LIMIT
+    and LOG_SAMPLE_EVERY settings. Calling it again replaces the previous
+    pipeline, so the app and every entry point share one setup.
+
+    Returns:
+        The QueueHandler attached to the root logger
+    """
+    global _listener, _queue_handler  # pylint: disable=global-statement
+    settings = get_settings()
+    level = (level or settings.get('LOG_LEVEL', 'INFO')).upper()
+    output = output or settings.get('LOG_OUTPUT', DEFAULT_LOG_OUTPUT)
+    rate_limit = settings.get_float('LOG_RATE_LIMIT', 100.0) if rate_limit is None else rate_limit
+    sample_every = settings.get_int('LOG_SAMPLE_EVERY', 1) if sample_every is None else sample_every
+
+    with _lock:
+        shutdown_logging()
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=output, maxBytes=MAX_LOG_BYTES, backupCount=LOG_BACKUPS)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue = queue.SimpleQueue()
+        handler = logging.handlers.QueueHandler(log_queue)
+        handler.addFilter(RateLimitFilter(rate=rate_limit, burst=max(1, int(rate_limit * 2))))
+        handler.addFilter(SampleFilter(every=sample_every))
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+        _queue_handler = handler
+
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, level, logging.INFO))
+        root.addHandler(handler)
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Detach the queue handler and flush queued records to disk."""
+    global _listener, _queue_handler  # pylint: disable=global-statement
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def is_configured() -> bool:
+    """Return True once configure_logging has installed the pipeline."""
+    return _queue_handler is not None
+
+
+atexit.register(shutdown_logging)
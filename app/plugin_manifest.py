@@ -0,0 +1,176 @@
+"""Cached plugin manifest and lazily imported plugin commands."""
+
+import ast
+import builtins
+import importlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.commands import Command
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 3
+# Bases that never make a class a command, e.g. object or Exception
+_BUILTIN_BASES = frozenset(name for name in dir(builtins)
+                           if isinstance(getattr(builtins, name), type))
+
+
+def command_key(class_name: str) -> str:
+    """Command name for a plugin class, e.g. HistoryShowCommand -> historyshow."""
+    return class_name.replace('Command', '').lower()
+
+
+def _plugin_sources(plugins_path: Path) -> Dict[str, Path]:
+    """Map plugin module names to the source file defining their commands."""
+    sources = {}
+    for entry in sorted(os.scandir(plugins_path), key=lambda e: e.name):
+        path = Path(entry.path)
+        if entry.is_dir() and (path / '__init__.py').is_file():
+            sources[entry.name] = path / '__init__.py'
+        elif entry.is_file() and path.suffix == '.py' and path.stem != '__init__':
+            sources[path.stem] = path
+    return sources
+
+
+def _file_stamps(sources: Dict[str, Path]) -> Dict[str, list]:
+    """
+    mtime and size of every plugin file, from one os.scandir per plugin package.
+
+    A package is stamped with the Python files directly inside it, so adding,
+    removing or editing a helper module invalidates the cache too.
+    """
+    stamps = {}
+    for source in sources.values():
+        if source.name != '__init__.py':
+            stat = source.stat()
+            stamps[str(source)] = [stat.st_mtime_ns, stat.st_size]
+            continue
+        with os.scandir(source.parent) as entries:
+            for entry in entries:
+                if entry.name.endswith('.py') and entry.is_file():
+                    stat = entry.stat()
+                    stamps[entry.path] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def _base_name(base: ast.expr) -> str:
+    return base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', '')
+
+
+def _command_classes(source: Path) -> Tuple[List[str], bool]:
+    """
+    Find Command subclasses defined in a plugin source file.
+
+    Subclasses of other classes in the same file are followed. Returns the
+    class names and whether every base class could be resolved this way;
+    a class derived from an imported base cannot be classified without
+    importing the module.
+    """
+    tree = ast.parse(source.read_text(encoding='utf-8'), filename=str(source))
+    classes = {node.name: [_base_name(base) for base in node.bases]
+               for node in tree.body if isinstance(node, ast.ClassDef)}
+    commands = {'Command'}
+    changed = True
+    while changed:
+        changed = False
+        for name, bases in classes.items():
+            if name not in commands and commands.intersection(bases):
+                commands.add(name)
+                changed = True
+    resolved = all(base in classes or base in commands or base in _BUILTIN_BASES
+                   for bases in classes.values() for base in bases)
+    return [name for name in classes if name in commands], resolved
+
+
+def _imported_command_classes(module_name: str) -> List[str]:
+    """Names of Command subclasses a plugin module exposes, found by importing it."""
+    plugin_module = importlib.import_module(module_name)
+    return [name for name in dir(plugin_module)
+            if isinstance(getattr(plugin_module, name), type)
+            and issubclass(getattr(plugin_module, name), Command)
+            and getattr(plugin_module, name) is not Command]
+
+
+def build_manifest(plugins_path: Path, plugins_package: str) -> dict:
+    """
+    Scan plugin sources and build a manifest.
+
+    Sources are parsed without importing them. A plugin whose source
+    defines no command, e.g. one that re-exports classes from a submodule,
+    or whose classes derive from imported bases is imported instead.
+    """
+    sources = _plugin_sources(plugins_path)
+    commands = {}
+    for module_name, source in sources.items():
+        module = f'{plugins_package}.{module_name}'
+        try:
+            class_names, resolved = _command_classes(source)
+            if not class_names or not resolved:
+                logger.debug("Importing plugin %s to find its commands", module)
+                class_names = _imported_command_classes(module)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Error scanning plugin %s: %s", module_name, error)
+            continue
+        for class_name in class_names:
+            commands[command_key(class_name)] = {'module': module, 'class': class_name}
+    return {'version': MANIFEST_VERSION, 'files': _file_stamps(sources), 'commands': commands}
+
+
+def load_manifest(plugins_path: Path, plugins_package: str, cache_path: Path) -> dict:
+    """
+    Return the plugin manifest, rebuilding the cache if any plugin file changed.
+
+    The cache is valid while the set of plugin files and their mtimes and
+    sizes are unchanged, so a warm start only stats files.
+    """
+    sources = _plugin_sources(plugins_path)
+    try:
+        cached = json.loads(cache_path.read_text(encoding='utf-8'))
+        if cached.get('version') == MANIFEST_VERSION and cached.get('files') == _file_stamps(sources):
+            logger.debug("Using cached plugin manifest %s", cache_path)
+            return cached
+    except (OSError, ValueError):
+        pass
+    manifest = build_manifest(plugins_path, plugins_package)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+        logger.info("Rebuilt plugin manifest with %d commands", len(manifest['commands']))
+    except OSError as error:
+        logger.warning("Could not write plugin manifest %s: %s", cache_path, error)
+    return manifest
+
+
+class LazyCommand(Command):  # pylint: disable=too-few-public-methods
+    """Placeholder that imports its plugin the first time the command runs."""
+
+    def __init__(self, name: str, module: str, class_name: str, *init_args):
+        self.name = name
+        self.module = module
+        self.class_name = class_name
+        self.init_args = init_args
+        self._command: Optional[Command] = None
+
+    def resolve(self) -> Command:
+        """Import the plugin module and instantiate the command class."""
+        if self._command is None:
+            plugin_module = importlib.import_module(self.module)
+            command_class = getattr(plugin_module, self.class_name)
+            self._command = command_class(*self.init_args)
+            logger.info("Loaded plugin command %s from %s", self.name, self.module)
+        return self._command
+
+    def execute(self, *args):  # pylint: disable=arguments-differ
+        try:
+            command = self.resolve()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Error loading plugin %s: %s", self.module, error, exc_info=True)
+            print(f"Command {self.name} is unavailable: {error}")
+            return None
+        return command.execute(*args)
@@ -0,0 +1,24 @@
+"""Command module for evaluating infix expressions in calculator application."""
+from app.commands import Command
+from calculator import CalcEngine
+from calculator.expression import ExpressionError
+
+class CalcCommand(Command):  # pylint: disable=too-few-public-methods
+    # pylint: disable=arguments-differ
+    """A command class for evaluating expressions such as 2 + 3 * (4 - 1)."""
+    def execute(self, *tokens: str) -> None:
+        """Evaluate the expression formed by joining all arguments.
+
+        Args:
+            tokens: Expression pieces as typed, e.g. ("2", "+", "3")
+        """
+        expression = " ".join(tokens)
+        try:
+            result = CalcEngine.evaluate_expression(expression)
+        except ExpressionError as error:
+            print(f"Invalid expression: {error}")
+            return
+        except (ValueError, ArithmeticError) as error:
+            print(f"An error occurred: {error}")
+            return
+        print(f"The result of {expression} is {result}")
@@ -0,0 +1,205 @@
+"""Catalog of saved history files.
+
+A small JSON file in the history directory records, per saved file, its
+row count, byte size, operation mix, creation time and a content checksum.
+Saves update it incrementally; listing only stats the directory and
+rescans files whose mtime or size no longer match (files copied in or
+edited by hand), so choosing among many saved histories never parses them.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+from calculator.history.binary import BinaryHistoryReader
+from calculator.opcodes import symbol_for
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = '.history_catalog.json'
+CATALOG_VERSION = 1
+HISTORY_SUFFIXES = ('.csv', '.chist')
+
+
+class CatalogEntry(NamedTuple):
+    """Summary of one saved history file."""
+    name: str
+    rows: int
+    size_bytes: int
+    mtime_ns: int
+    created: float
+    checksum: str
+    operations: Dict[str, int]
+
+    @property
+    def suffix(self) -> str:
+        """File extension, e.g. '.csv'."""
+        return os.path.splitext(self.name)[1]
+
+    def describe(self) -> str:
+        """One-line summary such as 'h.csv (3 rows, 96 B, +:2 ×:1)'."""
+        mix = ' '.join(f"{symbol}:{count}" for symbol, count in
+                       sorted(self.operations.items(), key=lambda item: -item[1]))
+        return f"{self.name} ({self.rows} rows, {_format_size(self.size_bytes)}" + \
+            (f", {mix})" if mix else ")")
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def file_checksum(path: Path) -> str:
+    """Return the BLAKE2b content checksum of a file as hex."""
+    with open(path, 'rb') as data:
+        return hashlib.file_digest(data, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def scan_history_file(path: Path) -> Counter:
+    """Count operations in a history file; used only for files saved elsewhere."""
+    if path.suffix == '.chist':
+        with BinaryHistoryReader(path) as reader:
+            return Counter(symbol_for(opcode) for opcode in reader.iter_opcodes())
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        return Counter(row.get('operation') or '?' for row in csv.DictReader(csv_file))
+
+
+class HistoryCatalog:
+    """
+    Catalog of the history files in one directory.
+
+    Args:
+        directory (Path): History directory holding the files and the catalog.
+    """
+
+    _instances: Dict[Path, 'HistoryCatalog'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / CATALOG_NAME
+        self._entries: Optional[Dict[str, CatalogEntry]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> 'HistoryCatalog':
+        """Return the shared catalog of a directory."""
+        key = Path(directory).absolute()
+        with cls._instances_lock:
+            catalog = cls._instances.get(key)
+            if catalog is None:
+                catalog = cls._instances[key] = cls(directory)
+            return catalog
+
+    def _load(self) -> Dict[str, CatalogEntry]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                cached = json.loads(self.path.read_text(encoding='utf-8'))
+                if cached.get('version') == CATALOG_VERSION:
+                    self._entries = {name: CatalogEntry(name=name, **fields)
+                                     for name, fields in cached['files'].items()}
+            except (OSError, ValueError, TypeError, KeyError, AttributeError):
+                pass
+        return self._entries
+
+    def _save(self) -> None:
+        files = {name: {field: value for field, value in entry._asdict().items()
+                        if field != 'name'}
+                 for name, entry in sorted(self._entries.items())}
+        try:
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({'version': CATALOG_VERSION, 'files': files}),
+                                encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            logger.warning("Could not write history catalog %s: %s", self.path, error)
+
+    def _build_entry(self, path: Path, stat: os.stat_result, operations: Mapping[str, int],
+                     created: Optional[float] = None) -> CatalogEntry:
+        return CatalogEntry(
+            name=path.name, rows=sum(operations.values()), size_bytes=stat.st_size,
+            mtime_ns=stat.st_mtime_ns, created=created or stat.st_mtime,
+            checksum=file_checksum(path), operations=dict(operations))
+
+    def record(self, path: Path, operations: Mapping[str, int]) -> Optional[CatalogEntry]:
+        """
+        Add or replace the entry of a file that was just written.
+
+        Args:
+            path (Path): The saved file, inside this catalog's directory.
+            operations (Mapping[str, int]): Row count per operation symbol.
+
+        Returns:
+            Optional[CatalogEntry]: The new entry, or None if the file is missing.
+        """
+        path = Path(path)
+        try:
+            stat = path.stat()
+            entry = self._build_entry(path, stat, operations, created=time.time())
+        except OSError as error:
+            logger.warning("Not cataloguing %s: %s", path, error)
+            return None
+        with self._lock:
+            self._load()[path.name] = entry
+            self._save()
+        return entry
+
+    def entries(self) -> List[CatalogEntry]:
+        """
+        Return entries for all history files, sorted by name.
+
+        Files whose mtime or size changed since they were catalogued, and
+        files not catalogued yet, are rescanned; entries of deleted files
+        are dropped.
+        """
+        with self._lock:
+            entries = self._load()
+            current, changed = {}, False
+            try:
+                listing = [entry for entry in os.scandir(self.directory)
+                           if entry.name.endswith(HISTORY_SUFFIXES) and entry.is_file()]
+            except OSError as error:
+                logger.error("Error listing history directory: %s", error)
+                return []
+            for dir_entry in listing:
+                stat = dir_entry.stat()
+                known = entries.get(dir_entry.name)
+                if known and (known.mtime_ns, known.size_bytes) == (stat.st_mtime_ns,
+                                                                    stat.st_size):
+                    current[dir_entry.name] = known
+                    continue
+                path = Path(dir_entry.path)
+                try:
+                    current[dir_entry.name] = self._build_entry(
+                        path, stat, scan_history_file(path),
+                        created=known.created if known else None)
+                except (OSError, ValueError) as error:
+                    logger.warning("Skipping unreadable history file %s: %s", path, error)
+                    continue
+                logger.info("Catalogued history file %s", path)
+                changed = True
+            changed = changed or current.keys() != entries.keys()
+            self._entries = current
+            if changed:
+                self._save()
+            return [current[name] for name in sorted(current)]
+
+    def get(self, name: str) -> Optional[CatalogEntry]:
+        """Return the validated entry of one file, or None."""
+        return next((entry for entry in self.entries() if entry.name == name), None)
+
+    def verify(self, name: str) -> bool:
+        """Return True if the file's content still matches its catalogued checksum."""
+        entry = self.get(name)
+        return entry is not None and file_checksum(self.directory / name) == entry.checksum
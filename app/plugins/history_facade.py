@@ -1,52 +1,91 @@
 """Facade pattern implementation for history management operations."""
+import csv
 import logging
 import os
+import time
+from collections import Counter
 from datetime import datetime
-from decimal import Decimal, InvalidOperation
+from itertools import islice
+from decimal import Decimal
 from pathlib import Path
 
-import pandas as pd
-from dotenv import load_dotenv
-
+from app.plugins.history_catalog import HistoryCatalog
+from app.settings import get_settings
+from calculator import CalcEngine
 from calculator.calculation import OperationRecord
+from calculator.history.binary import BinaryHistoryReader, BinaryHistoryWriter, index_path
+from calculator.history.columnar import HistoryRow
 from calculator.history.history import OperationHistory
-from calculator.operations import add_numbers, div_numbers, mul_numbers, sub_numbers
-import logging
-import logging.config
+from calculator.metrics import METRICS
+from calculator.opcodes import is_recomputable, operation_for, symbol_for, symbol_table
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+def _pandas():
+    """Import pandas on first use; most sessions never save or load history."""
+    global pd  # pylint: disable=global-variable-undefined,invalid-name
+    import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    return pd
+
+
+def __getattr__(name):
+    # Keeps `history_facade.pd` available (e.g. for patching) without eager import
+    if name == 'pd':
+        return _pandas()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+CSV_COLUMNS = ['operand1', 'operand2', 'operation', 'result']
+CSV_CHUNK_SIZE = 10000
+BINARY_SUFFIX = '.chist'
+REJECTS_SHOWN = 10
+NUMBER_PATTERN = r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?'
+
+
+def _parse_decimals(column, mask=None) -> list:
+    """Parse a column of numeric strings, converting each distinct value once.
+
+    Entries where mask is False become None.
+    """
+    values = column.str.strip().tolist()
+    parsed = {value: Decimal(value) for value in set(values)} if mask is None else {
+        value: Decimal(value) for value, ok in zip(values, mask.tolist()) if ok
+    }
+    return [parsed.get(value) for value in values]
+
+
 class HistoryFacade:
     """Facade for managing calculation history operations 
     including storage, retrieval, and persistence."""
+    last_rejects: list = []
+    _ready_dirs: set = set()
     @staticmethod
     def _get_history_dir() -> Path:
         """Get history directory from environment variable, create if needed."""
-        history_dir = Path(os.getenv('HISTORY_PATH', 'calculator_history'))
+        history_dir = Path(get_settings().get('HISTORY_PATH', 'calculator_history'))
         logger.debug("Using history directory: %s", history_dir)
+        if history_dir in HistoryFacade._ready_dirs:
+            return history_dir
         try:
             history_dir.mkdir(parents=True, exist_ok=True)
             logger.info("Created history directory at %s", history_dir.absolute())
         except PermissionError as pe:
             logger.critical("Permission denied creating history directory: %s", pe)
             raise RuntimeError(f"Permission denied creating history directory: {pe}") from pe
+        HistoryFacade._ready_dirs.add(history_dir)
         return history_dir
 
     @staticmethod
     def get_formatted_history():
         """Get history with human-readable formatting."""
         logger.debug("Formatting calculation history")
-        return [
-            f"{record.x} {record.symbol} {record.y} = {record.execute()}"
-            for record in OperationHistory.get_all_records()
-        ]
+        return [record.formatted for record in OperationHistory.get_all_records()]
     @staticmethod
     def clear_history():
         """Clear operation history."""
         logger.info("Clearing operation history")
         OperationHistory.clear_records()
+        CalcEngine.checkpoint_journal()
     @staticmethod
     def get_last_formatted() -> str:
         """Get formatted last operation."""
@@ -55,42 +94,171 @@ class HistoryFacade:
         if not record:
             logger.warning("No operations found in history")
             return "No operations in history"
-        return f"{record.x} {record.symbol} {record.y} = {record.execute()}"
+        return record.formatted
     @staticmethod
-    def save_to_csv():
-        """Save history with timestamped filename to configured directory."""
+    def undo(count: int = 1) -> list:
+        """Undo the newest operations and return them formatted, newest first."""
+        undone = OperationHistory.undo(count)
+        if undone:
+            logger.info("Undid %d operations", len(undone))
+            CalcEngine.journal_undo(len(undone))
+        return [record.formatted for record in undone]
+    @staticmethod
+    def redo(count: int = 1) -> list:
+        """Redo undone operations and return them formatted, oldest first."""
+        redone = OperationHistory.redo(count)
+        if redone:
+            logger.info("Redid %d operations", len(redone))
+            CalcEngine.journal_redo(len(redone))
+        return [record.formatted for record in redone]
+    @staticmethod
+    def _new_csv_path(suffix: str = '.csv') -> Path:
+        """Build a timestamped history file path in the history directory."""
         history_dir = HistoryFacade._get_history_dir()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"calculator_history_{timestamp}.csv"
-        filepath = history_dir / filename
+        return history_dir / f"calculator_history_{timestamp}{suffix}"
+    @staticmethod
+    @METRICS.timed("history_io", "save_to_csv")
+    def save_to_csv():
+        """Save history with timestamped filename to configured directory."""
+        pd = _pandas()
+        filepath = HistoryFacade._new_csv_path()
         records = OperationHistory.get_all_records()
         if not records:
             logger.warning("Attempted to save empty history")
             return "No history to save"
         logger.info("Saving %d records to %s", len(records), filepath)
+        started = time.perf_counter()
         df = pd.DataFrame([{
             'operand1': str(r.x),
             'operand2': str(r.y),
             'operation': r.symbol,
-            'result': str(r.execute())
+            'result': str(r.result)
         } for r in records])
         df.to_csv(filepath, index=False)
-        logger.debug("CSV file created successfully at %s", filepath)
+        HistoryFacade._catalog_file(filepath, Counter(df['operation']))
+        elapsed = time.perf_counter() - started
+        logger.debug("CSV file created successfully at %s (%.0f rows/sec via pandas)",
+                     filepath, len(records) / elapsed if elapsed else 0.0)
         return f"History saved to {filepath.absolute()}"
     @staticmethod
-    def list_csv_files():
-        """List all CSV files in history directory."""
+    @METRICS.timed("history_io", "stream_to_csv")
+    def stream_to_csv(chunk_size: int = CSV_CHUNK_SIZE) -> str:
+        """Stream history to a timestamped CSV in fixed-size chunks.
+
+        Rows are written straight from OperationHistory without building a
+        DataFrame, so peak memory is bounded by one chunk. Produces the same
+        columns as save_to_csv.
+
+        Args:
+            chunk_size: Number of rows formatted and written per batch
+        """
+        if not OperationHistory.get_last_record():
+            logger.warning("Attempted to save empty history")
+            return "No history to save"
+        filepath = HistoryFacade._new_csv_path()
+        started = time.perf_counter()
+        rows = (
+            (str(r.x), str(r.y), r.symbol, str(r.result))
+            for r in OperationHistory.iter_records()
+        )
+        written = 0
+        operations = Counter()
+        with open(filepath, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(CSV_COLUMNS)
+            while chunk := list(islice(rows, chunk_size)):
+                writer.writerows(chunk)
+                operations.update(row[2] for row in chunk)
+                written += len(chunk)
+        HistoryFacade._catalog_file(filepath, operations)
+        elapsed = time.perf_counter() - started
+        rate = written / elapsed if elapsed else 0.0
+        logger.info("Streamed %d records to %s (%.0f rows/sec)", written, filepath, rate)
+        return f"History saved to {filepath.absolute()} ({written} rows, {rate:.0f} rows/sec)"
+    @staticmethod
+    def _records_from_chunk(chunk, trust_results: bool, rejects: list) -> list:
+        """Turn one CSV chunk into records, appending invalid rows to rejects."""
+        pd = _pandas()
+        opcodes = chunk['operation'].map(symbol_table())
+        numeric = {
+            column: chunk[column].str.strip().str.fullmatch(NUMBER_PATTERN)
+            for column in ('operand1', 'operand2', 'result')
+        }
+        valid_operands = numeric['operand1'] & numeric['operand2']
+        valid = opcodes.notna() & valid_operands
+        for position in (~valid).to_numpy().nonzero()[0]:
+            row = chunk.iloc[position]
+            reason = "unknown operation" if valid_operands.iloc[position] else "invalid operand"
+            rejects.append({'line': int(chunk.index[position]) + 2, 'reason': reason,
+                            **row.to_dict()})
+        if not valid.any():
+            return []
+        rows = chunk[valid]
+        xs = _parse_decimals(rows['operand1'])
+        ys = _parse_decimals(rows['operand2'])
+        results = _parse_decimals(rows['result'], numeric['result'][valid]) \
+            if trust_results else [None] * len(rows)
+        records = []
+        for line, x, y, opcode, result in zip(rows.index, xs, ys,
+                                               opcodes[valid].astype(int), results):
+            if result is None and not is_recomputable(opcode):
+                rejects.append({'line': int(line) + 2,
+                                'reason': f"cannot recompute {symbol_for(opcode)} "
+                                          "without a stored result",
+                                **chunk.loc[line].to_dict()})
+                continue
+            try:
+                records.append(OperationRecord.create(x, y, operation_for(opcode), result))
+            except (ValueError, ArithmeticError) as e:
+                rejects.append({'line': int(line) + 2, 'reason': str(e),
+                                **chunk.loc[line].to_dict()})
+        return records
+    @staticmethod
+    def _catalog_file(filepath: Path, operations: Counter) -> None:
+        """Record a freshly saved file in its directory's catalog."""
+        HistoryCatalog.for_directory(filepath.parent).record(filepath, operations)
+    @staticmethod
+    def list_history_files():
+        """List catalog entries (rows, size, operation mix) of all saved history files."""
         try:
             history_dir = HistoryFacade._get_history_dir()
-            files = [f for f in history_dir.glob('*.csv') if f.is_file()]
-            logger.debug("Found %d CSV files in history directory", len(files))
-            return files
-        except OSError as e:
-            logger.error("Error listing CSV files: %s", str(e))
+        except RuntimeError as e:
+            logger.error("Error listing history files: %s", str(e))
             return []
+        entries = HistoryCatalog.for_directory(history_dir).entries()
+        logger.debug("Found %d history files in history directory", len(entries))
+        return entries
+    @staticmethod
+    def list_csv_files():
+        """List all CSV files in history directory."""
+        history_dir = HistoryFacade._get_history_dir()
+        return [history_dir / entry.name for entry in HistoryFacade.list_history_files()
+                if entry.suffix == '.csv']
     @staticmethod
-    def load_from_csv(filename: str) -> str:
-        """Load history from CSV and return formatted entries."""
+    def load_history_file(filename: str) -> str:
+        """Load a saved history file, CSV or binary, by name."""
+        if filename.endswith(BINARY_SUFFIX):
+            return HistoryFacade.load_from_binary(filename)
+        return HistoryFacade.load_from_csv(filename)
+    @staticmethod
+    @METRICS.timed("history_io", "load_from_csv")
+    def load_from_csv(filename: str, chunksize: int = CSV_CHUNK_SIZE,
+                      trust_results: bool = True) -> str:
+        """Load history from CSV in chunks and return formatted entries.
+
+        Operations are mapped to opcodes and operands parsed per chunk.
+        Invalid rows are collected in HistoryFacade.last_rejects and
+        summarized instead of being logged one by one. The header is
+        checked before any row is parsed and the history is only replaced
+        once the whole file has been read, so a failed load keeps it intact.
+
+        Args:
+            filename: CSV file name inside the history directory
+            chunksize: Number of rows parsed per chunk
+            trust_results: Use the stored result column instead of recomputing
+        """
+        pd = _pandas()
         try:
             logger.info("Attempting to load history from %s", filename)
             history_dir = HistoryFacade._get_history_dir()
@@ -98,34 +266,36 @@ class HistoryFacade:
             if not filepath.exists():
                 logger.error("CSV file not found: %s", filepath)
                 return f"Error: File '{filepath}' not found"
-            df = pd.read_csv(
+            chunks = pd.read_csv(
                 filepath,
-                usecols=['operand1', 'operand2', 'operation', 'result']
+                dtype=str,
+                keep_default_na=False,
+                chunksize=chunksize
             )
-            OperationHistory.clear_records()
-            logger.info("Cleared existing history before import")
-            operation_map = {
-                '+': add_numbers,
-                '-': sub_numbers,
-                '×': mul_numbers,
-                '÷': div_numbers
-            }
-            loaded_count = 0
-            for _, row in df.iterrows():
-                try:
-                    x = Decimal(str(row['operand1']))
-                    y = Decimal(str(row['operand2']))
-                    op_func = operation_map[row['operation']]
-                    record = OperationRecord.create(x, y, op_func)
-                    OperationHistory.add_record(record)
-                    loaded_count += 1
-                except (KeyError, ValueError, InvalidOperation) as e:
-                    logger.warning("Skipping invalid record: %s - Error: %s", row.to_dict(), str(e))
-                    continue
+            rejects = []
+            staged = []
+            for position, chunk in enumerate(chunks):
+                if position == 0:
+                    # Every chunk has the header's columns; check them before parsing rows
+                    missing = [column for column in CSV_COLUMNS if column not in chunk.columns]
+                    if missing:
+                        logger.error("Missing required columns in %s: %s", filename, missing)
+                        return f"Error: Missing column {', '.join(missing)}"
+                staged += HistoryFacade._records_from_chunk(
+                    chunk[CSV_COLUMNS], trust_results, rejects)
+            loaded_count = len(staged)
+            OperationHistory.replace_records(staged)
+            logger.info("Replaced existing history with the imported records")
+            HistoryFacade.last_rejects = rejects
+            CalcEngine.checkpoint_journal()
             formatted = HistoryFacade.get_formatted_history()
             logger.info("Successfully loaded %d records from %s", loaded_count, filename)
             result = [f"Loaded {loaded_count} entries from '{filename}':"]
             result += [f"{i+1}. {entry}" for i, entry in enumerate(formatted)]
+            if rejects:
+                logger.warning("Skipped %d invalid rows in %s", len(rejects), filename)
+                result.append(f"Skipped {len(rejects)} invalid rows:")
+                result += [f"  line {r['line']}: {r['reason']}" for r in rejects[:REJECTS_SHOWN]]
             return "\n".join(result)
         except pd.errors.EmptyDataError:
             logger.error("Attempted to load empty CSV file")
@@ -133,10 +303,120 @@ class HistoryFacade:
         except pd.errors.ParserError as e:
             logger.error("CSV parsing failed: %s", str(e))
             return "Error: Invalid CSV format"
-        except KeyError as e:
-            logger.error("Missing required column: %s", str(e))
-            return f"Error: Missing column {str(e)}"
-        except (OSError, RuntimeError) as e:
+        except (OSError, RuntimeError, ValueError) as e:
             logger.error("System error during loading: %s", str(e))
             return f"Loading failed: {str(e)}"
         
+    @staticmethod
+    @METRICS.timed("history_io", "save_to_binary")
+    def save_to_binary() -> str:
+        """Write the current history to a new timestamped binary history file."""
+        if not OperationHistory.get_last_record():
+            logger.warning("Attempted to save empty history")
+            return "No history to save"
+        filepath = HistoryFacade._new_csv_path(BINARY_SUFFIX)
+        operations = Counter()
+        writer = BinaryHistoryWriter(filepath)
+        try:
+            for record in OperationHistory.iter_records():
+                writer.append(record)
+                operations[record.symbol] += 1
+        finally:
+            writer.close()
+        written = writer.count
+        HistoryFacade._catalog_file(filepath, operations)
+        logger.info("Saved %d records to %s", written, filepath)
+        return f"History saved to {filepath.absolute()} ({written} rows)"
+    @staticmethod
+    @METRICS.timed("history_io", "load_from_binary")
+    def load_from_binary(filename: str) -> str:
+        """Replace the history with the records of a binary history file.
+
+        The whole file is decoded before the history is replaced, so a
+        corrupt file leaves the history unchanged.
+
+        Args:
+            filename: Binary history file name inside the history directory
+        """
+        filepath = HistoryFacade._get_history_dir() / filename
+        if not filepath.exists():
+            logger.error("Binary history file not found: %s", filepath)
+            return f"Error: File '{filepath}' not found"
+        try:
+            with BinaryHistoryReader(filepath) as reader:
+                records = list(reader)
+            OperationHistory.replace_records(records)
+            # A bounded history keeps only the newest records
+            loaded = len(OperationHistory.get_store())
+            CalcEngine.checkpoint_journal()
+        except (OSError, ValueError, IndexError) as e:
+            logger.error("Binary history load failed: %s", str(e))
+            return f"Loading failed: {str(e)}"
+        logger.info("Loaded %d records from %s", loaded, filename)
+        return f"Loaded {loaded} entries from '{filename}'"
+    @staticmethod
+    @METRICS.timed("history_io", "csv_to_binary")
+    def csv_to_binary(csv_path, binary_path, chunk_size: int = CSV_CHUNK_SIZE) -> tuple:
+        """Convert a history CSV to the binary format without loading it into memory.
+
+        Rows with an unknown operation or invalid numbers are skipped, as are
+        rows of operations that cannot be recomputed without a finite result.
+        The file is written next to binary_path and renamed over it when
+        complete, so an existing target is replaced, never appended to.
+
+        Returns:
+            (rows written, rows skipped)
+        """
+        opcodes = symbol_table()
+        written = skipped = 0
+        binary_path = Path(binary_path)
+        temporary = binary_path.with_name(binary_path.name + '.tmp')
+        for path in (temporary, index_path(temporary)):
+            path.unlink(missing_ok=True)
+        try:
+            with open(csv_path, newline='', encoding='utf-8') as csv_file, \
+                    BinaryHistoryWriter(temporary) as writer:
+                for row in csv.DictReader(csv_file):
+                    try:
+                        opcode = opcodes[row['operation']]
+                        values = [Decimal(row[column].strip())
+                                  for column in ('operand1', 'operand2', 'result')]
+                    except (KeyError, ArithmeticError, AttributeError):
+                        skipped += 1
+                        continue
+                    if not is_recomputable(opcode) and not values[2].is_finite():
+                        skipped += 1
+                        continue
+                    writer.append(HistoryRow(*values, opcode))
+                    written += 1
+                    if written % chunk_size == 0:
+                        writer.flush()
+        except BaseException:
+            for path in (temporary, index_path(temporary)):
+                path.unlink(missing_ok=True)
+            raise
+        # The index goes first: until the data file is renamed it is unused
+        os.replace(index_path(temporary), index_path(binary_path))
+        os.replace(temporary, binary_path)
+        logger.info("Converted %s to %s: %d rows, %d skipped",
+                    csv_path, binary_path, written, skipped)
+        return written, skipped
+    @staticmethod
+    @METRICS.timed("history_io", "binary_to_csv")
+    def binary_to_csv(binary_path, csv_path, chunk_size: int = CSV_CHUNK_SIZE) -> int:
+        """Convert a binary history file to the CSV schema used by stream_to_csv.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        with BinaryHistoryReader(binary_path) as reader, \
+                open(csv_path, 'w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(CSV_COLUMNS)
+            rows = ((str(r.x), str(r.y), r.symbol, str(r.result)) for r in reader)
+            while chunk := list(islice(rows, chunk_size)):
+                writer.writerows(chunk)
+                written += len(chunk)
+        logger.info("Converted %s to %s: %d rows", binary_path, csv_path, written)
+        return written
@@ -5,5 +5,5 @@ from app.plugins.history_facade import HistoryFacade
 class HistorySaveCommand(Command): # pylint: disable=too-few-public-methods
     """Class for History Saving to CSV Command"""
     def execute(self):
-        result = HistoryFacade.save_to_csv()
+        result = HistoryFacade.stream_to_csv()
         print(result)
@@ -0,0 +1,28 @@
+"""
+Powmod plugin: Provides modular exponentiation, x to the power y modulo m.
+"""
+
+from decimal import Decimal, InvalidOperation
+from app.commands import Command
+from calculator import CalcEngine
+
+def powmod_numbers(x: Decimal, y: Decimal, m: Decimal) -> Decimal:
+    """Return (x ** y) % m without building x ** y, and record in history."""
+    return CalcEngine.powmod(x, y, m)
+
+
+class PowmodCommand(Command): # pylint: disable=too-few-public-methods
+    # pylint: disable=arguments-differ
+    """A command class for modular exponentiation, e.g. powmod 7 10000000 13."""
+    def execute(self, a_str: str, b_str: str, m_str: str) -> None:
+        """Execute modular exponentiation with base, exponent and modulus arguments."""
+        try:
+            val_a, val_b, val_m = Decimal(a_str), Decimal(b_str), Decimal(m_str)
+        except InvalidOperation:
+            print(f"Invalid number: {a_str}, {b_str} or {m_str} is not a valid number.")
+            return
+        try:
+            result = powmod_numbers(val_a, val_b, val_m)
+            print(f"The result of {a_str} ^ {b_str} mod {m_str} is {result}")
+        except (ValueError, ArithmeticError) as e:
+            print(f"An error occurred: {e}")
@@ -0,0 +1,21 @@
+"""Redo Plugin"""
+from app.commands import Command
+from app.plugins.history_facade import HistoryFacade
+
+class RedoCommand(Command): # pylint: disable=too-few-public-methods
+    """Command for redoing the last N undone operations"""
+    def execute(self, count: str = "1"):  # pylint: disable=arguments-differ
+        try:
+            steps = int(count)
+        except ValueError:
+            print(f"Invalid count: {count}")
+            return
+        if steps < 1:
+            print("Count must be at least 1")
+            return
+        redone = HistoryFacade.redo(steps)
+        if not redone:
+            print("Nothing to redo")
+            return
+        for entry in redone:
+            print(f"Redone: {entry}")
@@ -1,4 +1,7 @@
 # app/plugins/root/root.py
+from decimal import Decimal
+
+from calculator import CalcEngine
 
 
 class Root:
@@ -6,8 +9,10 @@ class Root:
 
     def calculate(self, a, n):
         try:
-            return a ** (1 / n)
+            return CalcEngine.root(Decimal(a), Decimal(n))
         except ZeroDivisionError:
             return "Error: Root degree cannot be zero."
+        except ValueError as e:
+            return f"Error: {e}."
         except Exception as e:
             return f"Error: {e}"
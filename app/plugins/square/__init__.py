@@ -0,0 +1,10 @@
+"""
+Square plugin: Provides a function to square a number.
+"""
+
+from decimal import Decimal
+from .square import Square
+
+def square_number(x: Decimal) -> Decimal:
+    """Return x squared."""
+    return Square().calculate(x)
@@ -0,0 +1,14 @@
+"""Stats Plugin"""
+from app.commands import Command
+from calculator.metrics import METRICS
+
+class StatsCommand(Command): # pylint: disable=too-few-public-methods
+    """Command for showing latency percentiles per command, operation and history I/O"""
+    def execute(self, view: str = ""):  # pylint: disable=arguments-differ
+        if view == "reset":
+            METRICS.reset()
+            print("Statistics reset")
+        elif view == "prometheus":
+            print(METRICS.render_prometheus() or "No metrics recorded yet")
+        else:
+            print(METRICS.format_table(view or None))
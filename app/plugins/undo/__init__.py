@@ -0,0 +1,21 @@
+"""Undo Plugin"""
+from app.commands import Command
+from app.plugins.history_facade import HistoryFacade
+
+class UndoCommand(Command): # pylint: disable=too-few-public-methods
+    """Command for undoing the last N operations"""
+    def execute(self, count: str = "1"):  # pylint: disable=arguments-differ
+        try:
+            steps = int(count)
+        except ValueError:
+            print(f"Invalid count: {count}")
+            return
+        if steps < 1:
+            print("Count must be at least 1")
+            return
+        undone = HistoryFacade.undo(steps)
+        if not undone:
+            print("Nothing to undo")
+            return
+        for entry in undone:
+            print(f"Undone: {entry}")
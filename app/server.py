@@ -0,0 +1,256 @@
+"""Asyncio calculator server speaking line-delimited JSON over TCP and UNIX sockets.
+
+Each request is one JSON object per line, either
+``{"id": 1, "command": "add", "args": ["2", "3"]}`` or
+``{"id": 1, "line": "add 2 3"}``. Each response is one JSON line:
+``{"id": 1, "ok": true, "output": "The result of 2 + 3 is 5"}`` or
+``{"id": 1, "ok": false, "error": "No such command: foo"}``.
+
+Every connection gets its own OperationHistory session and Decimal
+context. Requests on a
+connection are handled one at a time and the next line is only read once
+the previous response has been drained, so a slow reader throttles its
+own connection without buffering unbounded output. Every command runs in
+a thread pool with a copy of the connection's context, so neither long
+arithmetic nor history rendering or file I/O blocks the event loop.
+
+Commands print their output. While a server runs, sys.stdout is a proxy
+that sends writes made inside a request to that request's buffer and
+everything else to the original stream; the proxy is installed once for
+all running servers and removed when the last one closes.
+"""
+
+import asyncio
+import contextvars
+import io
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import localcontext
+from typing import List, Optional, Tuple
+
+from app.calculator_config import Config
+from app.commands import execute_timed
+from calculator.decimal_context import run_with_private_context
+from calculator.history.history import OperationHistory
+
+logger = logging.getLogger(__name__)
+
+# Commands that prompt on stdin unless they are given arguments
+PROMPTING_COMMANDS = frozenset({"historyload"})
+CLOSE_COMMANDS = frozenset({"exit", "quit"})
+
+# Output buffer of the request running in the current context
+_output: contextvars.ContextVar[Optional[io.StringIO]] = contextvars.ContextVar(
+    "server_output", default=None)
+# Servers currently holding the stdout proxy
+_stdout_lock = threading.Lock()
+_stdout_users = 0
+
+
+class RequestError(ValueError):
+    """Raised for malformed requests and failed commands."""
+
+
+class _ContextStdout(io.TextIOBase):
+    """sys.stdout replacement that routes prints to the current request's buffer."""
+
+    def __init__(self, fallback):
+        super().__init__()
+        self.fallback = fallback
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        buffer = _output.get()
+        return (self.fallback if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if _output.get() is None:
+            self.fallback.flush()
+
+    @property
+    def encoding(self):
+        return self.fallback.encoding
+
+    def fileno(self):
+        return self.fallback.fileno()
+
+    def isatty(self):
+        return self.fallback.isatty()
+
+
+def _install_stdout() -> None:
+    """Route prints made inside requests to their buffers until _remove_stdout()."""
+    global _stdout_users  # pylint: disable=global-statement
+    with _stdout_lock:
+        if _stdout_users == 0:
+            sys.stdout = _ContextStdout(sys.stdout)
+        _stdout_users += 1
+
+
+def _remove_stdout() -> None:
+    """Restore the original stdout once no server needs the proxy."""
+    global _stdout_users  # pylint: disable=global-statement
+    with _stdout_lock:
+        _stdout_users -= 1
+        if _stdout_users == 0 and isinstance(sys.stdout, _ContextStdout):
+            sys.stdout = sys.stdout.fallback
+
+
+def parse_request(line: bytes) -> Tuple[object, str, List[str]]:
+    """Parse one request line into (id, command name, arguments)."""
+    try:
+        request = json.loads(line)
+    except ValueError as error:
+        raise RequestError(f"Invalid JSON: {error}") from error
+    if not isinstance(request, dict):
+        raise RequestError("Request must be a JSON object")
+    if "line" in request:
+        parts = str(request["line"]).split()
+    else:
+        args = request.get("args", [])
+        if not isinstance(args, list):
+            raise RequestError("'args' must be a list")
+        parts = [str(request.get("command", ""))] + [str(arg) for arg in args]
+    if not parts or not parts[0]:
+        raise RequestError("Missing command")
+    return request.get("id"), parts[0].lower(), parts[1:]
+
+
+class CalculatorServer:
+    """Serves CommandHandler plugins to many concurrent clients."""
+
+    def __init__(self, command_handler, io_workers: Optional[int] = None,
+                 max_line_bytes: Optional[int] = None):
+        self.command_handler = command_handler
+        self.io_workers = io_workers or Config.SERVER_IO_WORKERS
+        self.max_line_bytes = max_line_bytes or Config.SERVER_MAX_LINE_BYTES
+        self.connections = 0
+        self._servers: List[asyncio.AbstractServer] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None,
+                    unix_path: Optional[str] = None) -> List[asyncio.AbstractServer]:
+        """Start listening on TCP (host/port) and/or a UNIX socket path."""
+        if port is None and unix_path is None:
+            raise ValueError("Either a TCP port or a UNIX socket path is required")
+        self._executor = ThreadPoolExecutor(self.io_workers, thread_name_prefix="calc-io")
+        _install_stdout()
+        if port is not None:
+            self._servers.append(await asyncio.start_server(
+                self.handle_connection, host, port, limit=self.max_line_bytes))
+        if unix_path is not None:
+            self._servers.append(await asyncio.start_unix_server(
+                self.handle_connection, unix_path, limit=self.max_line_bytes))
+        for server in self._servers:
+            for sock in server.sockets:
+                logger.info("Calculator server listening on %s", sock.getsockname())
+        return self._servers
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self) -> None:
+        """Stop listening, wait for the thread pool and restore stdout."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            _remove_stdout()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve one client with its own history session and Decimal context."""
+        peer = writer.get_extra_info("peername") or "unix"
+        self.connections += 1
+        logger.info("Client connected: %s", peer)
+        try:
+            with OperationHistory.session(), localcontext():
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:
+                        await self._send(writer, {"id": None, "ok": False,
+                                                  "error": "Request line too long"})
+                        break
+                    if not line:
+                        break
+                    if not line.strip():
+                        continue
+                    response, close = await self.handle_line(line)
+                    await self._send(writer, response)
+                    if close:
+                        break
+        except ConnectionError as error:
+            logger.info("Client %s disconnected: %s", peer, error)
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            logger.info("Client closed: %s", peer)
+
+    async def handle_line(self, line: bytes) -> Tuple[dict, bool]:
+        """Execute one request line and return (response, close connection)."""
+        request_id = None
+        try:
+            request_id, name, args = parse_request(line)
+            if name in CLOSE_COMMANDS:
+                return {"id": request_id, "ok": True, "output": "Goodbye"}, True
+            if name in PROMPTING_COMMANDS and not args:
+                raise RequestError(f"{name} needs a file name in server mode")
+            # The copied context carries the connection's history session
+            loop = asyncio.get_running_loop()
+            context = contextvars.copy_context()
+            output = await loop.run_in_executor(
+                self._executor, context.run, run_with_private_context,
+                self.run_command, name, args)
+        except RequestError as error:
+            return {"id": request_id, "ok": False, "error": str(error)}, False
+        return {"id": request_id, "ok": True, "output": output}, False
+
+    def run_command(self, name: str, args: List[str]) -> str:
+        """Run a command and return what it printed."""
+        if name == "help":
+            return "\n".join(sorted(self.command_handler.commands))
+        command = self.command_handler.commands.get(name)
+        if command is None:
+            raise RequestError(f"No such command: {name}")
+        buffer = io.StringIO()
+        token = _output.set(buffer)
+        try:
+            execute_timed(name, command, *args)
+        except TypeError as error:
+            raise RequestError(f"Error: {error}") from error
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Command %s failed", name, exc_info=True)
+            raise RequestError(f"Command {name} failed: {error}") from error
+        finally:
+            _output.reset(token)
+        return buffer.getvalue().strip()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, response: dict) -> None:
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+async def serve(command_handler, host: Optional[str] = None, port: Optional[int] = None,
+                unix_path: Optional[str] = None) -> None:
+    """Run a CalculatorServer until cancelled."""
+    server = CalculatorServer(command_handler)
+    await server.start(host, port, unix_path)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
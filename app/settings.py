@@ -0,0 +1,40 @@
+"""Process-wide settings parsed once from the environment and the .env file."""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+class Settings(dict):
+    """Environment snapshot with typed accessors."""
+
+    def get_int(self, name: str, default: int) -> int:
+        """Return a setting as int."""
+        return int(self.get(name, default))
+
+    def get_float(self, name: str, default: float) -> float:
+        """Return a setting as float."""
+        return float(self.get(name, default))
+
+    def get_bool(self, name: str, default: bool) -> bool:
+        """Return a setting as bool ("true", case-insensitive, is True)."""
+        return str(self.get(name, default)).strip().lower() == "true"
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Load .env into the environment once and return the shared settings."""
+    global _settings  # pylint: disable=global-statement
+    if _settings is None:
+        load_dotenv()
+        _settings = Settings(os.environ)
+    return _settings
+
+
+def reset_settings() -> None:
+    """Forget the cached settings so the next call re-reads the environment."""
+    global _settings  # pylint: disable=global-statement
+    _settings = None
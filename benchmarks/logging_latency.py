@@ -0,0 +1,85 @@
+"""Per-command latency with LOG_LEVEL=DEBUG: synchronous file handler vs queue pipeline.
+
+Usage: python -m benchmarks.logging_latency [--commands N]
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import logging.handlers
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app import App
+from app.logging_setup import LOG_FORMAT, configure_logging, shutdown_logging
+
+
+def _sync_logging(output: Path) -> logging.Handler:
+    """The previous setup: a RotatingFileHandler written on the calling thread."""
+    shutdown_logging()
+    handler = logging.handlers.RotatingFileHandler(output, maxBytes=1048576, backupCount=5)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    root.addHandler(handler)
+    return handler
+
+
+def measure(app: App, commands: int) -> dict:
+    """Run `commands` REPL-style commands and return latency stats in microseconds."""
+    logger = logging.getLogger("app")
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(commands):
+            user_input = f"add {i} 2"
+            started = time.perf_counter()
+            logger.debug("User input: %s", user_input)
+            app._execute_command(user_input)  # pylint: disable=protected-access
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p99_us": timings[int(len(timings) * 0.99)],
+    }
+
+
+def run(commands: int = 5000) -> dict:
+    """Measure each setup and return its stats."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = App(start_repl=False)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        handler = _sync_logging(Path(tmp) / "sync.log")
+        measure(app, 200)
+        results["sync_file_handler"] = measure(app, commands)
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+
+        # No rate limiting or sampling, so both setups log every record
+        configure_logging(level="DEBUG", output=str(Path(tmp) / "queue.log"),
+                          rate_limit=0, sample_every=1)
+        measure(app, 200)
+        results["queue_handler"] = measure(app, commands)
+
+        configure_logging(level="DEBUG", output=str(Path(tmp) / "limited.log"))
+        measure(app, 200)
+        results["queue_rate_limited"] = measure(app, commands)
+        shutdown_logging()
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=5000)
+    args = parser.parse_args(argv)
+    for name, stats in run(args.commands).items():
+        print(f"{name:18} mean {stats['mean_us']:7.1f} us  "
+              f"p50 {stats['p50_us']:7.1f} us  p99 {stats['p99_us']:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
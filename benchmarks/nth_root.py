@@ -0,0 +1,51 @@
+"""nth roots: the previous x ** (1 / n) vs calculator.roots.nth_root at several precisions.
+
+Usage: python -m benchmarks.nth_root [--repeat N]
+"""
+
+import argparse
+import timeit
+from decimal import Decimal, localcontext
+
+from calculator.roots import nth_root
+
+CASES = [("27", "3"), ("0.008", "3"), ("2", "2"), ("12345.678", "3"), ("2", "7")]
+PRECISIONS = (28, 100, 1000)
+
+
+def legacy_root(x: Decimal, n: Decimal) -> Decimal:
+    """The previous implementation."""
+    return x ** (1 / n)
+
+
+def measure(func, x: Decimal, n: Decimal, prec: int, repeat: int) -> float:
+    """Return the best time of one call in microseconds."""
+    with localcontext() as context:
+        context.prec = prec
+        number = max(1, repeat // prec)
+        return min(timeit.repeat(lambda: func(x, n), number=number, repeat=5)) / number * 1e6
+
+
+def run(repeat: int = 20000) -> list:
+    """Time both implementations for each case and precision."""
+    rows = []
+    for prec in PRECISIONS:
+        for x, n in CASES:
+            x, n = Decimal(x), Decimal(n)
+            rows.append((prec, f"root {x} {n}",
+                         measure(legacy_root, x, n, prec, repeat),
+                         measure(nth_root, x, n, prec, repeat)))
+    return rows
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args(argv)
+    for prec, case, legacy, new in run(args.repeat):
+        print(f"prec {prec:5}  {case:20} legacy {legacy:10.1f} us  "
+              f"nth_root {new:8.1f} us  {legacy / new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark result files and the regression gate comparing them with a baseline.
+
+A result file is JSON of the form::
+
+    {"meta": {...}, "results": {"<benchmark>": {"seconds": 1.2e-06, "unit": "op"}}}
+
+where `seconds` is the best time per unit of work, so lower is better. When
+both reports carry a `calibration` time in their meta (a fixed CPU-bound
+workload timed on the same machine), baseline times are scaled by the ratio
+of the two calibrations, so a baseline recorded on a faster or slower machine
+still gates meaningfully. A result may carry its own `threshold`, used
+instead of the global one when it is wider (e.g. process start-up, which
+depends on the OS and disk cache). Results marked `"report_only": true` are
+shown but never fail the gate, and no result does when the two reports come
+from different Python versions.
+"""
+
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+DEFAULT_THRESHOLD = 0.25
+
+
+class Comparison(NamedTuple):
+    """One benchmark compared with its baseline."""
+    name: str
+    baseline: Optional[float]
+    current: float
+    report_only: bool = False
+    threshold: Optional[float] = None
+
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change against the baseline, e.g. 0.3 for 30% slower."""
+        if not self.baseline:
+            return None
+        return self.current / self.baseline - 1
+
+    def regressed(self, threshold: float) -> bool:
+        """
+        True when the benchmark got slower than the baseline by more than threshold.
+
+        The benchmark's own threshold applies instead when it is wider.
+        """
+        change = self.change
+        if self.threshold is not None:
+            threshold = max(threshold, self.threshold)
+        return not self.report_only and change is not None and change > threshold
+
+    def describe(self, threshold: float) -> str:
+        """One report line, e.g. "engine.add  1.20 us  baseline 1.00 us  +20.0%"."""
+        line = f"{self.name:<40} {_format_seconds(self.current):>10}"
+        if self.change is None:
+            return line + "  (new)"
+        status = "  REGRESSION" if self.regressed(threshold) else \
+            "  (report only)" if self.report_only else ""
+        return (f"{line}  baseline {_format_seconds(self.baseline):>10}  "
+                f"{self.change:+7.1%}{status}")
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def make_report(results: Dict[str, dict], **meta) -> dict:
+    """Wrap benchmark results with details of the machine that produced them."""
+    meta.update({
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    })
+    return {"meta": meta, "results": results}
+
+
+def write_report(report: dict, path) -> None:
+    """Write a report as indented JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_report(path) -> dict:
+    """Read a report written by write_report."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(baseline: dict, current: dict) -> List[Comparison]:
+    """
+    Compare every benchmark of a report with the same benchmark in a baseline report.
+
+    Benchmarks missing from the baseline are reported as new; benchmarks
+    missing from the current report (e.g. skipped by --quick) are ignored.
+    Every comparison is report-only when the Python versions differ.
+    """
+    baseline_results = baseline.get("results", {})
+    scale = machine_scale(baseline, current)
+    same_python = python_version(baseline) == python_version(current)
+    comparisons = []
+    for name, result in sorted(current["results"].items()):
+        seconds = baseline_results.get(name, {}).get("seconds")
+        comparisons.append(Comparison(name, seconds * scale if seconds else None,
+                                      result["seconds"],
+                                      result.get("report_only", False) or not same_python,
+                                      result.get("threshold")))
+    return comparisons
+
+
+def python_version(report: dict) -> Optional[str]:
+    """Major.minor Python version a report was produced with, if recorded."""
+    version = report.get("meta", {}).get("python")
+    return ".".join(version.split(".")[:2]) if version else None
+
+
+def machine_scale(baseline: dict, current: dict) -> float:
+    """Ratio of the current machine's calibration time to the baseline machine's."""
+    baseline_calibration = baseline.get("meta", {}).get("calibration")
+    current_calibration = current.get("meta", {}).get("calibration")
+    if not baseline_calibration or not current_calibration:
+        return 1.0
+    return current_calibration / baseline_calibration
+
+
+def regressions(comparisons: List[Comparison],
+                threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """Return the comparisons that are slower than their baseline by more than threshold."""
+    return [comparison for comparison in comparisons if comparison.regressed(threshold)]
@@ -0,0 +1,276 @@
+"""Benchmark suite with a regression gate against a committed baseline.
+
+Covers every CalcEngine operation, HistoryFacade.get_formatted_history at
+10^3 to 10^6 records, CSV save/load round trips, plugin discovery in
+App.load_plugins and the cold start of main.py.
+
+Usage: python -m benchmarks.suite [--quick] [--output FILE] [--baseline FILE]
+                                  [--threshold FRACTION] [--update-baseline]
+
+Results are written as JSON; the exit status is 1 when a benchmark is more
+than --threshold slower than the baseline (default 25%). Quick runs compare
+with their own baseline, since smaller sizes and fewer repeats give
+different times. Benchmarks that look slower are re-run up to --retries
+times and keep their best time, so a single noisy run does not fail the
+gate. The cold start is a median over several processes and gates with
+the wider COLD_START_THRESHOLD.
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from unittest import mock
+
+from app import App
+from app.commands import CommandHandler
+from app.plugins.history_facade import HistoryFacade
+from app.settings import get_settings
+from calculator import CalcEngine
+from calculator.calculation import OperationRecord
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers, mul_numbers, sub_numbers
+from benchmarks.regression import (DEFAULT_THRESHOLD, compare, load_report, make_report,
+                                   python_version, regressions, write_report)
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+QUICK_BASELINE = Path(__file__).resolve().parent / "baseline_quick.json"
+HISTORY_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+QUICK_HISTORY_SIZES = (10 ** 3, 10 ** 4)
+CSV_ROUND_TRIP_SIZES = (10 ** 3, 10 ** 4)
+QUICK_CSV_ROUND_TRIP_SIZES = (10 ** 3,)
+# Allowed cold start slowdown; still catches e.g. an eager pandas import
+COLD_START_THRESHOLD = 1.0
+
+ENGINE_OPERATIONS = {
+    "add": (CalcEngine.sum_values, Decimal("12345.678"), Decimal("98.76")),
+    "subtract": (CalcEngine.difference, Decimal("12345.678"), Decimal("98.76")),
+    "multiply": (CalcEngine.product, Decimal("12345.678"), Decimal("98.76")),
+    "divide": (CalcEngine.quotient, Decimal("12345.678"), Decimal("98.76")),
+    "power": (CalcEngine.power, Decimal("1.5"), Decimal("12")),
+    "modulus": (CalcEngine.modulus, Decimal("12345"), Decimal("97")),
+    "root": (CalcEngine.root, Decimal("12345.678"), Decimal("3")),
+}
+
+
+def best_of(func: Callable[[], object], number: int, repeat: int,
+            setup: Optional[Callable[[], object]] = None) -> float:
+    """Return the best time per call in seconds over `repeat` runs of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        best = min(best, timeit.timeit(func, number=number) / number)
+    return best
+
+
+def _result(seconds: float, unit: str = "op", threshold: Optional[float] = None) -> dict:
+    result = {"seconds": seconds, "unit": unit}
+    if threshold is not None:
+        result["threshold"] = threshold
+    return result
+
+
+def _records(count: int) -> list:
+    operations = (add_numbers, sub_numbers, mul_numbers)
+    return [OperationRecord.create(Decimal(i), Decimal(i % 97 + 1), operations[i % 3])
+            for i in range(count)]
+
+
+def bench_engine(quick: bool) -> Dict[str, dict]:
+    """Time one call of every CalcEngine operation, history recording included."""
+    OperationHistory.configure(max_size=1000)
+    number = 5000 if quick else 20000
+    results = {}
+    for name, (operation, x, y) in ENGINE_OPERATIONS.items():
+        results[f"engine.{name}"] = _result(best_of(lambda: operation(x, y), number, 5))
+    OperationHistory.clear_records()
+    return results
+
+
+def bench_formatted_history(quick: bool) -> Dict[str, dict]:
+    """Time HistoryFacade.get_formatted_history for growing history sizes."""
+    sizes = QUICK_HISTORY_SIZES if quick else HISTORY_SIZES
+    records = _records(max(sizes))
+    results = {}
+    for size in sizes:
+        OperationHistory.configure(max_size=size)
+        OperationHistory.add_records(records[:size])
+        repeat = 5 if size <= 10 ** 4 else 3
+        seconds = best_of(HistoryFacade.get_formatted_history, 1, repeat)
+        results[f"history.formatted.{size}"] = _result(seconds, "call")
+    OperationHistory.configure()
+    OperationHistory.clear_records()
+    return results
+
+
+def bench_csv_round_trip(quick: bool) -> Dict[str, dict]:
+    """Time save_to_csv and load_from_csv of a full history in a scratch directory."""
+    sizes = QUICK_CSV_ROUND_TRIP_SIZES if quick else CSV_ROUND_TRIP_SIZES
+    all_records = _records(max(sizes))
+    results = {}
+    for size in sizes:
+        records = all_records[:size]
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(HistoryFacade, "_get_history_dir", return_value=Path(tmp)):
+            OperationHistory.configure(max_size=size)
+
+            def fill(records=records):
+                OperationHistory.clear_records()
+                OperationHistory.add_records(records)
+
+            save = best_of(HistoryFacade.save_to_csv, 1, 3, setup=fill)
+            filename = max(Path(tmp).glob("*.csv"), key=os.path.getmtime).name
+            load = best_of(lambda: HistoryFacade.load_from_csv(filename), 1, 3)
+        results[f"history.save_csv.{size}"] = _result(save, "call")
+        results[f"history.load_csv.{size}"] = _result(load, "call")
+    OperationHistory.configure()
+    OperationHistory.clear_records()
+    return results
+
+
+def bench_plugin_discovery(quick: bool) -> Dict[str, dict]:
+    """Time App.load_plugins with a cached manifest and with a fresh scan."""
+    repeat = 3 if quick else 10
+    app = App.__new__(App)
+    app.logger = logging.getLogger("benchmarks")
+    with tempfile.TemporaryDirectory() as tmp, contextlib.chdir(ROOT):
+        manifest = Path(tmp) / "plugin_manifest.json"
+        app.settings = dict(get_settings(), PLUGIN_MANIFEST=str(manifest))
+
+        def discover():
+            app.command_handler = CommandHandler()
+            app.load_plugins()
+
+        cold = best_of(discover, 1, repeat, setup=lambda: manifest.unlink(missing_ok=True))
+        warm = best_of(discover, 1, repeat)
+    return {"plugins.discovery_cold": _result(cold, "call"),
+            "plugins.discovery_cached": _result(warm, "call")}
+
+
+def bench_cold_start(quick: bool) -> Dict[str, dict]:
+    """Median time of `python main.py -` running a single exit command in a fresh interpreter.
+
+    Process start-up depends on the OS and disk cache more than on this
+    code, so it gates with the wider COLD_START_THRESHOLD.
+    """
+    env = dict(os.environ, CALCULATOR_AUTO_SAVE="false", CALCULATOR_METRICS_FILE="")
+    samples = []
+    for _ in range(5 if quick else 11):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", "-"], input="exit\n", text=True, cwd=ROOT,
+                       env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return {"startup.main_py": _result(statistics.median(samples), "process",
+                                         threshold=COLD_START_THRESHOLD)}
+
+
+BENCHMARKS = (bench_engine, bench_formatted_history, bench_csv_round_trip,
+              bench_plugin_discovery, bench_cold_start)
+
+
+def calibrate() -> float:
+    """Time a fixed Decimal and pure-Python workload used to compare machines."""
+    def workload():
+        total = Decimal(0)
+        for i in range(2000):
+            total += Decimal(i) * Decimal("1.0001")
+        return sorted(str(i) for i in range(2000))
+
+    return best_of(workload, 5, 15)
+
+
+def run(quick: bool = False, benchmarks=BENCHMARKS) -> Dict[str, Dict[str, dict]]:
+    """Run benchmarks and return {benchmark function name: {name: result}}."""
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for benchmark in benchmarks:
+            results[benchmark.__name__] = benchmark(quick)
+    return results
+
+
+def _flatten(groups: Dict[str, Dict[str, dict]]) -> Dict[str, dict]:
+    return {name: result for group in groups.values() for name, result in group.items()}
+
+
+def _rerun_slow(groups: Dict[str, Dict[str, dict]], calibration: float, baseline: dict,
+                quick: bool, threshold: float, retries: int) -> dict:
+    """Re-run benchmark groups with regressions, keeping each benchmark's best time."""
+    report = make_report(_flatten(groups), quick=quick, calibration=calibration)
+    for _ in range(retries):
+        failed = {comparison.name for comparison in
+                  regressions(compare(baseline, report), threshold)}
+        if not failed:
+            break
+        slow = [benchmark for benchmark in BENCHMARKS
+                if failed & groups.get(benchmark.__name__, {}).keys()]
+        for name, group in run(quick, slow).items():
+            for key, result in group.items():
+                if result["seconds"] < groups[name][key]["seconds"]:
+                    groups[name][key] = result
+        report["results"] = _flatten(groups)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="smaller sizes and fewer repeats, for CI")
+    parser.add_argument("--output", type=Path, help="write the results JSON here")
+    parser.add_argument("--baseline", type=Path,
+                        help=f"baseline to compare against (default {BASELINE.name}, "
+                             f"or {QUICK_BASELINE.name} with --quick)")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD)),
+                        help="allowed slowdown as a fraction (default 0.25 or $BENCHMARK_THRESHOLD)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="re-runs of benchmarks that look slower (default 2)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results to the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    if args.baseline is None:
+        args.baseline = QUICK_BASELINE if args.quick else BASELINE
+    logging.disable(logging.CRITICAL)
+    baseline = load_report(args.baseline) if args.baseline.exists() else {"results": {}}
+    if baseline.get("meta", {}).get("quick", args.quick) != args.quick:
+        print(f"Warning: {args.baseline.name} is not a {'quick' if args.quick else 'full'} "
+              "run; times may not be comparable")
+    retries = 0 if args.update_baseline else args.retries
+    calibration = calibrate()
+    groups = run(args.quick)
+    calibration = min(calibration, calibrate())
+    report = _rerun_slow(groups, calibration, baseline, args.quick, args.threshold, retries)
+    if args.output:
+        write_report(report, args.output)
+    if args.update_baseline:
+        write_report(report, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    comparisons = compare(baseline, report)
+    if baseline["results"] and python_version(baseline) != python_version(report):
+        print(f"Warning: baseline is from Python {python_version(baseline)}, this is "
+              f"{python_version(report)}; reporting only")
+    for comparison in comparisons:
+        print(comparison.describe(args.threshold))
+    failed = regressions(comparisons, args.threshold)
+    if failed:
+        print(f"{len(failed)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,20 @@ including automatic history tracking of all performed operations.
 """
 
 from decimal import Decimal
-from typing import Callable
-from calculator.operations import add_numbers, sub_numbers, mul_numbers, div_numbers
+from time import perf_counter_ns
+from typing import Callable, Optional, Sequence
+from calculator.operations import (add_numbers, sub_numbers, mul_numbers, div_numbers,
+                                   power_numbers, powmod_numbers, mod_numbers, root_numbers)
+from calculator.batch import BatchResult, evaluate_exact, evaluate_float, resolve_operation, to_decimal
 from calculator.calculation import OperationRecord
+from calculator.decimal_context import configure_default_context
+from calculator.expression import compile_expression, run_program
 from calculator.history.history import OperationHistory
+from calculator.history.journal import HistoryJournal
+from calculator.metrics import METRICS
+from calculator.numeric import NumericMode
+from calculator.result_cache import ResultCache
+from calculator.workers import WorkerPool, is_expensive
 
 
 class CalcEngine:
@@ -18,6 +28,109 @@ class CalcEngine:
     recording each operation in the calculation history.
     """
 
+    result_cache: Optional[ResultCache] = None
+    worker_pool: Optional[WorkerPool] = None
+    journal: Optional[HistoryJournal] = None
+    numeric: Optional[NumericMode] = None
+
+    @classmethod
+    def configure_result_cache(cls, max_bytes: int) -> None:
+        """
+        Enable the shared result cache, or disable it when max_bytes is 0.
+
+        Args:
+            max_bytes (int): Approximate memory budget of the cache in bytes.
+        """
+        cls.result_cache = ResultCache(max_bytes) if max_bytes > 0 else None
+
+    @classmethod
+    def configure_numeric(cls, mode: Optional[str], places: int = 4) -> None:
+        """
+        Round every result to `places` decimal places, or keep raw Decimal results when mode is None.
+
+        Sets the Decimal working precision derived from places and clears
+        the result cache, whose entries may have been rounded differently.
+
+        Args:
+            mode (Optional[str]): "exact" for Decimal arithmetic, "fast" to use
+                float whenever the rounded result is provably the same.
+            places (int): Decimal places of every result.
+
+        Raises:
+            ValueError: If the mode is unknown or places is negative.
+        """
+        cls.numeric = NumericMode(mode, places) if mode is not None else None
+        if cls.numeric is not None:
+            configure_default_context(prec=cls.numeric.prec)
+        if cls.result_cache is not None:
+            cls.result_cache.clear()
+
+    @classmethod
+    def numeric_stats(cls) -> Optional[dict]:
+        """Return numeric mode statistics, or None when results are not rounded."""
+        return cls.numeric.stats() if cls.numeric is not None else None
+
+    @classmethod
+    def cache_stats(cls) -> Optional[dict]:
+        """Return result cache statistics, or None when caching is disabled."""
+        return cls.result_cache.stats() if cls.result_cache is not None else None
+
+    @classmethod
+    def configure_worker_pool(cls, max_workers: int, timeout: Optional[float] = None,
+                              chunk_size: int = 1000) -> None:
+        """
+        Route expensive operations to a process pool, or keep all in-process when max_workers is 0.
+
+        Args:
+            max_workers (int): Worker processes; started on the first expensive call.
+            timeout (Optional[float]): Per-operation timeout in seconds, None waits forever.
+            chunk_size (int): Elements per task when fanning out batches.
+        """
+        if cls.worker_pool is not None:
+            cls.worker_pool.terminate()
+        cls.worker_pool = WorkerPool(max_workers, timeout, chunk_size) if max_workers > 0 else None
+
+    @classmethod
+    def configure_journal(cls, journal: Optional[HistoryJournal]) -> None:
+        """
+        Write every recorded operation to a journal, or stop journaling when None.
+
+        The previous journal is closed after its pending records are committed.
+
+        Args:
+            journal (Optional[HistoryJournal]): Journal to append records to.
+        """
+        previous, cls.journal = cls.journal, journal
+        if previous is not None and previous is not journal:
+            previous.close()
+
+    @classmethod
+    def active_journal(cls) -> Optional[HistoryJournal]:
+        """Return the journal unless the current context records into a separate session."""
+        journal = cls.journal
+        return journal if journal is not None and not OperationHistory.in_session() else None
+
+    @classmethod
+    def journal_undo(cls, count: int) -> None:
+        """Journal that the newest `count` records of the default history were undone."""
+        journal = cls.active_journal()
+        if journal is not None:
+            journal.undo(count)
+
+    @classmethod
+    def journal_redo(cls, count: int) -> None:
+        """Journal that `count` undone records of the default history were restored."""
+        journal = cls.active_journal()
+        if journal is not None:
+            journal.redo(count)
+
+    @classmethod
+    def checkpoint_journal(cls) -> None:
+        """Replace the journal contents with the current history, e.g. after a clear or load."""
+        journal = cls.active_journal()
+        if journal is not None:
+            journal.rewrite(OperationHistory.iter_records())
+
     @staticmethod
     def _execute_operation(
         x: Decimal,
@@ -27,6 +140,13 @@ class CalcEngine:
         """
         Execute a calculation operation and store it in history.
 
+        When the result cache is enabled a cached result is reused, but the
+        operation is still recorded exactly as if it had been computed.
+        Expensive operations run in the worker pool when one is configured,
+        and the record is queued in the journal when one is configured. With a
+        numeric mode the result is rounded to its decimal places. The
+        computation's latency is recorded in METRICS under the operation name.
+
         Args:
             x (Decimal): First operand.
             y (Decimal): Second operand.
@@ -34,10 +154,41 @@ class CalcEngine:
 
         Returns:
             Decimal: Result of the operation.
+
+        Raises:
+            OffloadError: If an offloaded operation times out or is cancelled.
         """
-        record = OperationRecord.create(x, y, op_func)
+        started = perf_counter_ns()
+        failed = True
+        cache = CalcEngine.result_cache
+        key = result = None
+        try:
+            if cache is not None:
+                key = cache.make_key(op_func, x, y)
+                result = cache.get(key)
+            cached = result is not None
+            pool = CalcEngine.worker_pool
+            if not cached and pool is not None and is_expensive(op_func, x, y):
+                result = pool.run(op_func, x, y)
+            numeric = CalcEngine.numeric
+            if numeric is not None and not cached:
+                result = numeric.quantize(op_func(x, y) if result is None else result)
+            record = OperationRecord.create(x, y, op_func, result)
+            failed = False
+        finally:
+            METRICS.observe("operation", op_func.__name__, perf_counter_ns() - started, failed)
+        if cache is not None and not cached:
+            cache.put(key, record.result, x, y)
+        CalcEngine._store_record(record)
+        return record.result
+
+    @staticmethod
+    def _store_record(record: OperationRecord) -> None:
+        """Add a record to history and queue it in the journal when one is configured."""
         OperationHistory.add_record(record)
-        return record.execute()
+        journal = CalcEngine.active_journal()
+        if journal is not None:
+            journal.append(record)
 
     @staticmethod
     def sum_values(x: Decimal, y: Decimal) -> Decimal:
@@ -97,3 +248,229 @@ class CalcEngine:
             ZeroDivisionError: If divisor is zero.
         """
         return CalcEngine._execute_operation(x, y, div_numbers)
+
+    @staticmethod
+    def power(x: Decimal, y: Decimal) -> Decimal:
+        """
+        Raise a decimal value to a power.
+
+        Args:
+            x (Decimal): Base.
+            y (Decimal): Exponent.
+
+        Returns:
+            Decimal: Result of x ** y.
+        """
+        return CalcEngine._execute_operation(x, y, power_numbers)
+
+    @staticmethod
+    def powmod(x: Decimal, y: Decimal, m: Decimal) -> Decimal:
+        """
+        Raise a decimal value to a power modulo m.
+
+        Integer operands use modular exponentiation by squaring, so the
+        result is exact and x ** y is never built, e.g. powmod(7, 10**7, 13).
+        The result's sign follows x ** y as with modulus. Other operands
+        fall back to (x ** y) % m. History records the base, exponent and
+        modulus, e.g. "7 ^ 10000000 mod 13 = 9". History CSV files keep two
+        operands, so "^%" rows cannot be recomputed and load only with their
+        stored result.
+
+        Args:
+            x (Decimal): Base.
+            y (Decimal): Exponent.
+            m (Decimal): Modulus.
+
+        Returns:
+            Decimal: Result of (x ** y) % m.
+
+        Raises:
+            ValueError: If the modulus is zero, or y is negative and x has no
+                inverse modulo m.
+        """
+        started = perf_counter_ns()
+        failed = True
+        try:
+            result = powmod_numbers(x, y, m)
+            numeric = CalcEngine.numeric
+            if numeric is not None:
+                result = numeric.quantize(result)
+            record = OperationRecord.create(x, y, powmod_numbers, result, modulus=m)
+            failed = False
+        finally:
+            METRICS.observe("operation", powmod_numbers.__name__, perf_counter_ns() - started,
+                            failed)
+        CalcEngine._store_record(record)
+        return record.result
+
+    @staticmethod
+    def modulus(x: Decimal, y: Decimal) -> Decimal:
+        """
+        Calculate the remainder of dividing two decimal values.
+
+        Args:
+            x (Decimal): Dividend.
+            y (Decimal): Divisor.
+
+        Returns:
+            Decimal: Result of x % y.
+
+        Raises:
+            ValueError: If divisor is zero.
+        """
+        return CalcEngine._execute_operation(x, y, mod_numbers)
+
+    @staticmethod
+    def root(x: Decimal, n: Decimal) -> Decimal:
+        """
+        Calculate the n-th root of a decimal value.
+
+        Args:
+            x (Decimal): Radicand.
+            n (Decimal): Root degree.
+
+        Returns:
+            Decimal: The n-th root, exact for perfect powers.
+
+        Raises:
+            ValueError: If the degree is zero, or x is negative and n even.
+        """
+        return CalcEngine._execute_operation(x, n, root_numbers)
+
+    @staticmethod
+    def evaluate_expression(expression: str) -> Decimal:
+        """
+        Evaluate an infix expression such as "2 + 3 * (4 - 1)".
+
+        Supports + - * / % and ^ (or **), unary minus and parentheses.
+        Compiled expressions and literals are cached, and every binary
+        operation is executed and recorded through the engine.
+
+        Args:
+            expression (str): Expression to evaluate.
+
+        Returns:
+            Decimal: Value of the expression.
+
+        Raises:
+            ExpressionError: If the expression cannot be parsed.
+            ValueError: If a division or modulus by zero occurs.
+        """
+        compiled, values = compile_expression(expression)
+        return run_program(compiled, values, EXPRESSION_OPERATIONS)
+
+    @staticmethod
+    def evaluate_batch(op, xs: Sequence, ys: Sequence, exact: bool = True,
+                       record: bool = True) -> BatchResult:
+        """
+        Evaluate one operation over many operand pairs.
+
+        The exact path computes every element with Decimal, fanned out over
+        the worker pool in chunks for expensive operations. With a numeric
+        mode its results are rounded to the configured places, and in fast
+        mode every element whose rounded result float64 can prove skips
+        Decimal arithmetic. The float path uses float64 NumPy arrays
+        without rounding. Failed elements (e.g. division by zero)
+        are reported in the error mask instead of aborting the batch, and all
+        successful elements are added to history in a single step.
+
+        Args:
+            op: Operation name ("add", "subtract", "multiply", "divide", "power") or
+                operation function.
+            xs (Sequence): First operands (sequence or NumPy array).
+            ys (Sequence): Second operands, same length as xs.
+            exact (bool): Use Decimal arithmetic when True, float64 otherwise.
+            record (bool): Record successful elements in history.
+
+        Returns:
+            BatchResult: Results and per-element error mask.
+
+        Raises:
+            ValueError: If the operation is unsupported or lengths differ.
+        """
+        op_func, ufunc_name = resolve_operation(op)
+        if len(xs) != len(ys):
+            raise ValueError(f"Operand lengths differ: {len(xs)} != {len(ys)}")
+
+        started = perf_counter_ns()
+        try:
+            return CalcEngine._evaluate_batch(op_func, ufunc_name, xs, ys, exact, record)
+        finally:
+            METRICS.observe("batch", op_func.__name__, perf_counter_ns() - started)
+
+    @staticmethod
+    def _evaluate_batch(op_func, ufunc_name: str, xs: Sequence, ys: Sequence, exact: bool,
+                        record: bool) -> BatchResult:
+        """Evaluate a resolved batch operation; see evaluate_batch."""
+        if exact:
+            numeric = CalcEngine.numeric
+            fast = numeric.fast_batch(op_func, xs, ys) if numeric is not None else None
+            pool = CalcEngine.worker_pool
+            if fast is not None:
+                x_values, y_values, results, errors = CalcEngine._finish_fast_batch(
+                    op_func, xs, ys, *fast, operands=record)
+            elif pool is not None and len(xs) > pool.chunk_size and is_expensive(op_func):
+                x_values, y_values, results, errors = pool.evaluate_chunks(op_func, xs, ys)
+            else:
+                x_values, y_values, results, errors = evaluate_exact(op_func, xs, ys)
+            if numeric is not None and fast is None:
+                results = [None if result is None else numeric.quantize(result)
+                           for result in results]
+            if record:
+                CalcEngine._record_batch([
+                    OperationRecord.create(x, y, op_func, result)
+                    for x, y, result, failed in zip(x_values, y_values, results, errors)
+                    if not failed
+                ])
+            return BatchResult(results, errors)
+
+        x_arr, y_arr, results, errors = evaluate_float(ufunc_name, xs, ys)
+        if record:
+            ok = ~errors
+            CalcEngine._record_batch([
+                OperationRecord.create(Decimal(repr(x)), Decimal(repr(y)), op_func,
+                                       Decimal(repr(result)))
+                for x, y, result in zip(x_arr[ok].tolist(), y_arr[ok].tolist(),
+                                        results[ok].tolist())
+            ])
+        return BatchResult(results, errors)
+
+    @staticmethod
+    def _finish_fast_batch(op_func, xs: Sequence, ys: Sequence, rounded: list,
+                           needs_exact: list, operands: bool) -> tuple:
+        """
+        Complete a float-evaluated batch, computing unproven elements with Decimal.
+
+        Operands are only converted to Decimal when `operands` is True,
+        i.e. when they are needed for history records.
+        """
+        pending = [index for index, flag in enumerate(needs_exact) if flag]
+        _, _, results, failures = evaluate_exact(op_func, [xs[i] for i in pending],
+                                                 [ys[i] for i in pending])
+        errors = [False] * len(rounded)
+        for index, result, failed in zip(pending, results, failures):
+            rounded[index] = None if failed else CalcEngine.numeric.quantize(result)
+            errors[index] = failed
+        if not operands:
+            return None, None, rounded, errors
+        x_values = [None if failed else to_decimal(x) for x, failed in zip(xs, errors)]
+        y_values = [None if failed else to_decimal(y) for y, failed in zip(ys, errors)]
+        return x_values, y_values, rounded, errors
+
+    @staticmethod
+    def _record_batch(records: Sequence[OperationRecord]) -> None:
+        """Add batch records to history in one step and queue them in the journal."""
+        OperationHistory.add_records(records)
+        journal = CalcEngine.active_journal()
+        if journal is not None:
+            journal.extend(records)
+
+
+EXPRESSION_OPERATIONS = {
+    "+": CalcEngine.sum_values,
+    "-": CalcEngine.difference,
+    "*": CalcEngine.product,
+    "/": CalcEngine.quotient,
+    "%": CalcEngine.modulus,
+    "^": CalcEngine.power,
+}
@@ -0,0 +1,156 @@
+"""
+Batch evaluation helpers for CalcEngine.
+
+Evaluates one operation over many operand pairs, either exactly with Decimal
+or in float64 with NumPy, reporting failed elements through an error mask
+instead of raising.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from calculator.operations import (add_numbers, sub_numbers, mul_numbers, div_numbers,
+                                   power_numbers)
+
+OperationFunc = Callable[[Decimal, Decimal], Decimal]
+
+# Batch operation names mapped to the Decimal function and the NumPy ufunc name
+BATCH_OPERATIONS = {
+    "add": (add_numbers, "add"),
+    "subtract": (sub_numbers, "subtract"),
+    "multiply": (mul_numbers, "multiply"),
+    "divide": (div_numbers, "divide"),
+    "power": (power_numbers, "power"),
+}
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of a batch evaluation.
+
+    Attributes:
+        results: Decimal results (list) or float64 results (ndarray); failed
+            elements are None in the exact path and NaN in the float path.
+        errors: Per-element error mask, True where the element failed.
+    """
+
+    results: object
+    errors: object
+
+    @property
+    def error_count(self) -> int:
+        """Number of elements that failed."""
+        return int(sum(bool(flag) for flag in self.errors))
+
+
+def resolve_operation(op) -> Tuple[OperationFunc, str]:
+    """
+    Resolve a batch operation given by name or by operation function.
+
+    Args:
+        op: Operation name ("add", "subtract", "multiply", "divide", "power") or one of
+            the functions from calculator.operations.
+
+    Returns:
+        Tuple of the Decimal operation function and the NumPy ufunc name.
+
+    Raises:
+        ValueError: If the operation is not supported in batch mode.
+    """
+    if isinstance(op, str):
+        try:
+            return BATCH_OPERATIONS[op.lower()]
+        except KeyError:
+            raise ValueError(f"Unsupported batch operation: {op}") from None
+    for func, ufunc_name in BATCH_OPERATIONS.values():
+        if op is func:
+            return func, ufunc_name
+    raise ValueError(f"Unsupported batch operation: {getattr(op, '__name__', op)}")
+
+
+def to_decimal(value) -> Decimal:
+    """Convert a batch element (str, int, float, NumPy scalar) to Decimal."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (str, int)):
+        return Decimal(value)
+    # Floats go through their shortest repr so 0.1 stays 0.1
+    return Decimal(repr(float(value)))
+
+
+def evaluate_exact(
+    op_func: OperationFunc,
+    xs: Sequence,
+    ys: Sequence
+) -> Tuple[List[Decimal], List[Optional[Decimal]], List[Optional[Decimal]], List[bool]]:
+    """
+    Evaluate a batch element by element with Decimal arithmetic.
+
+    Returns:
+        Tuple of (x operands, y operands, results, errors); operands and
+        results are None for elements that failed.
+    """
+    x_values, y_values, results, errors = [], [], [], []
+    for raw_x, raw_y in zip(xs, ys):
+        try:
+            x = to_decimal(raw_x)
+            y = to_decimal(raw_y)
+            result = op_func(x, y)
+        except (ValueError, ArithmeticError, InvalidOperation, TypeError):
+            x_values.append(None)
+            y_values.append(None)
+            results.append(None)
+            errors.append(True)
+            continue
+        x_values.append(x)
+        y_values.append(y)
+        results.append(result)
+        errors.append(False)
+    return x_values, y_values, results, errors
+
+
+def _float_array(values):
+    """
+    Convert batch operands to a float64 array and a mask of invalid elements.
+
+    Elements float() rejects, e.g. non-numeric strings or None, become NaN
+    and are flagged in the mask, like the exact path's failed conversions.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    try:
+        array = np.asarray(values, dtype=np.float64)
+        # NumPy turns None into NaN, so only NaN elements need checking
+        indices = np.flatnonzero(np.isnan(array)).tolist()
+    except (ValueError, TypeError):
+        array = np.empty(len(values), dtype=np.float64)
+        indices = range(len(values))
+    invalid = np.zeros(len(values), dtype=bool)
+    for index in indices:
+        try:
+            array[index] = float(values[index])
+        except (ValueError, TypeError):
+            array[index] = np.nan
+            invalid[index] = True
+    return array, invalid
+
+
+def evaluate_float(ufunc_name: str, xs, ys):
+    """
+    Evaluate a batch with float64 NumPy arithmetic.
+
+    Returns:
+        Tuple of (x array, y array, result array, error mask).
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+
+    x_arr, x_invalid = _float_array(xs)
+    y_arr, y_invalid = _float_array(ys)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        results = getattr(np, ufunc_name)(x_arr, y_arr)
+    errors = ~np.isfinite(results) & np.isfinite(x_arr) & np.isfinite(y_arr)
+    if ufunc_name == "divide":
+        errors |= y_arr == 0
+    errors |= x_invalid | y_invalid
+    results[errors] = np.nan
+    return x_arr, y_arr, results, errors
@@ -1,35 +1,46 @@
 from decimal import Decimal
-from typing import Callable
+from typing import Callable, Optional
+from calculator.opcodes import symbol_for_operation
 
 class OperationRecord:
     """
     Represents a mathematical operation with two decimal operands.
+
+    The result is computed once when the record is created; the symbol is
+    resolved at the same time and the formatted line is cached on first use.
+    Modular exponentiation also keeps its modulus, which is None otherwise.
     """
 
-    def __init__(self, x: Decimal, y: Decimal, operation: Callable[[Decimal, Decimal], Decimal]):
+    __slots__ = ("x", "y", "operation", "result", "symbol", "modulus", "_formatted")
+
+    def __init__(self, x: Decimal, y: Decimal, operation: Callable[[Decimal, Decimal], Decimal],
+                 result: Optional[Decimal] = None, modulus: Optional[Decimal] = None):
         self.x = x
         self.y = y
         self.operation = operation
+        self.result = operation(x, y) if result is None else result
+        self.symbol = symbol_for_operation(operation)
+        self.modulus = modulus
+        self._formatted = None
 
     def execute(self) -> Decimal:
-        return self.operation(self.x, self.y)
+        return self.result
 
     @staticmethod
-    def create(x: Decimal, y: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> "OperationRecord":
-        return OperationRecord(x, y, operation)
+    def create(x: Decimal, y: Decimal, operation: Callable[[Decimal, Decimal], Decimal],
+               result: Optional[Decimal] = None,
+               modulus: Optional[Decimal] = None) -> "OperationRecord":
+        return OperationRecord(x, y, operation, result, modulus)
+
+    @property
+    def formatted(self) -> str:
+        """Human-readable line such as '2 + 3 = 5' or '7 ^ 10 mod 13 = 4'."""
+        if self._formatted is None:
+            if self.modulus is None:
+                self._formatted = f"{self.x} {self.symbol} {self.y} = {self.result}"
+            else:
+                self._formatted = f"{self.x} ^ {self.y} mod {self.modulus} = {self.result}"
+        return self._formatted
 
     def __repr__(self) -> str:
         return f"OperationRecord({self.x}, {self.y}, {self.operation.__name__})"
-
-    @property
-    def symbol(self) -> str:
-        operation_map = {
-            "add_numbers": "+",
-            "sub_numbers": "-",
-            "mul_numbers": "×",
-            "div_numbers": "÷",
-            "square_number": "²",
-            "power_numbers": "^",
-            "mod_numbers": "%",
-        }
-        return operation_map.get(self.operation.__name__, "?")
@@ -0,0 +1,38 @@
+"""
+Decimal context helpers for concurrent use.
+
+decimal keeps a current context per thread and per contextvars context,
+but work started with a copied contextvars context (thread pools fed by
+copy_context().run, asyncio tasks) shares the caller's Context object, so
+precision and flag changes in one thread leak into the other. These
+helpers give such work a private copy and set the defaults new threads
+start from.
+"""
+
+import decimal
+from decimal import localcontext
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def configure_default_context(prec: Optional[int] = None,
+                              rounding: Optional[str] = None) -> None:
+    """
+    Set precision and rounding for the current thread and threads started later.
+
+    Args:
+        prec (Optional[int]): Significant digits, unchanged when None.
+        rounding (Optional[str]): decimal rounding mode, unchanged when None.
+    """
+    for context in (decimal.DefaultContext, decimal.getcontext()):
+        if prec is not None:
+            context.prec = prec
+        if rounding is not None:
+            context.rounding = rounding
+
+
+def run_with_private_context(func: Callable[..., T], *args, **kwargs) -> T:
+    """Call func with a private copy of the current Decimal context."""
+    with localcontext():
+        return func(*args, **kwargs)
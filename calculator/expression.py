@@ -0,0 +1,156 @@
+"""
+Infix expression compiler and evaluator.
+
+Expressions such as "2 + 3 * (4 - 1)" are split into a template, with every
+number replaced by a slot, and the literal values. Templates are compiled
+once into a postfix program kept in an LRU cache, so expressions that only
+differ in their numbers share one compiled form; literals are parsed
+through a second LRU cache. Every binary operation runs through CalcEngine
+so it is recorded in history like any other command.
+"""
+
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+TEMPLATE_CACHE_SIZE = 1024
+LITERAL_CACHE_SIZE = 4096
+
+SLOT = "#"
+NEGATE = "neg"
+_NUMBER = re.compile(r"(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+_TOKEN = re.compile(r"#|\*\*|[-+*/^%()]")
+# Binary operator -> (precedence, right associative)
+_BINARY = {
+    "+": (1, False),
+    "-": (1, False),
+    "*": (2, False),
+    "/": (2, False),
+    "%": (2, False),
+    "^": (4, True),
+}
+_NEGATE_PRECEDENCE = 3
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression cannot be parsed."""
+
+
+class CompiledExpression(NamedTuple):
+    """Postfix program: ints load the literal slot with that index, strings are operators."""
+
+    program: Tuple[object, ...]
+    slots: int
+
+
+def split_expression(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Split an expression into its template and literal strings.
+
+    Returns:
+        Tuple of the whitespace-free template and the literals in order.
+    """
+    literals = tuple(_NUMBER.findall(text))
+    return "".join(_NUMBER.sub(SLOT, text).split()), literals
+
+
+@lru_cache(maxsize=LITERAL_CACHE_SIZE)
+def parse_literal(literal: str) -> Decimal:
+    """Parse a numeric literal; results are cached."""
+    try:
+        return Decimal(literal)
+    except InvalidOperation as error:
+        raise ExpressionError(f"Invalid number: {literal}") from error
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledExpression:
+    """
+    Compile a template into a postfix program with the shunting-yard algorithm.
+
+    Raises:
+        ExpressionError: If the template is not a valid expression.
+    """
+    tokens = _TOKEN.findall(template)
+    if "".join(tokens) != template:
+        raise ExpressionError(f"Invalid characters in expression: {template}")
+    program, operators = [], []
+    slot = 0
+    expect_operand = True
+    for token in tokens:
+        if token == "**":
+            token = "^"
+        if expect_operand:
+            if token == SLOT:
+                program.append(slot)
+                slot += 1
+                expect_operand = False
+            elif token == "(":
+                operators.append(token)
+            elif token == "-":
+                operators.append(NEGATE)
+            elif token != "+":
+                raise ExpressionError(f"Unexpected '{token}' in expression")
+            continue
+        if token == ")":
+            while operators and operators[-1] != "(":
+                program.append(operators.pop())
+            if not operators:
+                raise ExpressionError("Unbalanced parentheses")
+            operators.pop()
+        elif token in _BINARY:
+            precedence, right = _BINARY[token]
+            while operators and operators[-1] != "(":
+                top = operators[-1]
+                top_precedence = _NEGATE_PRECEDENCE if top == NEGATE else _BINARY[top][0]
+                if top_precedence > precedence or (top_precedence == precedence and not right):
+                    program.append(operators.pop())
+                else:
+                    break
+            operators.append(token)
+            expect_operand = True
+        else:
+            raise ExpressionError(f"Unexpected '{token}' in expression")
+    if expect_operand:
+        raise ExpressionError("Expression is incomplete")
+    while operators:
+        operator = operators.pop()
+        if operator == "(":
+            raise ExpressionError("Unbalanced parentheses")
+        program.append(operator)
+    return CompiledExpression(tuple(program), slot)
+
+
+def compile_expression(text: str) -> Tuple[CompiledExpression, Tuple[Decimal, ...]]:
+    """Compile an expression, returning its program and parsed literal values."""
+    template, literals = split_expression(text)
+    if not template:
+        raise ExpressionError("Empty expression")
+    return compile_template(template), tuple(parse_literal(lit) for lit in literals)
+
+
+def run_program(compiled: CompiledExpression, values: Tuple[Decimal, ...], operations) -> Decimal:
+    """
+    Execute a compiled program.
+
+    Args:
+        compiled: Program from compile_template.
+        values: Literal values for the program's slots.
+        operations: Mapping of binary operator symbol to a two-argument callable.
+    """
+    stack = []
+    for step in compiled.program:
+        if step.__class__ is int:
+            stack.append(values[step])
+        elif step == NEGATE:
+            stack.append(-stack.pop())
+        else:
+            y = stack.pop()
+            stack.append(operations[step](stack.pop(), y))
+    return stack[0]
+
+
+def cache_info() -> dict:
+    """Return hit/miss statistics of the template and literal caches."""
+    return {"templates": compile_template.cache_info(), "literals": parse_literal.cache_info()}
@@ -0,0 +1,333 @@
+"""
+Compact binary append-only history format.
+
+File layout::
+
+    header   32 bytes: magic, version, flags, index interval,
+             committed record count, committed data end offset
+    records  varint payload length, then the payload: one opcode byte
+             followed by packed Decimal values (x, y, result and, for
+             powmod, the modulus)
+
+A packed Decimal is one byte with the sign (bit 0) and kind (bits 1-2:
+finite, infinity, NaN, sNaN), then for finite values and NaN payloads a
+zigzag varint exponent (finite only) and the coefficient as a varint byte
+length plus big-endian bytes. Values round-trip exactly, including
+trailing zeros and negative zero.
+
+A sidecar index file (``<path>.idx``) holds the little-endian uint64
+offset of every `index_interval`-th record. The reader memory-maps both
+files, so opening, counting and seeking to record N take constant time
+(one index lookup plus at most `index_interval - 1` skipped records).
+
+Writers only append and commit by rewriting the count/offset fields in
+the header after the data is flushed; bytes past the committed end (a
+torn write) are ignored by readers and truncated by the next writer.
+"""
+
+import mmap
+import os
+import struct
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from calculator.history.columnar import HistoryRow
+from calculator.opcodes import opcode_for
+
+MAGIC = b"CALCHIST"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQQ")
+INDEX_ENTRY = struct.Struct("<Q")
+DEFAULT_INDEX_INTERVAL = 1024
+
+_FINITE, _INFINITY, _NAN, _SNAN = range(4)
+_KIND_BY_EXPONENT = {"F": _INFINITY, "n": _NAN, "N": _SNAN}
+_EXPONENT_BY_KIND = {_INFINITY: "F", _NAN: "n", _SNAN: "N"}
+
+PathLike = Union[str, Path]
+
+
+class BinaryHistoryError(ValueError):
+    """Raised for files that are not valid binary history files."""
+
+
+def index_path(path: PathLike) -> Path:
+    """Return the sidecar index path for a binary history file."""
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buffer, offset: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def pack_decimal(out: bytearray, value: Decimal) -> None:
+    """Append the packed form of a Decimal to out."""
+    sign, digits, exponent = value.as_tuple()
+    kind = _KIND_BY_EXPONENT.get(exponent, _FINITE) if isinstance(exponent, str) else _FINITE
+    out.append(sign | kind << 1)
+    if kind == _INFINITY:
+        return
+    if kind == _FINITE:
+        _write_varint(out, exponent << 1 if exponent >= 0 else (-exponent << 1) - 1)
+    coefficient = int("".join(map(str, digits))) if digits else 0
+    raw = coefficient.to_bytes((coefficient.bit_length() + 7) // 8, "big")
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def unpack_decimal(buffer, offset: int) -> Tuple[Decimal, int]:
+    """Read a packed Decimal at offset; returns (value, next offset)."""
+    head = buffer[offset]
+    offset += 1
+    sign, kind = head & 1, head >> 1
+    if kind == _INFINITY:
+        return Decimal((sign, (), "F")), offset
+    exponent = 0
+    if kind == _FINITE:
+        zigzag, offset = _read_varint(buffer, offset)
+        exponent = zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)
+    length, offset = _read_varint(buffer, offset)
+    coefficient = int.from_bytes(buffer[offset:offset + length], "big")
+    offset += length
+    if kind == _FINITE:
+        return Decimal(f"{'-' * sign}{coefficient}E{exponent}"), offset
+    digits = tuple(map(int, str(coefficient))) if coefficient else ()
+    return Decimal((sign, digits, _EXPONENT_BY_KIND[kind])), offset
+
+
+def encode_record(record) -> bytes:
+    """Encode one record (OperationRecord or HistoryRow) with its length prefix."""
+    payload = bytearray()
+    payload.append(getattr(record, "opcode", None) or opcode_for(record.operation))
+    for value in (record.x, record.y, record.result):
+        pack_decimal(payload, value)
+    modulus = getattr(record, "modulus", None)
+    if modulus is not None:
+        pack_decimal(payload, modulus)
+    out = bytearray()
+    _write_varint(out, len(payload))
+    return bytes(out + payload)
+
+
+def decode_payload(buffer, start: int, end: int) -> HistoryRow:
+    """Decode the payload bytes [start, end) of one record."""
+    opcode = buffer[start]
+    offset, values = start + 1, []
+    while offset < end:
+        value, offset = unpack_decimal(buffer, offset)
+        values.append(value)
+    x, y, result = values[:3]
+    return HistoryRow(x, y, result, opcode, values[3] if len(values) > 3 else None)
+
+
+class BinaryHistoryWriter:
+    """
+    Appends records to a binary history file, creating it if needed.
+
+    Args:
+        path: File to create or append to.
+        index_interval (int): Records between sparse index entries; only
+            used when the file is created.
+    """
+
+    def __init__(self, path: PathLike, index_interval: int = DEFAULT_INDEX_INTERVAL):
+        self.path = Path(path)
+        # Not append mode: committing rewrites the header in place
+        mode = "r+b" if self.path.exists() else "w+b"
+        self._file = open(self.path, mode)  # pylint: disable=consider-using-with
+        header = self._file.read(HEADER.size)
+        if header:
+            _, self.index_interval, self.count, self._end = _parse_header(header)
+        else:
+            self.index_interval, self.count, self._end = max(1, index_interval), 0, HEADER.size
+            self._file.write(self._header())
+        # Drop bytes of an uncommitted append and index entries past the count
+        self._file.truncate(self._end)
+        self._index = open(index_path(self.path), "a+b")  # pylint: disable=consider-using-with
+        entries = -(-self.count // self.index_interval)
+        self._index.truncate(entries * INDEX_ENTRY.size)
+        self._pending = bytearray()
+        self._pending_index = bytearray()
+        self._pending_count = 0
+
+    def _header(self) -> bytes:
+        return HEADER.pack(MAGIC, VERSION, 0, self.index_interval, self.count, self._end)
+
+    def append(self, record) -> None:
+        """Buffer one record; it is committed by flush() or close()."""
+        position = self.count + self._pending_count
+        if position % self.index_interval == 0:
+            self._pending_index += INDEX_ENTRY.pack(self._end + len(self._pending))
+        self._pending += encode_record(record)
+        self._pending_count += 1
+
+    def extend(self, records: Iterable, flush_every: int = 10000) -> None:
+        """Append many records, committing every `flush_every` records."""
+        for record in records:
+            self.append(record)
+            if self._pending_count >= flush_every:
+                self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Write buffered records and commit them by updating the header.
+
+        Args:
+            fsync (bool): Force the records to disk before the header that
+                commits them, and the header after; survives power loss.
+        """
+        if not self._pending_count:
+            return
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(self._pending)
+        self._file.flush()
+        self._index.write(self._pending_index)
+        self._index.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+            os.fsync(self._index.fileno())
+        self._end += len(self._pending)
+        self.count += self._pending_count
+        self._pending.clear()
+        self._pending_index.clear()
+        self._pending_count = 0
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Commit pending records and close the files."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self) -> "BinaryHistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _parse_header(header: bytes) -> Tuple[int, int, int, int]:
+    if len(header) < HEADER.size:
+        raise BinaryHistoryError("Truncated binary history header")
+    magic, version, flags, interval, count, end = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise BinaryHistoryError("Not a binary history file")
+    if version != VERSION:
+        raise BinaryHistoryError(f"Unsupported binary history version {version}")
+    return flags, interval, count, end
+
+
+class BinaryHistoryReader:
+    """
+    Memory-mapped, random-access reader for binary history files.
+
+    Records are returned as HistoryRow views. Missing or short index files
+    are tolerated by scanning from the last indexed record.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        with open(self.path, "rb") as data:
+            header = data.read(HEADER.size)
+            _, self.index_interval, self._count, self._end = _parse_header(header)
+            self._data = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index: Optional[mmap.mmap] = None
+        self._index_entries = 0
+        try:
+            with open(index_path(self.path), "rb") as index:
+                size = os.fstat(index.fileno()).st_size
+                if size >= INDEX_ENTRY.size:
+                    self._index = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._index_entries = size // INDEX_ENTRY.size
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset_of(self, position: int) -> int:
+        # Start at the nearest indexed record at or before position, then skip
+        block = min(position // self.index_interval, self._index_entries - 1)
+        if block >= 0:
+            offset = INDEX_ENTRY.unpack_from(self._index, block * INDEX_ENTRY.size)[0]
+            current = block * self.index_interval
+        else:
+            offset, current = HEADER.size, 0
+        data = self._data
+        while current < position:
+            length, offset = _read_varint(data, offset)
+            offset += length
+            current += 1
+        return offset
+
+    def __getitem__(self, position: int) -> HistoryRow:
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("record index out of range")
+        length, start = _read_varint(self._data, self._offset_of(position))
+        return decode_payload(self._data, start, start + length)
+
+    def iter_from(self, position: int = 0) -> Iterator[HistoryRow]:
+        """Iterate over records starting at record `position`."""
+        if position >= self._count:
+            return
+        data, offset = self._data, self._offset_of(max(0, position))
+        for _ in range(max(0, position), self._count):
+            length, start = _read_varint(data, offset)
+            offset = start + length
+            yield decode_payload(data, start, offset)
+
+    def __iter__(self) -> Iterator[HistoryRow]:
+        return self.iter_from(0)
+
+    def iter_opcodes(self) -> Iterator[int]:
+        """Iterate over record opcodes without decoding any Decimal."""
+        data, offset = self._data, HEADER.size
+        for _ in range(self._count):
+            length, start = _read_varint(data, offset)
+            offset = start + length
+            yield data[start]
+
+    def slice(self, start: int, stop: int) -> List[HistoryRow]:
+        """Return records [start, stop) as a list."""
+        rows = []
+        for row in self.iter_from(start):
+            if len(rows) >= stop - start:
+                break
+            rows.append(row)
+        return rows
+
+    def close(self) -> None:
+        """Unmap the files."""
+        self._data.close()
+        if self._index is not None:
+            self._index.close()
+
+    def __enter__(self) -> "BinaryHistoryReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
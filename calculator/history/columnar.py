@@ -0,0 +1,212 @@
+"""
+Columnar history storage.
+
+Keeps history in typed arrays instead of one Python object per record: an
+opcode column plus coefficient/exponent columns for each Decimal value.
+Records are materialized as lightweight HistoryRow views when read, and the
+raw columns can be exposed to NumPy without copying.
+"""
+
+from array import array
+from decimal import MAX_EMAX, MIN_EMIN, Context, Decimal
+from typing import Dict, Optional, Tuple
+
+from calculator.history.store import HistoryStore
+from calculator.opcodes import EMPTY_OPCODE, opcode_for, operation_for, symbol_for
+
+COLUMNS = ("x", "y", "result")
+# Spill dictionary column of the powmod modulus, the only optional value
+MODULUS_COLUMN = len(COLUMNS)
+# Exponent marker for values kept in the spill dictionary
+SPILLED = -2 ** 31
+_MAX_DIGITS = 18
+_MAX_EXPONENT = 2 ** 31 - 1
+# Wide enough to shift any encodable coefficient without rounding
+_EXACT = Context(prec=40, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def encode_decimal(value: Decimal) -> Optional[Tuple[int, int]]:
+    """
+    Split a Decimal into an int64 coefficient and an int32 exponent.
+
+    Returns:
+        Optional[Tuple[int, int]]: (coefficient, exponent), or None if the value
+        does not fit (too many digits, special values or negative zero).
+    """
+    sign, digits, exponent = value.as_tuple()
+    if (not isinstance(exponent, int) or len(digits) > _MAX_DIGITS
+            or not SPILLED < exponent <= _MAX_EXPONENT):
+        return None
+    coefficient = int(value.scaleb(-exponent, _EXACT))
+    if sign and not coefficient:
+        return None
+    return coefficient, exponent
+
+
+def decode_decimal(coefficient: int, exponent: int) -> Decimal:
+    """Rebuild a Decimal from its coefficient and exponent without rounding."""
+    return Decimal(f"{coefficient}E{exponent}")
+
+
+class HistoryRow:
+    """Lightweight read-only view of one stored operation."""
+
+    __slots__ = ("x", "y", "result", "opcode", "modulus", "_formatted")
+
+    def __init__(self, x: Decimal, y: Decimal, result: Decimal, opcode: int,
+                 modulus: Optional[Decimal] = None):
+        self.x = x
+        self.y = y
+        self.result = result
+        self.opcode = opcode
+        self.modulus = modulus
+        self._formatted = None
+
+    @property
+    def operation(self):
+        """Operation function looked up from the opcode registry."""
+        return operation_for(self.opcode)
+
+    @property
+    def symbol(self) -> str:
+        """Display symbol of the operation."""
+        return symbol_for(self.opcode)
+
+    @property
+    def formatted(self) -> str:
+        """Human-readable line such as '2 + 3 = 5' or '7 ^ 10 mod 13 = 4'."""
+        if self._formatted is None:
+            if self.modulus is None:
+                self._formatted = f"{self.x} {self.symbol} {self.y} = {self.result}"
+            else:
+                self._formatted = f"{self.x} ^ {self.y} mod {self.modulus} = {self.result}"
+        return self._formatted
+
+    def execute(self) -> Decimal:
+        return self.result
+
+    def __repr__(self) -> str:
+        return f"HistoryRow({self.x}, {self.y}, {self.operation.__name__})"
+
+
+class ColumnarHistoryStore(HistoryStore):
+    """
+    HistoryStore backend that keeps records in typed columns.
+
+    Each slot costs 37 bytes (1 opcode byte plus an 8-byte coefficient and a
+    4-byte exponent per value). Values that do not fit are spilled into a
+    dictionary, as is the modulus of powmod records. Column order is slot order: the ring starts at
+    `head_index` and wraps around; empty slots have opcode 0.
+    """
+
+    backend = "columnar"
+
+    def _allocate(self, capacity: int) -> None:
+        # Always allocate new arrays so exported views stay valid
+        self._opcodes = array("B", bytes(capacity))
+        self._coefficients = [array("q", bytes(8 * capacity)) for _ in COLUMNS]
+        self._exponents = [array("i", bytes(4 * capacity)) for _ in COLUMNS]
+        self._spilled: Dict[Tuple[int, int], Decimal] = {}
+
+    def _store_slot(self, index: int, record) -> None:
+        opcode = getattr(record, "opcode", None) or opcode_for(record.operation)
+        for column, value in enumerate((record.x, record.y, record.result)):
+            encoded = encode_decimal(value)
+            if encoded is None:
+                self._spilled[(column, index)] = value
+                encoded = (0, SPILLED)
+            self._coefficients[column][index], self._exponents[column][index] = encoded
+        modulus = getattr(record, "modulus", None)
+        if modulus is not None:
+            self._spilled[(MODULUS_COLUMN, index)] = modulus
+        self._opcodes[index] = opcode
+
+    def _load_slot(self, index: int) -> Optional[HistoryRow]:
+        opcode = self._opcodes[index]
+        if opcode == EMPTY_OPCODE:
+            return None
+        values = []
+        for column in range(len(COLUMNS)):
+            exponent = self._exponents[column][index]
+            if exponent == SPILLED:
+                values.append(self._spilled[(column, index)])
+            else:
+                values.append(decode_decimal(self._coefficients[column][index], exponent))
+        modulus = self._spilled.get((MODULUS_COLUMN, index)) if self._spilled else None
+        return HistoryRow(values[0], values[1], values[2], opcode, modulus)
+
+    def _clear_slot(self, index: int) -> None:
+        self._opcodes[index] = EMPTY_OPCODE
+        if self._spilled:
+            for column in range(MODULUS_COLUMN + 1):
+                self._spilled.pop((column, index), None)
+
+    def _occupied(self, index: int) -> bool:
+        return self._opcodes[index] != EMPTY_OPCODE
+
+    def _copy_slots(self, old_capacity: int, new_capacity: int, moves) -> None:
+        old = (self._opcodes, self._coefficients, self._exponents, self._spilled)
+        self._allocate(new_capacity)
+        old_opcodes, old_coefficients, old_exponents, old_spilled = old
+        for src_seq, dst_seq in moves:
+            src, dst = src_seq % old_capacity, dst_seq % new_capacity
+            self._opcodes[dst] = old_opcodes[src]
+            for column in range(len(COLUMNS)):
+                self._coefficients[column][dst] = old_coefficients[column][src]
+                self._exponents[column][dst] = old_exponents[column][src]
+            for column in range(MODULUS_COLUMN + 1):
+                if (column, src) in old_spilled:
+                    self._spilled[(column, dst)] = old_spilled[(column, src)]
+
+    @property
+    def head_index(self) -> int:
+        """Slot index of the oldest record in the column views."""
+        return self._head % self._capacity
+
+    def memoryviews(self) -> Dict[str, memoryview]:
+        """
+        Return zero-copy memoryviews of the raw columns in slot order.
+
+        Keys are "opcode" plus "<column>_coefficient" and "<column>_exponent"
+        for x, y and result. Views stay valid after the store grows or is
+        cleared but then no longer track it.
+        """
+        views = {"opcode": memoryview(self._opcodes)}
+        for column, name in enumerate(COLUMNS):
+            views[f"{name}_coefficient"] = memoryview(self._coefficients[column])
+            views[f"{name}_exponent"] = memoryview(self._exponents[column])
+        return views
+
+    def numpy_columns(self):
+        """Return zero-copy NumPy arrays over the raw columns (see memoryviews)."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        return {name: np.frombuffer(view, dtype=view.format)
+                for name, view in self.memoryviews().items()}
+
+    def live_indexes(self):
+        """Return slot indexes of live records, oldest first, as a NumPy array."""
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        with self.lock:
+            indexes = np.arange(self._head, self._tail, dtype=np.int64) % self._capacity
+            opcodes = np.frombuffer(memoryview(self._opcodes), dtype=np.uint8)
+            return indexes[opcodes[indexes] != EMPTY_OPCODE]
+
+    def to_float64(self, name: str):
+        """
+        Return one Decimal column as float64 values of live records, oldest first.
+
+        Args:
+            name (str): Column name, "x", "y" or "result".
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        column = COLUMNS.index(name)
+        with self.lock:
+            indexes = self.live_indexes()
+            coefficients = np.frombuffer(memoryview(self._coefficients[column]), dtype=np.int64)
+            exponents = np.frombuffer(memoryview(self._exponents[column]), dtype=np.int32)
+            exps = exponents[indexes]
+            spilled = exps == SPILLED
+            values = coefficients[indexes] * np.power(10.0, np.where(spilled, 0, exps))
+            for position in np.flatnonzero(spilled):
+                values[position] = float(self._spilled[(column, int(indexes[position]))])
+        return values
@@ -1,30 +1,238 @@
 """Manages a history of mathematical operations."""
 
-from typing import List, Optional
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 from calculator.calculation import OperationRecord
+from calculator.history.retention import build_policies
+from calculator.history.columnar import ColumnarHistoryStore
+from calculator.history.store import DEFAULT_UNDO_DEPTH, HistoryStore
+
+BACKENDS = {
+    "object": HistoryStore,
+    "columnar": ColumnarHistoryStore,
+}
+
+
+class HistoryState:  # pylint: disable=too-few-public-methods
+    """A history store plus the batched() buffer writing into it."""
+
+    __slots__ = ("store", "pending", "pending_limit", "lock")
+
+    def __init__(self, store: HistoryStore):
+        self.store = store
+        self.pending: Optional[List[OperationRecord]] = None
+        self.pending_limit = 0
+        self.lock = threading.Lock()  # guards pending
+
+
+# History bound to the current context by OperationHistory.session()
+_session: ContextVar[Optional[HistoryState]] = ContextVar("history_session", default=None)
 
 
 class OperationHistory:
     """
-    Stores and manages a list of past OperationRecord instances.
+    Stores and manages past OperationRecord instances in a bounded store.
+
+    All methods act on the history of the current context: a session bound
+    with session() (e.g. one per client connection or worker thread), or the
+    shared default. All methods are thread-safe; configure() should not race
+    with writers since records added to the old store meanwhile are dropped.
     """
 
-    _history: List[OperationRecord] = []  # Shared class-level history list
+    _default = HistoryState(HistoryStore())  # Shared history outside sessions
+    _options: Dict[str, object] = {}  # Arguments of the last configure() call
+
+    @classmethod
+    def _state(cls) -> HistoryState:
+        state = _session.get()
+        return cls._default if state is None else state
+
+    @classmethod
+    def in_session(cls) -> bool:
+        """Return True if the current context has a history bound by session()."""
+        return _session.get() is not None
+
+    @classmethod
+    def new_store(cls) -> HistoryStore:
+        """Create an empty store with the backend and policies from configure()."""
+        options = dict(cls._options)
+        backend = options.pop("backend", "object")
+        policies = build_policies(options.pop("policies", ("fifo",)), options.pop("ttl", None),
+                                  options.pop("per_operation_cap", None))
+        return BACKENDS[backend](options.get("max_size"), policies,
+                                 options.get("undo_depth", DEFAULT_UNDO_DEPTH))
+
+    @classmethod
+    @contextmanager
+    def session(cls, store: Optional[HistoryStore] = None):
+        """
+        Bind a separate history to the current context for the duration of the block.
+
+        Tasks and threads started with a copy of the context share the
+        session; other contexts keep their own history.
+
+        Args:
+            store (Optional[HistoryStore]): Store to use; defaults to new_store().
+        """
+        state = HistoryState(cls.new_store() if store is None else store)
+        token = _session.set(state)
+        try:
+            yield state.store
+        finally:
+            cls.flush()
+            _session.reset(token)
+
+    @classmethod
+    def configure(cls, max_size: Optional[int] = None, policies: Sequence[str] = ("fifo",),
+                  ttl: Optional[float] = None, per_operation_cap: Optional[int] = None,
+                  backend: str = "object", undo_depth: int = DEFAULT_UNDO_DEPTH) -> None:
+        """
+        Replace the history store with a bounded one, keeping the newest records.
+
+        Args:
+            max_size (Optional[int]): Maximum number of records; None is unbounded.
+            policies (Sequence[str]): Retention policy names ("fifo", "ttl",
+                "per_operation").
+            ttl (Optional[float]): Record lifetime in seconds for the ttl policy.
+            per_operation_cap (Optional[int]): Records kept per operation for
+                the per_operation policy.
+            backend (str): "object" keeps OperationRecord instances, "columnar"
+                keeps compact typed columns.
+            undo_depth (int): Maximum number of consecutive undos.
+
+        Raises:
+            ValueError: If the backend or a policy name is unknown.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown history backend: {backend}")
+        store = BACKENDS[backend](max_size, build_policies(policies, ttl, per_operation_cap),
+                                  undo_depth)
+        cls._options = {"max_size": max_size, "policies": tuple(policies), "ttl": ttl,
+                        "per_operation_cap": per_operation_cap, "backend": backend,
+                        "undo_depth": undo_depth}
+        cls.flush()
+        state = cls._state()
+        with state.store.lock:
+            store.extend(state.store)
+            state.store = store
 
     @classmethod
     def add_record(cls, record: OperationRecord) -> None:
         """Add a new operation record to the history."""
-        cls._history.append(record)
+        state = cls._state()
+        if state.pending is None:
+            state.store.append(record)
+            return
+        with state.lock:
+            pending = state.pending
+            if pending is not None:
+                pending.append(record)
+                full = len(pending) >= state.pending_limit
+        if pending is None:
+            state.store.append(record)
+        elif full:
+            cls.flush()
+
+    @classmethod
+    @contextmanager
+    def batched(cls, size: int = 1000):
+        """
+        Buffer add_record calls and store them in batches of `size`.
+
+        Reads flush the buffer first, so buffered records are never missed.
+        Nested calls reuse the outer buffer.
+        """
+        state = cls._state()
+        with state.lock:
+            nested = state.pending is not None
+            if not nested:
+                state.pending, state.pending_limit = [], max(1, size)
+        if nested:
+            yield
+            return
+        try:
+            yield
+        finally:
+            with state.lock:
+                records, state.pending = state.pending, None
+                state.store.extend(records)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Store any records buffered by batched()."""
+        state = cls._state()
+        if not state.pending:
+            return
+        with state.lock:
+            if state.pending:
+                state.store.extend(state.pending)
+                state.pending.clear()
+
+    @classmethod
+    def add_records(cls, records: Iterable[OperationRecord]) -> None:
+        """Add many operation records to the history in one step."""
+        cls.flush()
+        cls._state().store.extend(records)
+
+    @classmethod
+    def replace_records(cls, records: Iterable[OperationRecord]) -> None:
+        """Replace all stored records in one step; readers never see a partial history."""
+        state = cls._state()
+        with state.lock, state.store.lock:
+            if state.pending:
+                state.pending.clear()
+            state.store.clear()
+            state.store.extend(records)
 
     @classmethod
     def get_all_records(cls) -> List[OperationRecord]:
-        """Return all stored operation records."""
-        return cls._history
+        """Return all stored operation records, oldest first."""
+        cls.flush()
+        return list(cls._state().store)
+
+    @classmethod
+    def iter_records(cls) -> Iterator[OperationRecord]:
+        """
+        Iterate over a snapshot of stored records, oldest first, without copying.
+
+        Safe while other threads write: records evicted during iteration
+        are skipped and records added after it started are not included.
+        """
+        cls.flush()
+        return iter(cls._state().store)
 
     @classmethod
     def clear_records(cls) -> None:
         """Clear all stored operation records."""
-        cls._history = []
+        state = cls._state()
+        with state.lock:
+            if state.pending:
+                state.pending.clear()
+            state.store.clear()
+
+    @classmethod
+    def undo(cls, count: int = 1) -> List[OperationRecord]:
+        """
+        Remove up to `count` newest records; redo() can restore them until the next add.
+
+        Returns:
+            List[OperationRecord]: The undone records, newest first.
+        """
+        cls.flush()
+        return cls._state().store.undo(count)
+
+    @classmethod
+    def redo(cls, count: int = 1) -> List[OperationRecord]:
+        """
+        Restore up to `count` records removed by undo().
+
+        Returns:
+            List[OperationRecord]: The restored records, oldest first.
+        """
+        cls.flush()
+        return cls._state().store.redo(count)
 
     @classmethod
     def get_last_record(cls) -> Optional[OperationRecord]:
@@ -34,6 +242,17 @@ class OperationHistory:
         Returns:
             Optional[OperationRecord]: The last record, or None if history is empty.
         """
-        if cls._history:
-            return cls._history[-1]
-        return None
+        cls.flush()
+        return cls._state().store.last()
+
+    @classmethod
+    def get_store(cls) -> HistoryStore:
+        """Return the active history store, e.g. for columnar analytics."""
+        cls.flush()
+        return cls._state().store
+
+    @classmethod
+    def eviction_stats(cls) -> Dict[str, object]:
+        """Return history size, bound and eviction counters."""
+        cls.flush()
+        return cls._state().store.stats()
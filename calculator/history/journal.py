@@ -0,0 +1,377 @@
+"""
+Write-ahead journal that makes the operation history durable.
+
+Records are appended to journal segments in the binary history format.
+A background thread commits them in groups: it waits up to
+`fsync_interval` seconds for more records, writes the whole group and
+fsyncs once, so the cost of a sync is shared by every record in the group.
+An fsync_interval of 0 commits each record before append() returns.
+
+Layout of the journal directory::
+
+    snapshot-<seq>.chist   compacted history covering segments <= seq
+    wal-<seq>.chist        segments appended after that snapshot
+
+Undo and redo are journaled as marker entries holding a record count
+(opcodes UNDO_OPCODE and REDO_OPCODE) instead of rewriting the journal.
+replay() and compaction apply them in order: an undo moves the newest
+records aside, a redo brings them back and any other record drops them.
+A snapshot stores the records still undone after its live records,
+followed by an undo marker, so a later redo replays correctly.
+
+Once the segments written since the last snapshot hold `compact_records`
+records, the writer starts a new segment and a background thread merges
+the previous snapshot and all closed segments into a new snapshot, keeping
+only the newest `keep` records. The new snapshot is renamed into place
+before the merged files are deleted, so a crash at any point leaves a
+consistent journal; replay() reads the newest snapshot and then the
+segments after it.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from calculator.history.binary import (BinaryHistoryReader, BinaryHistoryWriter,
+                                       PathLike, index_path)
+from calculator.history.columnar import HistoryRow
+from calculator.metrics import METRICS
+from calculator.opcodes import REDO_OPCODE, UNDO_OPCODE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FSYNC_INTERVAL = 0.1
+DEFAULT_COMPACT_RECORDS = 10000
+_FILE_NAME = re.compile(r"(snapshot|wal)-(\d+)\.chist")
+_ZERO = Decimal(0)
+
+
+def _marker(opcode: int, count: int) -> HistoryRow:
+    return HistoryRow(Decimal(count), _ZERO, _ZERO, opcode)
+
+
+def _apply_markers(rows: Iterable[HistoryRow], keep: Optional[int]) -> Tuple[deque, List]:
+    """Apply undo/redo markers; returns (live rows, undone rows newest first)."""
+    live: deque = deque(maxlen=keep)
+    undone: List[HistoryRow] = []
+    for row in rows:
+        if row.opcode == UNDO_OPCODE:
+            for _ in range(min(int(row.x), len(live))):
+                undone.append(live.pop())
+        elif row.opcode == REDO_OPCODE:
+            for _ in range(min(int(row.x), len(undone))):
+                live.append(undone.pop())
+        else:
+            undone.clear()
+            live.append(row)
+    return live, undone
+
+
+class HistoryJournal:
+    """
+    Append-only, crash-safe journal of operation records.
+
+    Args:
+        directory: Directory holding the snapshot and journal segments.
+        fsync_interval (float): Longest time in seconds a record waits for
+            its group commit; 0 commits synchronously.
+        compact_records (int): Journal records after which a new snapshot
+            is compacted in the background.
+        keep (Optional[int]): Newest records kept in a snapshot; None keeps all.
+    """
+
+    def __init__(self, directory: PathLike, fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+                 compact_records: int = DEFAULT_COMPACT_RECORDS, keep: Optional[int] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync_interval = fsync_interval
+        self.compact_records = max(1, compact_records)
+        self.keep = keep
+        self.commits = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # guards the segment writer
+        self._compact_lock = threading.Lock()  # one snapshot rewrite at a time
+        self._pending: List = []
+        self._appended = 0
+        self._committed = 0
+        self._sync_requested = False
+        self._closed = False
+        self._failure: Optional[OSError] = None  # first failed commit since the last sync()
+        self._thread: Optional[threading.Thread] = None
+        self._compactor: Optional[threading.Thread] = None
+        self._compact_target = 0  # newest closed segment waiting for compaction
+        self._compacting = False
+
+        self._remove_temporary_files()
+        snapshot_seq, segments = self._scan()
+        self._seq = segments[-1] if segments else snapshot_seq + 1
+        self._since_snapshot = sum(self._count(self._segment_path(seq)) for seq in segments)
+        self._writer = BinaryHistoryWriter(self._segment_path(self._seq))
+
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"wal-{seq:08d}.chist"
+
+    def _snapshot_path(self, seq: int) -> Path:
+        return self.directory / f"snapshot-{seq:08d}.chist"
+
+    @staticmethod
+    def _count(path: Path) -> int:
+        try:
+            with BinaryHistoryReader(path) as reader:
+                return len(reader)
+        except (OSError, ValueError):
+            return 0
+
+    def _scan(self) -> Tuple[int, List[int]]:
+        """Return the newest snapshot seq (0 if none) and the segment seqs after it."""
+        snapshots, segments = [], []
+        for entry in os.scandir(self.directory):
+            match = _FILE_NAME.fullmatch(entry.name)
+            if match:
+                (snapshots if match.group(1) == "snapshot" else segments).append(
+                    int(match.group(2)))
+        snapshot_seq = max(snapshots, default=0)
+        return snapshot_seq, sorted(seq for seq in segments if seq > snapshot_seq)
+
+    def _remove_temporary_files(self) -> None:
+        for path in self.directory.glob("*.tmp*"):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        path.unlink(missing_ok=True)
+        index_path(path).unlink(missing_ok=True)
+
+    def _read(self, paths: Iterable[Path]) -> Iterator[HistoryRow]:
+        for path in paths:
+            try:
+                reader = BinaryHistoryReader(path)
+            except FileNotFoundError:
+                continue  # merged into a snapshot meanwhile
+            with reader:
+                yield from reader
+
+    def replay(self) -> Iterator[HistoryRow]:
+        """
+        Iterate over the committed history, oldest first, with undo and redo applied.
+
+        Records that were undone when the journal was written are not
+        replayed, so they cannot be redone after a restart.
+        """
+        snapshot_seq, segments = self._scan()
+        paths = [self._snapshot_path(snapshot_seq)] if snapshot_seq else []
+        paths += [self._segment_path(seq) for seq in segments]
+        live, _ = _apply_markers(self._read(paths), self.keep)
+        return iter(live)
+
+    def append(self, record) -> None:
+        """Queue one record for the next group commit."""
+        self.extend((record,))
+
+    def undo(self, count: int) -> None:
+        """Journal that the newest `count` records were undone."""
+        if count > 0:
+            self.append(_marker(UNDO_OPCODE, count))
+
+    def redo(self, count: int) -> None:
+        """Journal that `count` undone records were restored."""
+        if count > 0:
+            self.append(_marker(REDO_OPCODE, count))
+
+    def extend(self, records: Iterable) -> None:
+        """Queue records for the next group commit, in order."""
+        records = list(records)
+        if not records:
+            return
+        with self._cond:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            self._appended += len(records)
+            synchronous = self.fsync_interval <= 0
+            if not synchronous:
+                self._pending.extend(records)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="history-journal",
+                                                    daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+        if synchronous:
+            self._commit(records)
+
+    def sync(self) -> None:
+        """
+        Block until every record appended so far is committed and on disk.
+
+        Raises:
+            OSError: If a commit failed since the last sync(); the records of
+                that group may be missing from the journal.
+        """
+        self._wait_committed()
+        with self._cond:
+            failure, self._failure = self._failure, None
+        if failure is not None:
+            raise OSError(f"History journal commit failed: {failure}") from failure
+
+    def _wait_committed(self) -> None:
+        with self._cond:
+            target = self._appended
+            if self._committed >= target:
+                return
+            self._sync_requested = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._committed >= target or self._thread is None)
+
+    def _run(self) -> None:
+        """Group commit loop of the writer thread."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                # Let a group build up unless someone is waiting for it
+                self._cond.wait_for(lambda: self._sync_requested or self._closed,
+                                    timeout=self.fsync_interval)
+                batch, self._pending = self._pending, []
+                self._sync_requested = False
+                if not batch and self._closed:
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+            self._commit(batch)
+
+    def _commit(self, batch: List) -> None:
+        """Write, fsync and count one group of records; a failure is kept for sync()."""
+        with self._write_lock:
+            started = time.perf_counter_ns()
+            failure = None
+            try:
+                for record in batch:
+                    self._writer.append(record)
+                self._writer.flush(fsync=True)
+            except OSError as error:
+                failure = error
+                logger.error("History journal commit of %d records failed", len(batch),
+                             exc_info=True)
+            METRICS.observe("history_io", "journal_commit", time.perf_counter_ns() - started,
+                            failure is not None)
+            self._since_snapshot += len(batch)
+            self.commits += 1
+            if self._since_snapshot >= self.compact_records:
+                self._rotate()
+        with self._cond:
+            self._committed += len(batch)
+            if failure is not None and self._failure is None:
+                self._failure = failure
+            self._cond.notify_all()
+
+    def _rotate(self) -> None:
+        """Start a new segment and compact the closed ones in the background.
+
+        While a compaction runs the segment is still rotated; the next
+        compaction then covers every segment closed in the meantime.
+        """
+        self._writer.close()
+        through = self._seq
+        self._seq += 1
+        self._writer = BinaryHistoryWriter(self._segment_path(self._seq))
+        self._since_snapshot = 0
+        with self._cond:
+            self._compact_target = through
+            if self._compacting:
+                return
+            self._compacting = True
+            self._compactor = threading.Thread(target=self._compact_loop,
+                                               name="history-compactor", daemon=True)
+            self._compactor.start()
+
+    def _compact_loop(self) -> None:
+        """Compact until no closed segment is left uncovered by a snapshot."""
+        done = 0
+        while True:
+            with self._cond:
+                through = self._compact_target
+                if through <= done:
+                    self._compacting = False
+                    return
+            try:
+                self.compact(through)
+            except (OSError, ValueError):
+                logger.error("History journal compaction failed", exc_info=True)
+            done = through
+
+    def compact(self, through: int) -> None:
+        """Merge the snapshot and segments up to `through` into a new snapshot."""
+        with self._compact_lock:
+            snapshot_seq, segments = self._scan()
+            if through <= snapshot_seq:
+                return
+            paths = [self._snapshot_path(snapshot_seq)] if snapshot_seq else []
+            paths += [self._segment_path(seq) for seq in segments if seq <= through]
+            live, undone = _apply_markers(self._read(paths), self.keep)
+            rows = list(live)
+            if undone:
+                rows += reversed(undone)
+                rows.append(_marker(UNDO_OPCODE, len(undone)))
+            self._write_snapshot(through, rows)
+            logger.info("Compacted history journal into %d records", len(live))
+
+    def rewrite(self, records: Iterable) -> None:
+        """
+        Replace the journal contents with records, e.g. after the history was cleared or loaded.
+
+        Pending appends are committed first and then discarded with the
+        rest, including any that failed.
+        """
+        self._wait_committed()
+        with self._cond:
+            self._failure = None
+        rows = deque(records, maxlen=self.keep)
+        with self._compact_lock, self._write_lock:
+            self._writer.close()
+            through = self._seq
+            self._seq += 1
+            self._write_snapshot(through, rows)
+            self._writer = BinaryHistoryWriter(self._segment_path(self._seq))
+            self._since_snapshot = 0
+
+    def _write_snapshot(self, seq: int, rows: Iterable) -> None:
+        """Atomically publish snapshot-<seq> and delete the files it supersedes."""
+        final = self._snapshot_path(seq)
+        temporary = final.with_name(final.name + ".tmp")
+        self._unlink(temporary)
+        with BinaryHistoryWriter(temporary) as writer:
+            writer.extend(rows)
+            writer.flush(fsync=True)
+        # The index goes first: until the data file is renamed it is unused
+        os.replace(index_path(temporary), index_path(final))
+        os.replace(temporary, final)
+        for entry in os.scandir(self.directory):
+            match = _FILE_NAME.fullmatch(entry.name)
+            if match and int(match.group(2)) <= seq and entry.name != final.name:
+                self._unlink(Path(entry.path))
+
+    def close(self) -> None:
+        """Commit pending records, stop the writer thread and close the segment."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._write_lock:
+            self._writer.close()
+
+    def __enter__(self) -> "HistoryJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
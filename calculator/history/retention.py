@@ -0,0 +1,172 @@
+"""Retention policies deciding which records a HistoryStore evicts."""
+
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+def operation_key(record) -> str:
+    """Return the key used to group records by operation."""
+    return getattr(record.operation, "__name__", repr(record.operation))
+
+
+class RetentionPolicy:
+    """
+    Base retention policy.
+
+    The store always enforces its size bound as a FIFO ring buffer; a policy
+    can evict additional records after appends or when the store is read.
+    All hooks are O(1) amortized.
+    """
+
+    name = "fifo"
+
+    def on_append(self, store, seq: int, record) -> None:
+        """Called after a record has been stored under sequence number seq."""
+
+    def on_remove(self, seq: int, record) -> None:
+        """Called when a record leaves the store for any other reason, including undo."""
+
+    def on_undo(self, seq: int, record) -> None:
+        """Called when undo() removes a record that redo() may restore; same as a removal."""
+        self.on_remove(seq, record)
+
+    def on_redo(self, store, seq: int, record) -> None:
+        """Called when redo() restores a record; same as an append."""
+        self.on_append(store, seq, record)
+
+    def on_renumber(self, mapping: Dict[int, int]) -> None:
+        """Called when the store compacts; mapping gives each live record's new sequence number."""
+
+    def expire(self, store) -> None:
+        """Evict records that have become stale since the last call."""
+
+    def reset(self) -> None:
+        """Forget all tracked records."""
+
+
+class FifoPolicy(RetentionPolicy):
+    """Plain ring buffer: only the store's size bound evicts records."""
+
+    name = "fifo"
+
+
+class TtlPolicy(RetentionPolicy):
+    """Evict records older than a fixed number of seconds."""
+
+    name = "ttl"
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        self.ttl = ttl
+        self.clock = clock
+        # Sequence number -> append time; records are appended in sequence order,
+        # so the oldest stamp is always first
+        self._stamps: "OrderedDict[int, float]" = OrderedDict()
+        # Stamps of undone records, restored by redo
+        self._undone: Dict[int, float] = {}
+
+    def on_append(self, store, seq: int, record) -> None:
+        # A new record drops every undone one
+        self._undone.clear()
+        self._stamps[seq] = self.clock()
+        self.expire(store)
+
+    def on_remove(self, seq: int, record) -> None:
+        # Records can leave from anywhere, e.g. per-operation evictions
+        self._stamps.pop(seq, None)
+
+    def on_undo(self, seq: int, record) -> None:
+        stamp = self._stamps.pop(seq, None)
+        if stamp is not None:
+            self._undone[seq] = stamp
+
+    def on_redo(self, store, seq: int, record) -> None:
+        # A redone record keeps its age; it is newer than every live record,
+        # so the stamps stay in sequence order
+        stamp = self._undone.pop(seq, None)
+        self._stamps[seq] = self.clock() if stamp is None else stamp
+        self.expire(store)
+
+    def on_renumber(self, mapping: Dict[int, int]) -> None:
+        self._stamps = OrderedDict((mapping[seq], stamp) for seq, stamp in self._stamps.items()
+                                   if seq in mapping)
+
+    def expire(self, store) -> None:
+        deadline = self.clock() - self.ttl
+        stamps = self._stamps
+        while stamps:
+            seq, stamp = next(iter(stamps.items()))
+            if stamp > deadline:
+                break
+            del stamps[seq]
+            store.discard(seq, self.name)
+
+    def reset(self) -> None:
+        self._stamps.clear()
+        self._undone.clear()
+
+
+class PerOperationCapPolicy(RetentionPolicy):
+    """Keep at most `cap` records per operation, evicting the oldest ones."""
+
+    name = "per_operation"
+
+    def __init__(self, cap: int):
+        if cap < 1:
+            raise ValueError("Per-operation cap must be at least 1")
+        self.cap = cap
+        self._by_operation: Dict[str, deque] = {}
+
+    def on_append(self, store, seq: int, record) -> None:
+        seqs = self._by_operation.setdefault(operation_key(record), deque())
+        seqs.append(seq)
+        if len(seqs) > self.cap:
+            store.discard(seqs.popleft(), self.name)
+
+    def on_remove(self, seq: int, record) -> None:
+        seqs = self._by_operation.get(operation_key(record))
+        # Records leave either from the oldest end (evictions) or the newest
+        if seqs and seqs[0] == seq:
+            seqs.popleft()
+        elif seqs and seqs[-1] == seq:
+            seqs.pop()
+
+    def on_renumber(self, mapping: Dict[int, int]) -> None:
+        for key, seqs in self._by_operation.items():
+            self._by_operation[key] = deque(mapping[seq] for seq in seqs if seq in mapping)
+
+    def reset(self) -> None:
+        self._by_operation.clear()
+
+
+def build_policies(names: Iterable[str], ttl: Optional[float] = None,
+                   per_operation_cap: Optional[int] = None) -> List[RetentionPolicy]:
+    """
+    Build retention policies from their names.
+
+    Args:
+        names: Policy names ("fifo", "ttl", "per_operation").
+        ttl: Record lifetime in seconds, required for "ttl".
+        per_operation_cap: Records kept per operation, required for "per_operation".
+
+    Raises:
+        ValueError: If a policy name is unknown or its setting is missing.
+    """
+    policies = []
+    for name in names:
+        name = name.strip().lower()
+        if not name or name == "fifo":
+            continue
+        if name == "ttl":
+            if ttl is None:
+                raise ValueError("The ttl policy requires a TTL")
+            policies.append(TtlPolicy(ttl))
+        elif name == "per_operation":
+            if per_operation_cap is None:
+                raise ValueError("The per_operation policy requires a cap")
+            policies.append(PerOperationCapPolicy(per_operation_cap))
+        else:
+            raise ValueError(f"Unknown history retention policy: {name}")
+    return policies
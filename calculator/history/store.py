@@ -0,0 +1,337 @@
+"""Bounded ring-buffer storage for operation records."""
+
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from calculator.history.retention import RetentionPolicy
+
+_INITIAL_CAPACITY = 64
+DEFAULT_UNDO_DEPTH = 100
+# Slots loaded per lock acquisition while iterating
+_ITER_BLOCK = 256
+# Compactions remembered so that running iterators can follow renumbered records
+_RENUMBERS_KEPT = 8
+
+
+class HistoryStore:
+    """
+    Ring buffer of operation records with pluggable retention policies.
+
+    Records are addressed by a monotonically increasing sequence number; the
+    slot of a record is its sequence number modulo the buffer capacity. When
+    an append (after the policies ran) leaves more than `max_size` live
+    records the oldest one is evicted (FIFO). Policies may evict records
+    early, leaving an empty slot. When such holes fill the ring, the live
+    records are compacted into consecutive sequence numbers (and the ring
+    doubled once), so holes never cost a live record. An unbounded store
+    compacts instead of growing while at least half its ring is holes, so
+    its memory follows the live records. Policies follow via
+    `on_renumber`. Appends and evictions are O(1) amortized.
+
+    All public methods are thread-safe; they do not rely on the GIL, so the
+    store also works on free-threaded builds. Iteration is a snapshot of the
+    records present when it started, read in blocks under the lock without
+    copying the whole buffer: records evicted meanwhile are skipped and
+    records appended meanwhile are not included.
+
+    Undo moves the tail back over the newest records without clearing their
+    slots, and redo moves it forward again, so the redo stack is simply the
+    slots between the tail and `_redo_end` and costs no extra storage. Both
+    are O(1) per record. Appending drops the redo stack; at most
+    `undo_depth` consecutive undos are allowed.
+
+    Subclasses change how slots are stored by overriding the `_allocate`,
+    `_store_slot`, `_load_slot`, `_clear_slot` and `_copy_slots` hooks.
+    """
+
+    backend = "object"
+
+    def __init__(self, max_size: Optional[int] = None,
+                 policies: Optional[List[RetentionPolicy]] = None,
+                 undo_depth: int = DEFAULT_UNDO_DEPTH):
+        """
+        Args:
+            max_size (Optional[int]): Maximum number of records kept; None or
+                a value below 1 keeps the store unbounded.
+            policies (Optional[List[RetentionPolicy]]): Extra eviction policies.
+            undo_depth (int): Maximum number of consecutive undos; 0 disables undo.
+        """
+        self.max_size = max_size if max_size and max_size > 0 else None
+        self.policies = list(policies or [])
+        self.undo_depth = max(0, undo_depth)
+        self.lock = threading.RLock()
+        self._epoch = 0  # incremented by clear(), which restarts sequence numbers
+        # One spare slot lets a record be stored before the bound evicts another
+        self._capacity = self.max_size + 1 if self.max_size else _INITIAL_CAPACITY
+        self._allocate(self._capacity)
+        self._head = 0  # sequence number of the oldest occupied slot
+        self._tail = 0  # sequence number the next record will get
+        self._redo_end = 0  # undone records occupy [_tail, _redo_end)
+        self._undo_budget = 0  # undos left before undo_depth is reached
+        self._live = 0
+        self._layout = 0  # incremented by every compaction
+        self._renumbers: deque = deque(maxlen=_RENUMBERS_KEPT)
+        self.evictions: Dict[str, int] = {"capacity": 0}
+        for policy in self.policies:
+            self.evictions[policy.name] = 0
+
+    def __len__(self) -> int:
+        with self.lock:
+            self.expire()
+            return self._live
+
+    def __iter__(self) -> Iterator[object]:
+        with self.lock:
+            self.expire()
+            seq, end, epoch, layout = self._head, self._tail, self._epoch, self._layout
+        while seq < end:
+            with self.lock:
+                if self._epoch != epoch:
+                    return
+                if self._layout != layout:
+                    moved = self._translate(layout, seq, end)
+                    if moved is None:
+                        return
+                    (seq, end), layout = moved, self._layout
+                # Records before the head were evicted after the snapshot and
+                # records past the tail were undone
+                seq = max(seq, self._head)
+                stop = min(end, self._tail, seq + _ITER_BLOCK)
+                capacity = self._capacity
+                block = [self._load_slot(s % capacity) for s in range(seq, stop)]
+            for record in block:
+                if record is not None:
+                    yield record
+            seq = stop
+
+    def append(self, record) -> None:
+        """Store a record, evicting the oldest one if the buffer is full."""
+        with self.lock:
+            self._append(record)
+
+    def _append(self, record) -> None:
+        if self._redo_end > self._tail:
+            self._drop_redo()
+        if self._tail - self._head == self._capacity:
+            if self.max_size is None:
+                # Holes left by policies are reused once they fill half the ring,
+                # so an unbounded store only grows with its live records
+                if self._live <= self._capacity // 2:
+                    self._compact()
+                else:
+                    self._grow()
+            else:
+                # The bound keeps a spare slot, so a full ring has holes left by
+                # policy evictions; close them instead of evicting a live record
+                self._compact()
+        seq = self._tail
+        self._store_slot(seq % self._capacity, record)
+        self._tail += 1
+        self._redo_end = self._tail
+        self._live += 1
+        self._undo_budget = min(self.undo_depth, self._undo_budget + 1)
+        for policy in self.policies:
+            policy.on_append(self, seq, record)
+        # Policies may already have made room, e.g. per-operation caps
+        while self.max_size is not None and self._live > self.max_size:
+            self._discard(self._head, "capacity")
+
+    def extend(self, records) -> None:
+        """Store many records in order."""
+        if isinstance(records, HistoryStore):
+            records = list(records)
+        with self.lock:
+            for record in records:
+                self._append(record)
+
+    def last(self) -> Optional[object]:
+        """Return the newest record, or None if the store is empty."""
+        with self.lock:
+            self.expire()
+            capacity = self._capacity
+            for seq in range(self._tail - 1, self._head - 1, -1):
+                record = self._load_slot(seq % capacity)
+                if record is not None:
+                    return record
+            return None
+
+    def undo(self, count: int = 1) -> List[object]:
+        """
+        Remove up to `count` newest records, keeping them for redo().
+
+        Returns:
+            List[object]: The undone records, newest first.
+        """
+        undone = []
+        with self.lock:
+            capacity = self._capacity
+            while len(undone) < count and self._undo_budget > 0:
+                # Skip slots emptied by retention policies
+                while self._tail > self._head and not self._occupied((self._tail - 1) % capacity):
+                    self._tail -= 1
+                if self._tail == self._head:
+                    break
+                self._tail -= 1
+                record = self._load_slot(self._tail % capacity)
+                self._live -= 1
+                self._undo_budget -= 1
+                for policy in self.policies:
+                    policy.on_undo(self._tail, record)
+                undone.append(record)
+        return undone
+
+    def redo(self, count: int = 1) -> List[object]:
+        """
+        Restore up to `count` records removed by undo(), oldest first.
+
+        Returns:
+            List[object]: The restored records in the order they are restored.
+        """
+        redone = []
+        with self.lock:
+            capacity = self._capacity
+            while len(redone) < count and self._tail < self._redo_end:
+                seq = self._tail
+                self._tail += 1
+                if not self._occupied(seq % capacity):
+                    continue
+                record = self._load_slot(seq % capacity)
+                self._live += 1
+                self._undo_budget = min(self.undo_depth, self._undo_budget + 1)
+                for policy in self.policies:
+                    policy.on_redo(self, seq, record)
+                redone.append(record)
+        return redone
+
+    def redo_depth(self) -> int:
+        """Return the number of slots that redo() can still restore."""
+        with self.lock:
+            return self._redo_end - self._tail
+
+    def _drop_redo(self) -> None:
+        # Release undone records; their slots are not live, so no policy hooks run
+        capacity = self._capacity
+        for seq in range(self._tail, self._redo_end):
+            self._clear_slot(seq % capacity)
+        self._redo_end = self._tail
+
+    def discard(self, seq: int, reason: str) -> bool:
+        """
+        Evict the record with the given sequence number.
+
+        Returns:
+            bool: True if a record was evicted, False if it was already gone.
+        """
+        with self.lock:
+            return self._discard(seq, reason)
+
+    def _discard(self, seq: int, reason: str) -> bool:
+        if not self._head <= seq < self._tail:
+            return False
+        index = seq % self._capacity
+        record = self._load_slot(index)
+        if record is None:
+            return False
+        self._clear_slot(index)
+        self._live -= 1
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        for policy in self.policies:
+            policy.on_remove(seq, record)
+        self._advance_head()
+        return True
+
+    def expire(self) -> None:
+        """Let time-based policies evict stale records."""
+        with self.lock:
+            for policy in self.policies:
+                policy.expire(self)
+
+    def clear(self) -> None:
+        """Remove all records without touching the eviction counters."""
+        with self.lock:
+            self._allocate(self._capacity)
+            self._head = self._tail = self._redo_end = 0
+            self._undo_budget = 0
+            self._live = 0
+            self._epoch += 1
+            for policy in self.policies:
+                policy.reset()
+
+    def stats(self) -> Dict[str, object]:
+        """Return size, bound and eviction counters for monitoring."""
+        with self.lock:
+            return {
+                "size": len(self),
+                "max_size": self.max_size,
+                "backend": self.backend,
+                "policies": ["fifo"] + [policy.name for policy in self.policies],
+                "evictions": dict(self.evictions),
+            }
+
+    def _advance_head(self) -> None:
+        capacity = self._capacity
+        while self._head < self._tail and not self._occupied(self._head % capacity):
+            self._head += 1
+
+    def _grow(self) -> None:
+        old_capacity = self._capacity
+        self._capacity = old_capacity * 2
+        self._copy_slots(old_capacity, self._capacity,
+                         ((seq, seq) for seq in range(self._head, self._tail)))
+
+    def _compact(self) -> None:
+        """Renumber live records consecutively from the head, dropping holes."""
+        old_capacity = self._capacity
+        old_seqs = [seq for seq in range(self._head, self._tail)
+                    if self._occupied(seq % old_capacity)]
+        base = self._head
+        # Twice the bound leaves max_size free slots, so compactions stay O(1) amortized
+        if self.max_size is not None:
+            self._capacity = max(old_capacity, 2 * self.max_size)
+        self._copy_slots(old_capacity, self._capacity,
+                         zip(old_seqs, range(base, base + len(old_seqs))))
+        self._tail = self._redo_end = base + len(old_seqs)
+        self._layout += 1
+        self._renumbers.append((self._layout, old_seqs, base))
+        mapping = {seq: base + position for position, seq in enumerate(old_seqs)}
+        for policy in self.policies:
+            policy.on_renumber(mapping)
+
+    def _translate(self, layout: int, seq: int, end: int) -> Optional[Tuple[int, int]]:
+        """Map an iterator position from an older layout, or None if it is too old."""
+        for renumbered_layout, old_seqs, base in self._renumbers:
+            if renumbered_layout <= layout:
+                continue
+            if renumbered_layout != layout + 1:
+                return None
+            seq = base + bisect_left(old_seqs, seq)
+            end = base + bisect_left(old_seqs, end)
+            layout = renumbered_layout
+        return (seq, end) if layout == self._layout else None
+
+    # Slot storage hooks
+
+    def _allocate(self, capacity: int) -> None:
+        self._slots: List[Optional[object]] = [None] * capacity
+
+    def _store_slot(self, index: int, record) -> None:
+        self._slots[index] = record
+
+    def _load_slot(self, index: int) -> Optional[object]:
+        return self._slots[index]
+
+    def _clear_slot(self, index: int) -> None:
+        self._slots[index] = None
+
+    def _occupied(self, index: int) -> bool:
+        return self._slots[index] is not None
+
+    def _copy_slots(self, old_capacity: int, new_capacity: int,
+                    moves: Iterable[Tuple[int, int]]) -> None:
+        """Reallocate with new_capacity, moving each (old seq, new seq) record."""
+        old_slots = self._slots
+        self._allocate(new_capacity)
+        for src, dst in moves:
+            self._slots[dst % new_capacity] = old_slots[src % old_capacity]
@@ -0,0 +1,261 @@
+"""
+Low-overhead latency metrics.
+
+Latencies are recorded in nanoseconds into HDR-style log-linear
+histograms: values below 32 ns get exact buckets, and every power-of-two
+range above is split into 16 equal buckets, so any reported percentile is
+within about 3% of the true value. Recording is one bucket computation and
+one counter increment under a per-histogram lock. Nothing is sorted or
+stored per sample, so the instrumentation can stay on in production.
+
+Histograms are grouped by kind ("command", "operation", "history_io")
+and name, and are rendered as a summary table or in the Prometheus text
+exposition format. PrometheusFileExporter writes that format to a file
+periodically for node_exporter's textfile collector or similar scrapers.
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+SUB_BUCKET_BITS = 4
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = 2 * _SUB_BUCKETS  # values below this get one bucket each
+_BUCKETS = 64 * _SUB_BUCKETS
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "calculator"
+
+T = TypeVar("T")
+
+
+def bucket_index(value: int) -> int:
+    """Return the histogram bucket of a non-negative integer value."""
+    if value < _LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * _SUB_BUCKETS + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Return the [low, high) value range of a bucket."""
+    if index < _LINEAR_LIMIT:
+        return index, index + 1
+    shift = index // _SUB_BUCKETS - 1
+    sub = index - shift * _SUB_BUCKETS
+    return sub << shift, (sub + 1) << shift
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond latencies with an error counter."""
+
+    __slots__ = ("counts", "count", "total", "max", "errors", "_lock")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, nanoseconds: int, error: bool = False) -> None:
+        """Add one latency sample."""
+        index = bucket_index(nanoseconds) if nanoseconds > 0 else 0
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += nanoseconds
+            if nanoseconds > self.max:
+                self.max = nanoseconds
+            if error:
+                self.errors += 1
+
+    def percentile(self, quantile: float) -> int:
+        """
+        Return the latency at a quantile (0-1) in nanoseconds.
+
+        The value is the midpoint of the bucket holding the sample at that
+        rank, capped at the largest recorded value.
+        """
+        with self._lock:
+            counts, count, maximum = list(self.counts), self.count, self.max
+        if not count:
+            return 0
+        rank = max(1, -int(-quantile * count // 1))
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                return min(maximum, (low + high - 1) // 2)
+        return maximum
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return count, errors, sum and max plus p50/p95/p99, in seconds."""
+        result = {"count": self.count, "errors": self.errors,
+                  "sum": self.total / 1e9, "max": self.max / 1e9}
+        for quantile in QUANTILES:
+            result[f"p{int(quantile * 100)}"] = self.percentile(quantile) / 1e9
+        return result
+
+    def reset(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            self.counts = [0] * _BUCKETS
+            self.count = self.total = self.max = self.errors = 0
+
+
+class MetricsRegistry:
+    """Latency histograms keyed by (kind, name)."""
+
+    def __init__(self):
+        self.enabled = True
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, kind: str, name: str) -> LatencyHistogram:
+        """Return the histogram for (kind, name), creating it on first use."""
+        key = (kind, name)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, kind: str, name: str, nanoseconds: int, error: bool = False) -> None:
+        """Record one latency sample unless metrics are disabled."""
+        if self.enabled:
+            self.histogram(kind, name).record(nanoseconds, error)
+
+    def timed(self, kind: str, name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        """Decorator recording the latency of every call; raising calls count as errors."""
+        def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter_ns()
+                failed = True
+                try:
+                    result = func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self.observe(kind, name, time.perf_counter_ns() - started, failed)
+            return wrapper
+        return decorator
+
+    def items(self) -> Iterator[Tuple[str, str, LatencyHistogram]]:
+        """Iterate over (kind, name, histogram), sorted by kind and name."""
+        with self._lock:
+            entries = sorted(self._histograms.items())
+        for (kind, name), histogram in entries:
+            yield kind, name, histogram
+
+    def reset(self) -> None:
+        """Forget all histograms."""
+        with self._lock:
+            self._histograms.clear()
+
+    def format_table(self, kind: Optional[str] = None) -> str:
+        """Render a fixed-width summary table, optionally for one kind only."""
+        header = (f"{'kind':<11} {'name':<20} {'count':>8} {'errors':>6} "
+                  f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        lines = [header, "-" * len(header)]
+        for entry_kind, name, histogram in self.items():
+            if kind is not None and entry_kind != kind:
+                continue
+            stats = histogram.snapshot()
+            lines.append(
+                f"{entry_kind:<11} {name:<20} {stats['count']:>8} {stats['errors']:>6} "
+                + " ".join(f"{stats[key] * 1e3:>9.3f}" for key in ("p50", "p95", "p99", "max")))
+        return "\n".join(lines) if len(lines) > 2 else "No metrics recorded yet"
+
+    def render_prometheus(self) -> str:
+        """Render all histograms as Prometheus summaries plus error counters."""
+        lines = []
+        by_kind: Dict[str, List[Tuple[str, LatencyHistogram]]] = {}
+        for kind, name, histogram in self.items():
+            by_kind.setdefault(kind, []).append((name, histogram))
+        for kind, entries in by_kind.items():
+            metric = f"{METRIC_PREFIX}_{kind}_latency_seconds"
+            lines.append(f"# HELP {metric} Latency of calculator {kind} calls.")
+            lines.append(f"# TYPE {metric} summary")
+            for name, histogram in entries:
+                label = f'{kind}="{_escape(name)}"'
+                for quantile in QUANTILES:
+                    value = histogram.percentile(quantile) / 1e9
+                    lines.append(f'{metric}{{{label},quantile="{quantile}"}} {value:.9f}')
+                lines.append(f"{metric}_sum{{{label}}} {histogram.total / 1e9:.9f}")
+                lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+            errors = f"{METRIC_PREFIX}_{kind}_errors_total"
+            lines.append(f"# HELP {errors} Failed calculator {kind} calls.")
+            lines.append(f"# TYPE {errors} counter")
+            for name, histogram in entries:
+                lines.append(f'{errors}{{{kind}="{_escape(name)}"}} {histogram.errors}')
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PrometheusFileExporter:
+    """
+    Writes a registry in Prometheus text format to a file every `interval` seconds.
+
+    The file is replaced atomically, so scrapers never read a partial file.
+
+    Args:
+        registry (MetricsRegistry): Metrics to export.
+        path: Output file.
+        interval (float): Seconds between writes.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path, interval: float = 15.0):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        """Write the current metrics now."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(self.registry.render_prometheus(), encoding="utf-8")
+        os.replace(temporary, self.path)
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter",
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as error:
+                logger.warning("Could not write metrics file %s: %s", self.path, error)
+
+    def stop(self) -> None:
+        """Stop the writer thread and write the final values."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.write()
+        except OSError as error:
+            logger.warning("Could not write metrics file %s: %s", self.path, error)
+
+
+# Process-wide registry used by the engine, history I/O and command dispatch
+METRICS = MetricsRegistry()
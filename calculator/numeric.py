@@ -0,0 +1,183 @@
+"""
+Precision-aware numeric modes.
+
+Results are rounded to a fixed number of decimal places and written in a
+canonical form without trailing fractional zeros, so "2.50 + 2.50" gives 5
+whichever way it was computed. Two modes are supported:
+
+* exact: operations run in Decimal with a working precision derived from
+  the requested places, and the result is rounded once at the end.
+* fast: batches of additions, subtractions, multiplications and
+  divisions run in float64 NumPy arrays. A float result is only used when
+  its error bound proves that it rounds to the same decimal as the exact
+  result. Other elements, e.g. near a rounding tie or with very large
+  magnitudes, fall back to the exact path.
+
+Single operations use the exact path in both modes. The C implementation of
+decimal adds or divides faster than a Decimal can be converted to float and
+back, so a scalar float path would only add overhead.
+"""
+
+import operator
+from decimal import Decimal, getcontext
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from calculator.operations import add_numbers, sub_numbers, mul_numbers, div_numbers
+
+EXACT = "exact"
+FAST = "fast"
+MODES = (EXACT, FAST)
+
+# Decimal's default precision; the working precision never drops below it
+MIN_WORKING_PRECISION = 28
+# Integer digits kept on top of the requested decimal places
+INTEGER_DIGITS = 16
+# Unit roundoff of IEEE 754 binary64
+UNIT_ROUNDOFF = 2.0 ** -53
+# Scaled results at or above this magnitude are not exact integers in float64
+MAX_SCALED = 2.0 ** 52
+
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+
+OperationFunc = Callable[[Decimal, Decimal], Decimal]
+
+# Decimal operation -> (float operation, whether operand magnitudes bound the error)
+FAST_OPERATIONS: Dict[OperationFunc, Tuple[Callable, bool]] = {
+    add_numbers: (operator.add, True),
+    sub_numbers: (operator.sub, True),
+    mul_numbers: (operator.mul, False),
+    div_numbers: (operator.truediv, False),
+}
+
+
+def working_precision(places: int) -> int:
+    """Return the Decimal context precision used for results with `places` decimals."""
+    return max(MIN_WORKING_PRECISION, places + INTEGER_DIGITS)
+
+
+def canonical(value: Decimal) -> Decimal:
+    """
+    Write a value without trailing fractional zeros or exponent where the precision allows.
+
+    "5.00" becomes "5", "2.50" becomes "2.5", "6.9707E+5" becomes "697070"
+    and "-0" becomes "0".
+    """
+    if not value.is_finite():
+        return value
+    if not value:
+        return _ZERO
+    value = value.normalize()
+    if value == value.to_integral_value() and value.adjusted() < getcontext().prec:
+        value = value.quantize(_ONE)
+    return value
+
+
+def quantize_result(value: Decimal, places: int) -> Decimal:
+    """
+    Round a result to at most `places` decimal places in canonical form.
+
+    Args:
+        value (Decimal): Result to round.
+        places (int): Decimal places kept.
+
+    Returns:
+        Decimal: The rounded result.
+    """
+    # Values too long for the working precision have no fractional digits to round
+    if value.is_finite() and value.adjusted() + places + 1 < getcontext().prec:
+        value = value.quantize(_ONE.scaleb(-places))
+    return canonical(value)
+
+
+class NumericMode:
+    """
+    Rounds engine results to a fixed number of decimal places.
+
+    Args:
+        mode (str): "exact" or "fast".
+        places (int): Decimal places of every result.
+
+    Raises:
+        ValueError: If the mode is unknown or places is negative.
+    """
+
+    def __init__(self, mode: str = EXACT, places: int = 4):
+        mode = mode.strip().lower()
+        if mode not in MODES:
+            raise ValueError(f"Unknown numeric mode: {mode}")
+        if places < 0:
+            raise ValueError("Precision must not be negative")
+        self.mode = mode
+        self.places = places
+        self.prec = working_precision(places)
+        self.fast_results = 0
+        self.fallbacks = 0
+
+    def quantize(self, value: Decimal) -> Decimal:
+        """Round a Decimal result to the configured places."""
+        return quantize_result(value, self.places)
+
+    def fast_batch(self, op_func: OperationFunc, xs: Sequence,
+                   ys: Sequence) -> Optional[Tuple[List[Optional[Decimal]], List[bool]]]:
+        """
+        Round a batch computed in float64, leaving unproven elements to the exact path.
+
+        Operand and float64 rounding errors are bounded by 4 units in the
+        last place of the largest magnitude involved. A rounded result is
+        kept only if the scaled float result is farther than that bound from
+        the midpoint between two representable results, so it matches the
+        correctly rounded exact result.
+
+        Returns:
+            None when the fast path does not apply, otherwise the rounded
+            results (None where Decimal is needed) and a per-element flag
+            marking the elements that need it.
+        """
+        entry = FAST_OPERATIONS.get(op_func) if self.mode == FAST else None
+        if entry is None:
+            return None
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        float_op, additive = entry
+        try:
+            x_arr = np.asarray(xs, dtype=np.float64)
+            y_arr = np.asarray(ys, dtype=np.float64)
+        except (TypeError, ValueError):
+            return None
+        scale = 10.0 ** self.places
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            results = float_op(x_arr, y_arr)
+            magnitude = np.abs(results)
+            if additive:
+                magnitude += np.abs(x_arr) + np.abs(y_arr)
+            scaled = results * scale
+            units = np.rint(scaled)
+            error = (4 * UNIT_ROUNDOFF * scale * (1 + 4 * UNIT_ROUNDOFF) * magnitude
+                     + 2 * UNIT_ROUNDOFF * np.abs(scaled))
+            proven = (np.abs(scaled) < MAX_SCALED) & (0.5 - np.abs(scaled - units) > error)
+        if float_op is operator.truediv:
+            proven &= y_arr != 0
+
+        # Strip trailing zeros so results match canonical(): 2.5000 -> 25 x 10^-1
+        units = np.where(proven, units, 0).astype(np.int64)
+        exponents = np.where(units == 0, 0, -self.places)
+        for _ in range(self.places):
+            strip = (units % 10 == 0) & (exponents < 0) & (units != 0)
+            if not strip.any():
+                break
+            units = np.where(strip, units // 10, units)
+            exponents += strip
+        rounded: List[Optional[Decimal]] = [
+            (Decimal(unit).scaleb(exponent) if exponent else Decimal(unit)) if ok else None
+            for unit, exponent, ok in zip(units.tolist(), exponents.tolist(), proven.tolist())
+        ]
+        fast_count = int(proven.sum())
+        self.fast_results += fast_count
+        self.fallbacks += len(rounded) - fast_count
+        return rounded, (~proven).tolist()
+
+    def stats(self) -> dict:
+        """Return the mode, places and how many batch results skipped Decimal arithmetic."""
+        return {"mode": self.mode, "places": self.places, "prec": self.prec,
+                "fast_results": self.fast_results, "fallbacks": self.fallbacks}
@@ -0,0 +1,140 @@
+"""
+Registry of operation codes.
+
+Every binary operation that can appear in history gets a small integer
+opcode and a display symbol. Compact history backends store the opcode
+instead of a reference to the function.
+"""
+
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from calculator.operations import (
+    add_numbers, sub_numbers, mul_numbers, div_numbers, power_numbers, mod_numbers,
+    root_numbers, powmod_numbers
+)
+
+OperationFunc = Callable[[Decimal, Decimal], Decimal]
+
+# Opcode 0 is reserved to mark empty slots in columnar storage and the two
+# highest opcodes for undo/redo entries in the history journal
+EMPTY_OPCODE = 0
+UNDO_OPCODE = 254
+REDO_OPCODE = 255
+MAX_OPCODE = 253
+UNKNOWN_SYMBOL = "?"
+
+_operations: List[Optional[OperationFunc]] = [None]
+_symbols: List[str] = [UNKNOWN_SYMBOL]
+_by_key: Dict[Tuple[str, str], int] = {}
+_by_symbol: Dict[str, int] = {}
+_symbol_by_name: Dict[str, str] = {}
+_symbol_by_func: Dict[OperationFunc, str] = {}
+# Opcodes whose records keep only part of their operands and cannot be recomputed
+_result_only: Set[int] = set()
+
+
+def _operation_key(func: OperationFunc) -> Tuple[str, str]:
+    # Closures created at the same place (e.g. lambdas) share one opcode
+    return (getattr(func, "__module__", ""), getattr(func, "__qualname__", repr(func)))
+
+
+def register(func: OperationFunc, symbol: str = UNKNOWN_SYMBOL,
+             recomputable: bool = True) -> int:
+    """
+    Register an operation and return its opcode.
+
+    Registering the same function again returns the existing opcode. An
+    operation that is not recomputable from two operands (e.g. powmod,
+    whose modulus history CSV files do not keep) can only be loaded with
+    its stored result.
+
+    Raises:
+        ValueError: If all opcodes are in use.
+    """
+    key = _operation_key(func)
+    opcode = _by_key.get(key)
+    if opcode is not None:
+        return opcode
+    if len(_operations) > MAX_OPCODE:
+        raise ValueError("No free opcodes left for operation "
+                         f"{getattr(func, '__name__', func)}")
+    opcode = len(_operations)
+    _operations.append(func)
+    _symbols.append(symbol)
+    _by_key[key] = opcode
+    _symbol_by_func[func] = symbol
+    if not recomputable:
+        _result_only.add(opcode)
+    if symbol != UNKNOWN_SYMBOL:
+        _by_symbol.setdefault(symbol, opcode)
+        _symbol_by_name.setdefault(getattr(func, "__name__", ""), symbol)
+    return opcode
+
+
+def opcode_for(func: OperationFunc) -> int:
+    """Return the opcode of an operation, registering it if needed."""
+    opcode = _by_key.get(_operation_key(func))
+    return opcode if opcode is not None else register(func)
+
+
+def operation_for(opcode: int) -> OperationFunc:
+    """Return the operation function for an opcode."""
+    func = _operations[opcode] if 0 < opcode < len(_operations) else None
+    if func is None:
+        raise KeyError(f"Unknown opcode: {opcode}")
+    return func
+
+
+def is_recomputable(opcode: int) -> bool:
+    """Return whether a record's result can be recomputed from its two operands."""
+    return opcode not in _result_only
+
+
+def symbol_for(opcode: int) -> str:
+    """Return the display symbol for an opcode."""
+    return _symbols[opcode] if 0 <= opcode < len(_symbols) else UNKNOWN_SYMBOL
+
+
+def symbol_for_operation(func: OperationFunc) -> str:
+    """
+    Return the display symbol of an operation without registering it.
+
+    Unregistered functions fall back to the symbol of a registered operation
+    with the same name.
+    """
+    symbol = _symbol_by_func.get(func)
+    if symbol is not None:
+        return symbol
+    opcode = _by_key.get(_operation_key(func))
+    if opcode is not None:
+        return _symbols[opcode]
+    return _symbol_by_name.get(getattr(func, "__name__", ""), UNKNOWN_SYMBOL)
+
+
+def opcode_for_symbol(symbol: str) -> int:
+    """
+    Return the opcode for a display symbol.
+
+    Raises:
+        KeyError: If no operation uses the symbol.
+    """
+    return _by_symbol[symbol]
+
+
+def symbol_table() -> Dict[str, int]:
+    """Return a copy of the symbol to opcode mapping."""
+    return dict(_by_symbol)
+
+
+for _func, _symbol in (
+    (add_numbers, "+"),
+    (sub_numbers, "-"),
+    (mul_numbers, "×"),
+    (div_numbers, "÷"),
+    (power_numbers, "^"),
+    (mod_numbers, "%"),
+    (root_numbers, "√"),
+):
+    register(_func, _symbol)
+register(powmod_numbers, "^%", recomputable=False)
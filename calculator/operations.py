@@ -2,11 +2,14 @@
 Operations Module with CalcEngine Wrapper.
 
 Provides basic arithmetic functions including addition, subtraction,
-multiplication, division, squaring, power, and modulus, using Decimal precision.
+multiplication, division, squaring, power, modular power, roots, and modulus, using
+Decimal precision.
 """
 
 from decimal import Decimal
 
+from calculator.roots import nth_root
+
 
 # Standalone functions for operations
 def add_numbers(x: Decimal, y: Decimal) -> Decimal:
@@ -29,6 +32,21 @@ def square_number(x: Decimal) -> Decimal:
 def power_numbers(x: Decimal, y: Decimal) -> Decimal:
     return x ** y
 
+def powmod_numbers(x: Decimal, y: Decimal, m: Decimal) -> Decimal:
+    if m == 0:
+        raise ValueError("Cannot perform modulus with zero divisor")
+    if not all(v.is_finite() and v == v.to_integral_value() for v in (x, y, m)):
+        return (x ** y) % m
+    # Square-and-multiply on ints never builds x ** y; the sign follows x ** y like Decimal %
+    base, exponent, modulus = int(x), int(y), abs(int(m))
+    result = pow(base, exponent, modulus)
+    if result and base < 0 and exponent % 2:
+        result -= modulus
+    return Decimal(result)
+
+def root_numbers(x: Decimal, n: Decimal) -> Decimal:
+    return nth_root(x, n)
+
 def mod_numbers(x: Decimal, y: Decimal) -> Decimal:
     if y == 0:
         raise ValueError("Cannot perform modulus with zero divisor")
@@ -0,0 +1,109 @@
+"""
+Bounded LRU cache of operation results.
+
+Entries are keyed on the operation, the exact operand representations and
+the active decimal context, so Decimal("1.0") and Decimal("1") (equal, but
+producing differently formatted results) never share an entry, and a
+change of precision or rounding never returns a stale result.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+from typing import Callable, Hashable, Optional, Tuple
+
+# Approximate per-entry cost of the key tuple, dict slot and links
+ENTRY_OVERHEAD = 240
+
+
+def context_key() -> Tuple[int, str, int, int, int]:
+    """Return the settings of the current decimal context that affect results."""
+    context = getcontext()
+    return (context.prec, context.rounding, context.Emin, context.Emax, context.clamp)
+
+
+def operand_key(value) -> Hashable:
+    """Exact, hashable representation of an operand."""
+    return value.as_tuple() if isinstance(value, Decimal) else (type(value), value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of operation results limited by an approximate size in bytes.
+
+    Args:
+        max_bytes (int): Upper bound on the estimated memory held by entries.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Decimal, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(op_func: Callable, x, y) -> Hashable:
+        """Build the cache key for an operation in the current decimal context."""
+        return (op_func, operand_key(x), operand_key(y), context_key())
+
+    def get(self, key: Hashable) -> Optional[Decimal]:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, result: Decimal, x=None, y=None) -> None:
+        """
+        Store a result, evicting least recently used entries to stay in budget.
+
+        Args:
+            key: Key from make_key.
+            result (Decimal): Result to cache.
+            x, y: Operands, used only to estimate the entry size.
+        """
+        cost = ENTRY_OVERHEAD + sys.getsizeof(result) + sys.getsizeof(x) + sys.getsizeof(y)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            self._entries[key] = (result, cost)
+            self.size_bytes += cost
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_cost
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return entry count, size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
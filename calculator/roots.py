@@ -0,0 +1,132 @@
+"""
+Exact nth roots of Decimals.
+
+A Decimal x = c * 10**e, with trailing zeros moved from c into e, is a
+perfect nth power exactly when e is a multiple of n and the integer
+coefficient is a perfect power; integer_root() decides that with an
+integer Newton iteration, so roots such as 27 ** (1/3) or 0.008 ** (1/3)
+come out exact. Very large degrees are ruled out by the coefficient's
+length alone. Every other root is found with Newton's method in Decimal,
+started from a 15-digit float estimate and doubling the working precision
+each step, and rounded once to the active context. Square roots use
+Decimal.sqrt(), which is correctly rounded.
+"""
+
+import math
+from decimal import Decimal, localcontext
+
+# Extra digits carried through the Newton iteration before the final rounding
+GUARD_DIGITS = 5
+# Digits a float starting estimate is good for
+ESTIMATE_DIGITS = 15
+LOG10_2 = math.log10(2)
+
+
+def integer_root(value: int, n: int) -> int:
+    """
+    Return the floor of the nth root of a non-negative integer.
+
+    Args:
+        value (int): Radicand, at least 0.
+        n (int): Degree, at least 1.
+    """
+    if value < 2 or n == 1:
+        return value
+    bits = value.bit_length()
+    if n >= bits:
+        return 1
+    # Start above the root; Newton's method then decreases monotonically to the floor
+    guess = 1 << -(-bits // n)
+    while True:
+        better = ((n - 1) * guess + value // guess ** (n - 1)) // n
+        if better >= guess:
+            return guess
+        guess = better
+
+
+def _exact_root(x: Decimal, n: int):
+    """Return the nth root of a positive Decimal if it is exact, else None."""
+    _, digits, exponent = x.as_tuple()
+    # Without trailing zeros the coefficient of a perfect power is itself a
+    # perfect power and the exponent a multiple of n, so no shifted (and for
+    # large n huge) integer has to be built
+    text = "".join(map(str, digits))
+    stripped = text.rstrip("0")
+    exponent += len(text) - len(stripped)
+    if exponent % n:
+        return None
+    # Any root above 1 has an nth power of at least n * log10(2) digits
+    if stripped != "1" and len(stripped) < n * LOG10_2:
+        return None
+    coefficient = int(stripped)
+    root = integer_root(coefficient, n)
+    if root ** n != coefficient:
+        return None
+    return Decimal(root).scaleb(exponent // n)
+
+
+def _estimate(x: Decimal, n: int) -> Decimal:
+    """Float estimate of the nth root of a positive Decimal, for any magnitude."""
+    adjusted = x.adjusted()
+    log10 = (adjusted + math.log10(float(x.scaleb(-adjusted)))) / n
+    whole = math.floor(log10)
+    return Decimal(repr(10 ** (log10 - whole))).scaleb(whole)
+
+
+def _newton_root(x: Decimal, n: int, digits: int) -> Decimal:
+    """Newton's method for the nth root of a positive Decimal to `digits` significant digits."""
+    steps = []
+    while digits > ESTIMATE_DIGITS:
+        steps.append(digits)
+        digits = digits // 2 + 1
+    with localcontext() as context:
+        root = _estimate(x, n)
+        # Each step doubles the correct digits, so the precision can double too;
+        # the final step repeats at full precision to settle the last digit
+        for prec in reversed([steps[0]] + steps if steps else [ESTIMATE_DIGITS]):
+            context.prec = prec
+            root = ((n - 1) * root + x / root ** (n - 1)) / n
+    return root
+
+
+def nth_root(x: Decimal, n: Decimal) -> Decimal:
+    """
+    Return the nth root of x in the active Decimal context.
+
+    Perfect powers are exact; other results are rounded once to the
+    context precision. Negative x has a real root only for odd integer n.
+    Non-integer degrees fall back to x ** (1 / n).
+
+    Args:
+        x (Decimal): Radicand.
+        n (Decimal): Degree, non-zero.
+
+    Raises:
+        ValueError: If n is zero, or x is negative and n an even integer.
+    """
+    if n == 0:
+        raise ValueError("Root degree cannot be zero")
+    if not x.is_finite() or not n.is_finite() or n != n.to_integral_value():
+        return x ** (1 / n)
+    degree = int(n)
+    if degree < 0:
+        with localcontext() as context:
+            context.prec += GUARD_DIGITS
+            inverse = 1 / nth_root(x, Decimal(-degree))
+        return +inverse
+    if not x or degree == 1:
+        return +x
+    if x < 0:
+        if degree % 2 == 0:
+            raise ValueError("Cannot take an even root of a negative number")
+        return -nth_root(-x, n)
+
+    exact = _exact_root(x, degree)
+    if exact is not None:
+        return +exact
+    if degree == 2:
+        return x.sqrt()
+    with localcontext() as context:
+        digits = context.prec + GUARD_DIGITS
+        root = _newton_root(x, degree, digits)
+    return +root
@@ -0,0 +1,219 @@
+"""
+Worker process pool for expensive operations.
+
+Powers and roots at high precision (or with very long operands) can run
+for minutes inside libmpdec without releasing control. CalcEngine routes
+such operations to a separate process so they can be timed out or
+cancelled, while cheap operations stay in-process and pay no IPC cost.
+Python cannot interrupt a running computation, so a timeout or
+cancellation terminates the worker processes; the pool is recreated
+lazily on the next expensive call.
+
+Workers are started with the forkserver method where available (spawn
+elsewhere): forking a process that runs threads, as the REPL, server and
+journal do, can deadlock the child. Each worker reports its pid when it
+starts, so the pool can terminate busy workers without executor internals.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import BrokenExecutor, Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from decimal import Context, Decimal, getcontext, localcontext
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from calculator.batch import evaluate_exact
+from calculator.operations import power_numbers, root_numbers
+
+logger = logging.getLogger(__name__)
+
+OperationFunc = Callable[[Decimal, Decimal], Decimal]
+
+# Operations whose cost grows with the working precision
+EXPENSIVE_OPERATIONS = {power_numbers, root_numbers}
+# Working digits above which an expensive operation leaves the process
+OFFLOAD_MIN_DIGITS = 100
+# Integral powers take one multiplication per exponent bit, which beats the
+# ~200 us process round trip up to this many working digits
+INTEGRAL_POWER_OFFLOAD_MIN_DIGITS = 1000
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CHUNK_SIZE = 1000
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() \
+    else "spawn"
+
+
+class OffloadError(ArithmeticError):
+    """Base class for operations that did not finish in a worker process."""
+
+
+class OperationTimeout(OffloadError):
+    """Raised when an offloaded operation exceeds its timeout."""
+
+
+class OperationCancelled(OffloadError):
+    """Raised when an offloaded operation is cancelled."""
+
+
+def _digits(value) -> int:
+    if isinstance(value, Decimal):
+        return len(value.as_tuple().digits)
+    return 0
+
+
+def is_expensive(op_func: OperationFunc, x=None, y=None) -> bool:
+    """
+    Classify an operation as expensive enough to run in a worker process.
+
+    Only operations in EXPENSIVE_OPERATIONS qualify, and only when the
+    working size (context precision or operand length) exceeds
+    OFFLOAD_MIN_DIGITS, or INTEGRAL_POWER_OFFLOAD_MIN_DIGITS for powers
+    with an integral exponent.
+    """
+    if op_func not in EXPENSIVE_OPERATIONS:
+        return False
+    limit = OFFLOAD_MIN_DIGITS
+    if (op_func is power_numbers and isinstance(y, Decimal) and y.is_finite()
+            and y == y.to_integral_value()):
+        limit = INTEGRAL_POWER_OFFLOAD_MIN_DIGITS
+    return max(getcontext().prec, _digits(x), _digits(y)) > limit
+
+
+def _report_pid(pids) -> None:
+    """Worker initializer: tell the pool which process to stop on a timeout."""
+    pids.put(os.getpid())
+
+
+def _call_in_context(op_func: OperationFunc, x, y, context: Context):
+    with localcontext(context):
+        return op_func(x, y)
+
+
+def _evaluate_chunk(op_func: OperationFunc, xs: Sequence, ys: Sequence, context: Context):
+    with localcontext(context):
+        return evaluate_exact(op_func, xs, ys)
+
+
+class WorkerPool:
+    """
+    Lazily started process pool running operations in the caller's decimal context.
+
+    Args:
+        max_workers (int): Number of worker processes.
+        timeout (Optional[float]): Default per-operation timeout in seconds.
+        chunk_size (int): Elements per task when fanning out batches.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.chunk_size = max(1, chunk_size)
+        self.timeouts = 0
+        self.cancellations = 0
+        self._executor = None
+        self._pids = None  # queue the workers of the current executor report to
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # Imported here to keep process pools out of startup
+                from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+                context = multiprocessing.get_context(START_METHOD)
+                self._pids = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=context,
+                    initializer=_report_pid, initargs=(self._pids,))
+            return self._executor
+
+    def submit(self, op_func: OperationFunc, x, y) -> Future:
+        """Start an operation in a worker and return its future."""
+        return self._pool().submit(_call_in_context, op_func, x, y, getcontext().copy())
+
+    def _wait(self, future: Future, timeout: Optional[float]):
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            self.timeouts += 1
+            self.terminate()
+            raise OperationTimeout(f"Operation timed out after {timeout} seconds") from None
+        except KeyboardInterrupt:
+            self.cancellations += 1
+            self.terminate()
+            raise OperationCancelled("Operation cancelled") from None
+
+    def run(self, op_func: OperationFunc, x, y, timeout: Optional[float] = None) -> Decimal:
+        """
+        Run one operation in a worker process and wait for its result.
+
+        Exceptions raised by the operation are re-raised here. If the pool
+        was broken by another call's timeout, the operation is retried once.
+
+        Raises:
+            OperationTimeout: If the operation does not finish in time.
+            OperationCancelled: If waiting is interrupted (Ctrl+C).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return self._wait(self.submit(op_func, x, y), timeout)
+        except BrokenExecutor:
+            self._executor = None
+            return self._wait(self.submit(op_func, x, y), timeout)
+
+    def evaluate_chunks(self, op_func: OperationFunc, xs: Sequence, ys: Sequence,
+                        timeout: Optional[float] = None) -> Tuple[List, List, List, List]:
+        """
+        Evaluate a batch exactly, fanned out over the workers in chunks.
+
+        Args:
+            timeout (Optional[float]): Timeout for each chunk.
+
+        Returns:
+            Same tuple as calculator.batch.evaluate_exact, in input order.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        context = getcontext().copy()
+        pool = self._pool()
+        futures = [pool.submit(_evaluate_chunk, op_func, list(xs[start:start + self.chunk_size]),
+                               list(ys[start:start + self.chunk_size]), context)
+                   for start in range(0, len(xs), self.chunk_size)]
+        combined = ([], [], [], [])
+        try:
+            for future in futures:
+                for column, values in zip(combined, self._wait(future, timeout)):
+                    column.extend(values)
+        finally:
+            for future in futures:
+                future.cancel()
+        return combined
+
+    def terminate(self) -> None:
+        """Stop all workers, including running operations, and cancel queued ones."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pids, self._pids = self._pids, None
+        if executor is None:
+            return
+        executor.shutdown(wait=False, cancel_futures=True)
+        # shutdown() cannot stop a running task, so stop the workers themselves
+        stopped = 0
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+                stopped += 1
+            except OSError:
+                pass  # already exited
+        pids.close()
+        logger.warning("Terminated %d worker processes", stopped)
+
+    def shutdown(self) -> None:
+        """Stop the pool after running operations finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pids, self._pids = self._pids, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            pids.close()
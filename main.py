@@ -1,5 +1,67 @@
 """ This module is Entry Point. """
+import argparse
+import contextlib
+import sys
+
 from app.app_class import App  # instead of from app import App
 
+DEFAULT_PORT = 8765
+
+
+def run_script_mode(args) -> int:
+    """Run commands from a file or piped stdin through the plugin CommandHandler."""
+    from app import App as PluginApp  # pylint: disable=import-outside-toplevel
+    # Keep startup chatter out of the command output stream
+    with contextlib.redirect_stdout(sys.stderr):
+        app = PluginApp(start_repl=False)
+    if args.script in (None, "-"):
+        return app.run_script(sys.stdin, quiet=args.quiet, log_commands=args.log_commands)
+    with open(args.script, encoding="utf-8") as script:
+        return app.run_script(script, quiet=args.quiet, log_commands=args.log_commands)
+
+
+def run_server_mode(args) -> None:
+    """Serve the plugin commands over TCP and/or a UNIX socket until interrupted."""
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from app import App as PluginApp  # pylint: disable=import-outside-toplevel
+    from app.server import serve  # pylint: disable=import-outside-toplevel
+    with contextlib.redirect_stdout(sys.stderr):
+        app = PluginApp(start_repl=False)
+    port = args.port
+    if port is None and not args.unix:
+        port = DEFAULT_PORT
+    try:
+        asyncio.run(serve(app.command_handler, args.host, port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    """Start the interactive calculator, script mode for files and pipes, or the server."""
+    parser = argparse.ArgumentParser(description="Advanced Python Calculator")
+    parser.add_argument("script", nargs="?",
+                        help="file of commands to run, '-' for stdin")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="suppress per-command output in script mode")
+    parser.add_argument("--log-commands", action="store_true",
+                        help="log every script line at DEBUG level")
+    parser.add_argument("-i", "--interactive", action="store_true",
+                        help="force the interactive prompt even when stdin is not a TTY")
+    parser.add_argument("--serve", action="store_true",
+                        help="serve commands as line-delimited JSON over TCP/UNIX sockets")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host for --serve")
+    parser.add_argument("--port", type=int,
+                        help=f"TCP port for --serve (default {DEFAULT_PORT})")
+    parser.add_argument("--unix", metavar="PATH", help="UNIX socket path for --serve")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        run_server_mode(args)
+    elif args.script or (not args.interactive and not sys.stdin.isatty()):
+        run_script_mode(args)
+    else:
+        App()
+
+
 if __name__ == "__main__":
-    App()
+    main()
@@ -0,0 +1,15 @@
+"""Shared test setup."""
+import os
+import pytest
+from calculator import CalcEngine
+
+# Keep test runs from replaying or writing the project's AUTO_SAVE journal;
+# journal tests enable it explicitly with their own directory.
+os.environ.setdefault("CALCULATOR_AUTO_SAVE", "false")
+
+
+@pytest.fixture(autouse=True)
+def unrounded_engine():
+    """Undo the numeric mode an App applies, so engine tests see raw Decimal results."""
+    yield
+    CalcEngine.configure_numeric(None)
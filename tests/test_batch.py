@@ -0,0 +1,67 @@
+"""Tests for CalcEngine batch evaluation."""
+from decimal import Decimal
+import numpy as np
+import pytest
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.operations import mul_numbers
+
+
+@pytest.fixture(autouse=True)
+def clear_history_before_tests():
+    """Start every test with an empty history."""
+    OperationHistory.clear_records()
+
+
+def test_exact_batch_records_all_elements():
+    """Exact batch returns Decimal results and records every element."""
+    batch = CalcEngine.evaluate_batch("add", ["0.1", "2"], ["0.2", "3"])
+    assert batch.results == [Decimal("0.3"), Decimal("5")]
+    assert batch.errors == [False, False]
+    assert len(OperationHistory.get_all_records()) == 2
+
+
+def test_exact_batch_masks_division_by_zero():
+    """Division by zero is reported per element instead of raising."""
+    batch = CalcEngine.evaluate_batch("divide", [10, 1, 9], [2, 0, 3])
+    assert batch.results == [Decimal("5"), None, Decimal("3")]
+    assert batch.errors == [False, True, False]
+    assert batch.error_count == 1
+    assert len(OperationHistory.get_all_records()) == 2
+
+
+def test_float_batch_with_numpy_arrays():
+    """Float path works on NumPy arrays and masks failed elements."""
+    xs = np.array([1.0, 4.0, 9.0])
+    ys = np.array([2.0, 0.0, 3.0])
+    batch = CalcEngine.evaluate_batch("divide", xs, ys, exact=False)
+    assert batch.errors.tolist() == [False, True, False]
+    assert batch.results[0] == 0.5
+    assert np.isnan(batch.results[1])
+    records = OperationHistory.get_all_records()
+    assert [(r.x, r.y) for r in records] == [(Decimal("1.0"), Decimal("2.0")),
+                                             (Decimal("9.0"), Decimal("3.0"))]
+
+
+
+def test_float_batch_masks_non_numeric_elements():
+    """Non-numeric operands fail their own element, as in the exact path."""
+    batch = CalcEngine.evaluate_batch("add", ["1", "abc", 3], [2, 5, None], exact=False)
+    assert batch.errors.tolist() == [False, True, True]
+    assert batch.results[0] == 3.0
+    assert np.isnan(batch.results[1:]).all()
+    assert [r.formatted for r in OperationHistory.get_all_records()] == ["1.0 + 2.0 = 3.0"]
+
+def test_batch_accepts_operation_function_and_skips_history():
+    """Operation functions are accepted and record=False leaves history alone."""
+    batch = CalcEngine.evaluate_batch(mul_numbers, [2, 3], [4, 5], record=False)
+    assert batch.results == [Decimal("8"), Decimal("15")]
+    assert len(OperationHistory.get_all_records()) == 0
+
+
+def test_batch_rejects_bad_input():
+    """Unknown operations and mismatched lengths raise ValueError."""
+    with pytest.raises(ValueError):
+        CalcEngine.evaluate_batch("modulus", [1], [2])
+    with pytest.raises(ValueError):
+        CalcEngine.evaluate_batch("add", [1, 2], [3])
@@ -0,0 +1,68 @@
+"""Tests for the benchmark regression gate."""
+from benchmarks.regression import (compare, load_report, machine_scale, make_report,
+                                   python_version, regressions, write_report)
+
+
+def _report(calibration=None, **seconds):
+    meta = {"calibration": calibration} if calibration else {}
+    return {"meta": meta,
+            "results": {name: {"seconds": value, "unit": "op"} for name, value in seconds.items()}}
+
+
+def test_gate_flags_only_slowdowns_beyond_threshold():
+    """Only benchmarks slower than baseline * (1 + threshold) regress; new ones never do."""
+    baseline = _report(add=1.0, divide=1.0, load=1.0)
+    current = _report(add=1.2, divide=1.5, load=0.5, cold_start=9.0)
+    comparisons = {c.name: c for c in compare(baseline, current)}
+    assert [c.name for c in regressions(comparisons.values(), 0.25)] == ["divide"]
+    assert regressions(comparisons.values(), 0.1)[0].name == "add"
+    assert comparisons["cold_start"].baseline is None
+    assert comparisons["cold_start"].describe(0.25).endswith("(new)")
+    assert "REGRESSION" in comparisons["divide"].describe(0.25)
+    assert comparisons["load"].change == -0.5
+
+
+def test_baseline_is_scaled_by_machine_calibration():
+    """A machine twice as slow doubles the baseline before comparing."""
+    baseline = _report(calibration=1.0, add=1.0)
+    current = _report(calibration=2.0, add=2.2)
+    assert machine_scale(baseline, current) == 2.0
+    assert not regressions(compare(baseline, current), 0.25)
+    assert machine_scale(_report(add=1.0), current) == 1.0
+
+
+def test_report_round_trip(tmp_path):
+    """Reports are written as JSON with machine details and read back unchanged."""
+    report = make_report({"add": {"seconds": 1e-6, "unit": "op"}}, quick=True)
+    path = tmp_path / "out" / "results.json"
+    write_report(report, path)
+    loaded = load_report(path)
+    assert loaded == report
+    assert loaded["meta"]["quick"] is True and "python" in loaded["meta"]
+
+
+def test_report_only_results_and_other_pythons_never_regress():
+    """Report-only results and baselines from another Python version are shown, not gated."""
+    baseline = _report(add=1.0, start=1.0)
+    current = _report(add=1.0, start=3.0)
+    current["results"]["start"]["report_only"] = True
+    comparisons = compare(baseline, current)
+    assert not regressions(comparisons, 0.25)
+    assert comparisons[1].describe(0.25).endswith("(report only)")
+    baseline["meta"]["python"], current["meta"]["python"] = "3.11.7", "3.12.1"
+    current["results"]["add"]["seconds"] = 2.0
+    assert python_version(current) == "3.12"
+    assert not regressions(compare(baseline, current), 0.25)
+
+
+def test_result_threshold_widens_the_gate():
+    """A result's own threshold replaces the global one only when it is wider."""
+    baseline = _report(add=1.0, start=1.0)
+    current = _report(add=1.0, start=1.8)
+    current["results"]["start"]["threshold"] = 1.0
+    assert not regressions(compare(baseline, current), 0.25)
+    current["results"]["start"]["seconds"] = 2.5
+    assert [c.name for c in regressions(compare(baseline, current), 0.25)] == ["start"]
+    current["results"]["start"]["threshold"] = 0.1
+    current["results"]["start"]["seconds"] = 1.2
+    assert not regressions(compare(baseline, current), 0.25)
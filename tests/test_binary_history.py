@@ -0,0 +1,147 @@
+"""Tests for the binary append-only history format."""
+import csv
+from decimal import Decimal
+import pytest
+from app.plugins.history_facade import CSV_COLUMNS, HistoryFacade
+from calculator.calculation import OperationRecord
+from calculator.history.binary import (BinaryHistoryError, BinaryHistoryReader,
+                                       BinaryHistoryWriter, HEADER, index_path,
+                                       pack_decimal, unpack_decimal)
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers, div_numbers, mul_numbers
+
+
+def _records(count):
+    return [OperationRecord.create(Decimal(i), Decimal("1.50"), add_numbers,
+                                   Decimal(i) + Decimal("1.50")) for i in range(count)]
+
+
+@pytest.mark.parametrize("value", ["0", "-0", "1.50", "-7", "1E+30", "0.000001",
+                                   "12345678901234567890123", "Infinity",
+                                   "-Infinity", "NaN", "-NaN123", "sNaN"])
+def test_decimal_packing_is_exact(value):
+    """Packed Decimals keep sign, digits and exponent."""
+    out = bytearray()
+    pack_decimal(out, Decimal(value))
+    decoded, offset = unpack_decimal(out, 0)
+    assert offset == len(out)
+    assert str(decoded) == str(Decimal(value))
+
+
+def test_round_trip_count_and_seek(tmp_path):
+    """Records read back in order; count and random access use the index."""
+    path = tmp_path / "history.chist"
+    with BinaryHistoryWriter(path, index_interval=16) as writer:
+        writer.extend(_records(100))
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 100
+        assert reader[0].formatted == "0 + 1.50 = 1.50"
+        assert reader[57].x == Decimal(57)
+        assert reader[-1].result == Decimal("100.50")
+        assert [row.x for row in reader.slice(30, 33)] == [30, 31, 32]
+        assert len(list(reader)) == 100
+        with pytest.raises(IndexError):
+            reader[100]  # pylint: disable=pointless-statement
+
+
+def test_reopen_appends_and_keeps_index(tmp_path):
+    """A second writer continues the file and its sparse index."""
+    path = tmp_path / "history.chist"
+    with BinaryHistoryWriter(path, index_interval=8) as writer:
+        writer.extend(_records(10))
+    with BinaryHistoryWriter(path) as writer:
+        writer.append(OperationRecord.create(Decimal(6), Decimal(3), div_numbers, Decimal(2)))
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 11
+        assert reader[10].formatted == "6 ÷ 3 = 2"
+        assert reader[9].x == Decimal(9)
+
+
+def test_uncommitted_tail_is_ignored(tmp_path):
+    """Bytes past the committed end (a torn append) are invisible and dropped."""
+    path = tmp_path / "history.chist"
+    with BinaryHistoryWriter(path) as writer:
+        writer.extend(_records(3))
+    with open(path, "ab") as data:
+        data.write(b"\x05garbage")
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 3
+    with BinaryHistoryWriter(path) as writer:
+        writer.append(_records(1)[0])
+    with BinaryHistoryReader(path) as reader:
+        assert len(reader) == 4
+        assert reader[3].x == Decimal(0)
+
+
+def test_missing_index_falls_back_to_scan(tmp_path):
+    """Readers work without the sidecar index."""
+    path = tmp_path / "history.chist"
+    with BinaryHistoryWriter(path, index_interval=4) as writer:
+        writer.extend(_records(20))
+    index_path(path).unlink()
+    with BinaryHistoryReader(path) as reader:
+        assert reader[17].x == Decimal(17)
+
+
+def test_rejects_foreign_files(tmp_path):
+    """Files without the magic header are rejected."""
+    path = tmp_path / "other.chist"
+    path.write_bytes(b"x" * HEADER.size)
+    with pytest.raises(BinaryHistoryError):
+        BinaryHistoryReader(path)
+
+
+def test_csv_binary_conversion_round_trip(tmp_path):
+    """CSV converts to binary and back, skipping invalid rows."""
+    source = tmp_path / "history.csv"
+    with open(source, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerow(["2", "3", "+", "5"])
+        writer.writerow(["1.50", "2", "×", "3.00"])
+        writer.writerow(["x", "2", "+", "3"])
+        writer.writerow(["1", "2", "?", "3"])
+    binary = tmp_path / "history.chist"
+    assert HistoryFacade.csv_to_binary(source, binary) == (2, 2)
+    target = tmp_path / "back.csv"
+    assert HistoryFacade.binary_to_csv(binary, target) == 2
+    with open(target, newline="", encoding="utf-8") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows == [CSV_COLUMNS, ["2", "3", "+", "5"], ["1.50", "2", "×", "3.00"]]
+
+
+def test_save_and_load_binary_history(tmp_path, monkeypatch):
+    """History saved in binary form loads back into OperationHistory."""
+    monkeypatch.setattr(HistoryFacade, "_get_history_dir", lambda: tmp_path)
+    OperationHistory.clear_records()
+    OperationHistory.add_record(
+        OperationRecord.create(Decimal(4), Decimal(5), mul_numbers, Decimal(20)))
+    message = HistoryFacade.save_to_binary()
+    assert "(1 rows)" in message
+    filename = next(tmp_path.glob("*.chist")).name
+    OperationHistory.clear_records()
+    assert HistoryFacade.load_from_binary(filename) == f"Loaded 1 entries from '{filename}'"
+    assert OperationHistory.get_last_record().formatted == "4 × 5 = 20"
+    OperationHistory.clear_records()
+
+
+def test_binary_load_is_atomic_and_conversion_replaces_target(tmp_path, monkeypatch):
+    """A corrupt file keeps the history; the message counts records kept; targets are replaced."""
+    monkeypatch.setattr(HistoryFacade, "_get_history_dir", lambda: tmp_path)
+    OperationHistory.configure(max_size=3)
+    OperationHistory.add_records(_records(1))
+    with BinaryHistoryWriter(tmp_path / "five.chist") as writer:
+        writer.extend(_records(5))
+    (tmp_path / "bad.chist").write_bytes(b"not a history file" * 4)
+    assert HistoryFacade.load_from_binary("bad.chist").startswith("Loading failed")
+    assert len(OperationHistory.get_all_records()) == 1
+    assert HistoryFacade.load_from_binary("five.chist") == "Loaded 3 entries from 'five.chist'"
+    OperationHistory.configure()
+    OperationHistory.clear_records()
+
+    source = tmp_path / "history.csv"
+    source.write_text("operand1,operand2,operation,result\n2,3,+,5\n", encoding="utf-8")
+    assert HistoryFacade.csv_to_binary(source, tmp_path / "five.chist") == (1, 0)
+    with BinaryHistoryReader(tmp_path / "five.chist") as reader:
+        assert [row.formatted for row in reader] == ["2 + 3 = 5"]
+    assert not list(tmp_path.glob("*.tmp*"))
@@ -0,0 +1,76 @@
+"""Tests for the opcode registry and the columnar history backend."""
+from decimal import Decimal
+import numpy as np
+import pytest
+from calculator import opcodes
+from calculator.calculation import OperationRecord
+from calculator.history.columnar import ColumnarHistoryStore, decode_decimal, encode_decimal
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers, div_numbers, mul_numbers, power_numbers
+
+
+def test_opcode_registry_round_trip():
+    """Built-in operations have stable opcodes and symbols."""
+    opcode = opcodes.opcode_for(mul_numbers)
+    assert opcodes.operation_for(opcode) is mul_numbers
+    assert opcodes.symbol_for(opcode) == "×"
+    assert opcodes.opcode_for_symbol("^") == opcodes.opcode_for(power_numbers)
+    with pytest.raises(KeyError):
+        opcodes.operation_for(opcodes.EMPTY_OPCODE)
+
+
+@pytest.mark.parametrize("value", ["0", "1.50", "-7", "1E+30", "0.000001",
+                                   "12345678901234567890123", "-0", "NaN"])
+def test_decimal_columns_are_exact(value):
+    """Values survive the columnar encoding unchanged, spilled or not."""
+    store = ColumnarHistoryStore()
+    store.append(OperationRecord.create(Decimal(value), Decimal("1"), mul_numbers,
+                                        Decimal(value)))
+    row = store.last()
+    assert str(row.x) == str(Decimal(value))
+    assert str(row.result) == str(Decimal(value))
+
+
+def test_encode_decimal_limits():
+    """Only values with an int64 coefficient are encoded inline."""
+    assert encode_decimal(Decimal("-1.25")) == (-125, -2)
+    assert decode_decimal(-125, -2) == Decimal("-1.25")
+    assert encode_decimal(Decimal("1" * 19)) is None
+
+
+def test_columnar_rows_format_like_records():
+    """Row views expose the same fields as OperationRecord."""
+    store = ColumnarHistoryStore(max_size=2)
+    for x in ("10", "20", "30"):
+        store.append(OperationRecord.create(Decimal(x), Decimal("5"), div_numbers))
+    assert [row.formatted for row in store] == ["20 ÷ 5 = 4", "30 ÷ 5 = 6"]
+    assert store.last().operation is div_numbers
+    assert store.evictions["capacity"] == 1
+
+
+def test_numpy_views_are_zero_copy():
+    """NumPy column arrays share memory with the store."""
+    store = ColumnarHistoryStore()
+    for x in range(100):
+        store.append(OperationRecord.create(Decimal(x), Decimal("0.5"), add_numbers))
+    columns = store.numpy_columns()
+    assert columns["opcode"].dtype == np.uint8
+    assert np.shares_memory(columns["x_coefficient"], store.numpy_columns()["x_coefficient"])
+    assert store.to_float64("result")[:3].tolist() == [0.5, 1.5, 2.5]
+    assert len(store.live_indexes()) == 100
+
+
+def test_operation_history_columnar_backend():
+    """OperationHistory can switch to the columnar backend and keep records."""
+    OperationHistory.clear_records()
+    try:
+        OperationHistory.add_record(OperationRecord.create(Decimal("2"), Decimal("3"), add_numbers))
+        OperationHistory.configure(backend="columnar")
+        OperationHistory.add_record(OperationRecord.create(Decimal("4"), Decimal("2"), power_numbers))
+        assert [r.formatted for r in OperationHistory.get_all_records()] == ["2 + 3 = 5",
+                                                                              "4 ^ 2 = 16"]
+        with pytest.raises(ValueError):
+            OperationHistory.configure(backend="sqlite")
+    finally:
+        OperationHistory.configure()
+        OperationHistory.clear_records()
@@ -1,11 +1,15 @@
 """Tests For Basic Commands"""
+from decimal import Decimal
 import pytest
 from app import App
+from app.app_class import App as ClassicApp
+from app.plugins.root import Root
 from app.plugins.add import AddCommand
 from app.plugins.subtract import SubtractCommand
 from app.plugins.multiply import MultiplyCommand
 from app.plugins.divide import DivideCommand
-from app.commands import Command
+from app.commands import Command, CommandHandler
+from calculator.history.history import OperationHistory
 
 def test_app_start_unknown_command(capfd, monkeypatch):
     """Test how the REPL handles an unknown command before exiting."""
@@ -182,3 +186,49 @@ def test_app_menu_command(capfd, monkeypatch):
     assert "Available commands:" in captured.out, "Menu command output incorrect"
     # Verify exit message
     assert str(e.value) == "Exiting...", "The app did not exit with the expected message"
+
+def test_function_commands_check_arity_before_parsing():
+    """Table entries reject a wrong argument count without converting any argument."""
+    handler = CommandHandler()
+    parsed = []
+    handler.register_function("double", lambda x: x * 2, 1,
+                              parser=lambda arg: parsed.append(arg) or Decimal(arg))
+    assert handler.execute_command("double", "21") == 42
+    with pytest.raises(TypeError, match="expected 1 arguments, got 2"):
+        handler.execute_command("double", "1", "2")
+    assert parsed == ["21"]
+
+def test_app_class_dispatch_table(monkeypatch, capfd):
+    """app_class.App dispatches through one table and reuses plugin instances."""
+    inputs = iter(['add 2 3', 'root 27 3', 'powmod 7 10000000 13', 'root 1',
+                   'unknown 1 2', 'divide 1 0', 'undo', 'history', 'redo', 'clear',
+                   'undo', 'exit'])
+    monkeypatch.setattr('builtins.input', lambda _: next(inputs))
+    created = []
+
+    class CountingRoot(Root):
+        """Root plugin that counts its instances."""
+        def __init__(self):
+            created.append(self)
+
+    monkeypatch.setattr('app.app_class.Root', CountingRoot)
+    app = ClassicApp()
+    out = capfd.readouterr().out
+    assert "5\n3\n9\nUnknown command or wrong number of arguments.\n" in out
+    assert out.count("Unknown command or wrong number of arguments.") == 2
+    powmod = "7 ^ 10000000 mod 13 = 9"
+    assert (f"Error: Cannot divide by zero\nUndid: {powmod}\n2 + 3 = 5\n"
+            f"27 √ 3 = 3\nRedid: {powmod}\nHistory cleared.\nNothing to undo.\n"
+            "Exiting Calculator. Bye!") in out
+    assert len(created) == 2  # the demo and the dispatch table
+    assert app.command_handler.commands["root"].arity == 2
+
+def test_app_class_configures_history(monkeypatch):
+    """app_class.App sizes the history from the configuration like app.App."""
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    monkeypatch.setattr('app.calculator_config.Config.MAX_HISTORY_SIZE', 7)
+    try:
+        ClassicApp()
+        assert OperationHistory._options["max_size"] == 7
+    finally:
+        OperationHistory.configure()
@@ -0,0 +1,132 @@
+"""Stress tests for concurrent use of CalcEngine and OperationHistory."""
+import threading
+from decimal import Decimal, getcontext, localcontext
+import pytest
+from calculator import CalcEngine
+from calculator.decimal_context import run_with_private_context
+from calculator.history.columnar import ColumnarHistoryStore
+from calculator.history.history import OperationHistory
+from calculator.history.store import HistoryStore
+from calculator.calculation import OperationRecord
+from calculator.operations import add_numbers
+
+THREADS = 16
+
+
+@pytest.fixture(autouse=True)
+def unbounded_history():
+    """Use an empty, unbounded history."""
+    OperationHistory.configure()
+    OperationHistory.clear_records()
+
+
+def _run_threads(target, count=THREADS):
+    """Start count threads on target(index), join them and re-raise failures."""
+    errors = []
+    barrier = threading.Barrier(count)
+
+    def runner(index):
+        try:
+            barrier.wait()
+            target(index)
+        except Exception as error:  # pylint: disable=broad-except
+            errors.append(error)
+
+    threads = [threading.Thread(target=runner, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_sessions_and_decimal_contexts_are_per_thread():
+    """Each thread records into its own session with its own precision."""
+    seen = {}
+
+    def work(index):
+        with OperationHistory.session(), localcontext() as context:
+            context.prec = 5 + index
+            for i in range(300):
+                CalcEngine.sum_values(Decimal(index), Decimal(i))
+                CalcEngine.quotient(Decimal(1), Decimal(3))
+            records = OperationHistory.get_all_records()
+            seen[index] = ({r.x for r in records}, len(records),
+                           len(records[-1].result.as_tuple().digits))
+
+    _run_threads(work)
+    for index, (xs, count, digits) in seen.items():
+        assert xs == {Decimal(index), Decimal(1)}
+        assert count == 600
+        assert digits == 5 + index
+    assert OperationHistory.get_all_records() == []
+
+
+@pytest.mark.parametrize("store_class", [HistoryStore, ColumnarHistoryStore])
+def test_shared_store_with_concurrent_writers_and_snapshot_readers(store_class):
+    """Writers and readers share one bounded store without losing order."""
+    store = store_class(max_size=500)
+    writers, per_writer = 8, 1000
+    done = threading.Event()
+
+    def write(index):
+        for i in range(per_writer):
+            store.append(OperationRecord.create(Decimal(index), Decimal(i), add_numbers))
+
+    def read(_):
+        while not done.is_set():
+            last = {}
+            for record in store:
+                assert record.y > last.get(record.x, -1)
+                last[record.x] = record.y
+
+    readers = [threading.Thread(target=read, args=(i,)) for i in range(2)]
+    for reader in readers:
+        reader.start()
+    try:
+        _run_threads(write, writers)
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    assert len(store) == 500
+    assert store.evictions["capacity"] == writers * per_writer - 500
+    assert len(list(store)) == 500
+
+
+def test_shared_default_history_under_contention():
+    """Threads without sessions share the default history safely."""
+
+    def work(index):
+        for i in range(200):
+            CalcEngine.product(Decimal(index), Decimal(i))
+            OperationHistory.get_last_record()
+
+    _run_threads(work)
+    assert len(OperationHistory.get_all_records()) == THREADS * 200
+    OperationHistory.clear_records()
+
+
+def test_snapshot_iteration_stops_after_clear():
+    """Iteration does not mix records from before and after clear()."""
+    store = HistoryStore()
+    for i in range(600):
+        store.append(OperationRecord.create(Decimal(i), Decimal(1), add_numbers))
+    iterator = iter(store)
+    assert next(iterator).x == 0
+    store.clear()
+    store.append(OperationRecord.create(Decimal(-1), Decimal(1), add_numbers))
+    assert all(record.x >= 0 for record in iterator)
+
+
+def test_private_context_isolates_changes():
+    """run_with_private_context keeps precision changes away from the caller."""
+    def change_precision():
+        getcontext().prec = 3
+        return getcontext().prec
+
+    with localcontext() as context:
+        context.prec = 28
+        assert run_with_private_context(change_precision) == 3
+        assert context.prec == 28
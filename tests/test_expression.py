@@ -0,0 +1,69 @@
+"""Tests for the infix expression compiler and the calc command."""
+from decimal import Decimal
+import pytest
+from app.plugins.calc import CalcCommand
+from calculator import CalcEngine
+from calculator.expression import (ExpressionError, compile_template, parse_literal,
+                                   split_expression)
+from calculator.history.history import OperationHistory
+
+
+@pytest.fixture(autouse=True)
+def clear_history_before_tests():
+    """Start every test with an empty history and cold caches."""
+    OperationHistory.clear_records()
+    compile_template.cache_clear()
+    parse_literal.cache_clear()
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2 + 3 * (4 - 1)", Decimal(11)),
+    ("2 ^ 3 ^ 2", Decimal(512)),
+    ("2 ** 3", Decimal(8)),
+    ("-2 ^ 2", Decimal(-4)),
+    ("10 - -3", Decimal(13)),
+    ("7 % 4 + 1.5", Decimal("4.5")),
+    ("(1 + 2) / 4", Decimal("0.75")),
+    ("8 - 3 - 2", Decimal(3)),
+])
+def test_evaluate_expression(expression, expected):
+    """Precedence, associativity and unary minus follow the usual rules."""
+    assert CalcEngine.evaluate_expression(expression) == expected
+
+
+def test_sub_operations_are_recorded_in_history():
+    """Each binary operation is recorded through CalcEngine."""
+    CalcEngine.evaluate_expression("2 + 3 * (4 - 1)")
+    assert [r.formatted for r in OperationHistory.get_all_records()] == [
+        "4 - 1 = 3", "3 × 3 = 9", "2 + 9 = 11"]
+
+
+def test_templated_expressions_share_compiled_form():
+    """Expressions that only differ in their numbers are compiled once."""
+    assert split_expression("2 + 3*(4-1)") == ("#+#*(#-#)", ("2", "3", "4", "1"))
+    CalcEngine.evaluate_expression("2 + 3 * (4 - 1)")
+    CalcEngine.evaluate_expression("5 + 6 * (7 - 2)")
+    CalcEngine.evaluate_expression("2+3*(4-1)")
+    info = compile_template.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+    assert parse_literal.cache_info().hits == 5
+
+
+@pytest.mark.parametrize("expression", ["", "2 +", "(2 + 3", "2 + 3)", "2 3", "2 & 3", "* 2"])
+def test_invalid_expressions(expression):
+    """Malformed expressions raise ExpressionError."""
+    with pytest.raises(ExpressionError):
+        CalcEngine.evaluate_expression(expression)
+
+
+def test_calc_command(capsys):
+    """The calc command joins its arguments and reports errors."""
+    command = CalcCommand()
+    command.execute("2", "+", "3", "*", "(4", "-", "1)")
+    command.execute("1", "/", "0")
+    command.execute("2", "+")
+    assert capsys.readouterr().out.splitlines() == [
+        "The result of 2 + 3 * (4 - 1) is 11",
+        "An error occurred: Cannot divide by zero",
+        "Invalid expression: Expression is incomplete",
+    ]
@@ -1,6 +1,6 @@
 """History Testing File"""
 from decimal import Decimal
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import pytest
 import pandas as pd
 from app.plugins.history_facade import HistoryFacade
@@ -91,14 +91,12 @@ def test_load_from_csv(mock_get_dir, mock_read_csv, tmp_path):
     csv_file = tmp_path / "test.csv"
     csv_file.touch()
 
-    mock_df = MagicMock()
-    mock_df.iterrows.return_value = iter([
-        (0, {'operand1': '8', 'operand2': '2', 'operation': '+', 'result': '10'}),
-        (1, {'operand1': '9', 'operand2': '3', 'operation': '-', 'result': '6'}),
-        (2, {'operand1': '4', 'operand2': '5', 'operation': '×', 'result': '20'}),
-        (3, {'operand1': '100', 'operand2': '25', 'operation': '÷', 'result': '4'})
-    ])
-    mock_read_csv.return_value = mock_df
+    mock_read_csv.return_value = iter([pd.DataFrame([
+        {'operand1': '8', 'operand2': '2', 'operation': '+', 'result': '10'},
+        {'operand1': '9', 'operand2': '3', 'operation': '-', 'result': '6'},
+        {'operand1': '4', 'operand2': '5', 'operation': '×', 'result': '20'},
+        {'operand1': '100', 'operand2': '25', 'operation': '÷', 'result': '4'}
+    ])])
     result = HistoryFacade.load_from_csv("test.csv")
 
     expected_output_lines = [
@@ -131,3 +129,84 @@ def test_load_from_empty_csv(mock_get_dir, _mock_read_csv, tmp_path):
     result = HistoryFacade.load_from_csv("empty.csv")
 
     assert result == "Error: CSV file is empty"
+
+def test_record_computes_result_once():
+    """Records compute their result on creation and formatting reuses it."""
+    calls = []
+
+    def add_numbers(x, y):  # pylint: disable=redefined-outer-name
+        calls.append((x, y))
+        return x + y
+
+    record = OperationRecord.create(Decimal('2'), Decimal('3'), add_numbers)
+    OperationHistory.add_record(record)
+    assert record.symbol == "+"
+    assert HistoryFacade.get_formatted_history() == ["2 + 3 = 5"]
+    assert HistoryFacade.get_last_formatted() == "2 + 3 = 5"
+    assert record.execute() == Decimal('5')
+    assert len(calls) == 1
+
+def test_record_accepts_precomputed_result():
+    """A precomputed result is stored without calling the operation."""
+    record = OperationRecord.create(Decimal('1'), Decimal('0'), div_numbers, Decimal('7'))
+    assert record.formatted == "1 ÷ 0 = 7"
+
+@patch('app.plugins.history_facade.HistoryFacade._new_csv_path')
+def test_stream_to_csv_matches_pandas(mock_path, sample_operations, tmp_path):  # pylint: disable=redefined-outer-name
+    """Streaming export writes the same table as the pandas export."""
+    for operation in sample_operations:
+        OperationHistory.add_record(operation)
+    mock_path.return_value = tmp_path / "pandas.csv"
+    HistoryFacade.save_to_csv()
+    mock_path.return_value = tmp_path / "stream.csv"
+    result = HistoryFacade.stream_to_csv(chunk_size=3)
+    assert "4 rows" in result and "rows/sec" in result
+    expected = pd.read_csv(tmp_path / "pandas.csv", dtype=str)
+    streamed = pd.read_csv(tmp_path / "stream.csv", dtype=str)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+def test_stream_to_csv_empty_history():
+    """Streaming export refuses to write an empty history."""
+    assert HistoryFacade.stream_to_csv() == "No history to save"
+
+@patch('app.plugins.history_facade.HistoryFacade._get_history_dir')
+def test_load_from_csv_chunks_and_rejects(mock_get_dir, tmp_path):
+    """Chunked loading keeps valid rows and reports invalid ones."""
+    mock_get_dir.return_value = tmp_path
+    (tmp_path / "mixed.csv").write_text(
+        "operand1,operand2,operation,result\n"
+        "1,2,+,3\n"
+        "abc,2,+,3\n"
+        "2,3,@,6\n"
+        "5,0,÷,0\n"
+        "2,10,^,1024\n",
+        encoding="utf-8")
+    result = HistoryFacade.load_from_csv("mixed.csv", chunksize=2, trust_results=False)
+    assert result.splitlines()[:3] == ["Loaded 2 entries from 'mixed.csv':",
+                                       "1. 1 + 2 = 3",
+                                       "2. 2 ^ 10 = 1024"]
+    assert "Skipped 3 invalid rows:" in result
+    assert [(r['line'], r['reason']) for r in HistoryFacade.last_rejects] == [
+        (3, "invalid operand"), (4, "unknown operation"), (5, "Cannot divide by zero")]
+
+@patch('app.plugins.history_facade.HistoryFacade._get_history_dir')
+def test_load_from_csv_trusts_stored_results(mock_get_dir, tmp_path):
+    """Stored results are used as-is when trusted."""
+    mock_get_dir.return_value = tmp_path
+    (tmp_path / "trusted.csv").write_text(
+        "operand1,operand2,operation,result\n1,3,÷,0.3333\n", encoding="utf-8")
+    HistoryFacade.load_from_csv("trusted.csv")
+    assert HistoryFacade.get_last_formatted() == "1 ÷ 3 = 0.3333"
+
+@patch('app.plugins.history_facade.HistoryFacade._get_history_dir')
+def test_failed_csv_load_keeps_history(mock_get_dir, tmp_path):
+    """A missing column or a broken later chunk leaves the current history untouched."""
+    mock_get_dir.return_value = tmp_path
+    OperationHistory.add_record(OperationRecord.create(Decimal('2'), Decimal('3'), add_numbers))
+    (tmp_path / "columns.csv").write_text("operand1,operation\n1,+\n", encoding="utf-8")
+    (tmp_path / "broken.csv").write_text(
+        "operand1,operand2,operation,result\n1,2,+,3\n4,5,+,9\n6,7,+,\"13\n",
+        encoding="utf-8")
+    assert HistoryFacade.load_from_csv("columns.csv") == "Error: Missing column operand2, result"
+    assert HistoryFacade.load_from_csv("broken.csv", chunksize=1) == "Error: Invalid CSV format"
+    assert HistoryFacade.get_formatted_history() == ["2 + 3 = 5"]
@@ -0,0 +1,87 @@
+"""Tests for the catalog of saved history files."""
+import json
+import os
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from app.plugins import history_catalog
+from app.plugins.history_catalog import CATALOG_NAME, HistoryCatalog
+from app.plugins.history_facade import HistoryFacade
+from calculator.calculation import OperationRecord
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers, mul_numbers
+
+
+@pytest.fixture
+def history_dir(tmp_path):
+    """Point the facade at an empty history directory with a fresh catalog."""
+    OperationHistory.clear_records()
+    HistoryCatalog._instances.clear()  # pylint: disable=protected-access
+    with patch.object(HistoryFacade, '_get_history_dir', return_value=tmp_path):
+        yield tmp_path
+    OperationHistory.clear_records()
+
+
+def _add(x, y, op):
+    OperationHistory.add_record(OperationRecord.create(Decimal(x), Decimal(y), op))
+
+
+def test_saves_are_catalogued_without_rescanning(history_dir):
+    """Saving records rows, size, mix and checksum; listing does not parse files."""
+    _add(1, 2, add_numbers)
+    _add(3, 4, add_numbers)
+    _add(5, 6, mul_numbers)
+    HistoryFacade.stream_to_csv()
+    with patch.object(history_catalog, 'scan_history_file') as scan:
+        [entry] = HistoryFacade.list_history_files()
+    scan.assert_not_called()
+    path = history_dir / entry.name
+    assert entry.rows == 3
+    assert entry.operations == {'+': 2, '×': 1}
+    assert entry.size_bytes == path.stat().st_size
+    assert entry.checksum == history_catalog.file_checksum(path)
+    stored = json.loads((history_dir / CATALOG_NAME).read_text(encoding='utf-8'))
+    assert stored['files'][entry.name]['rows'] == 3
+
+
+def test_binary_saves_are_catalogued(history_dir):
+    """Binary history files get catalogue entries too."""
+    _add(2, 5, mul_numbers)
+    HistoryFacade.save_to_binary()
+    [entry] = HistoryFacade.list_history_files()
+    assert entry.suffix == '.chist'
+    assert (entry.rows, entry.operations) == (1, {'×': 1})
+    assert entry.describe().startswith(f"{entry.name} (1 rows, ")
+
+
+def test_changed_and_new_files_are_rescanned(history_dir):
+    """Entries are checked against mtime and size; foreign and deleted files are handled."""
+    _add(1, 2, add_numbers)
+    HistoryFacade.stream_to_csv()
+    [saved] = HistoryFacade.list_history_files()
+    (history_dir / "copied.csv").write_text(
+        "operand1,operand2,operation,result\n1,2,+,3\n2,2,×,4\n2,3,×,6\n", encoding="utf-8")
+    entries = {entry.name: entry for entry in HistoryFacade.list_history_files()}
+    assert entries["copied.csv"].operations == {'+': 1, '×': 2}
+    path = history_dir / saved.name
+    with open(path, 'a', encoding='utf-8') as csv_file:
+        csv_file.write("4,4,+,8\n")
+    os.utime(path, ns=(saved.mtime_ns + 10**9, saved.mtime_ns + 10**9))
+    refreshed = HistoryCatalog.for_directory(history_dir).get(saved.name)
+    assert refreshed.rows == 2
+    assert refreshed.created == saved.created
+    (history_dir / "copied.csv").unlink()
+    assert [entry.name for entry in HistoryFacade.list_history_files()] == [saved.name]
+
+
+def test_catalog_survives_restart_and_corruption(history_dir):
+    """A new catalog instance reuses the file; a corrupt catalog is rebuilt."""
+    _add(1, 2, add_numbers)
+    HistoryFacade.stream_to_csv()
+    with patch.object(history_catalog, 'scan_history_file') as scan:
+        assert len(HistoryCatalog(history_dir).entries()) == 1
+    scan.assert_not_called()
+    (history_dir / CATALOG_NAME).write_text("{not json", encoding="utf-8")
+    [entry] = HistoryCatalog(history_dir).entries()
+    assert entry.rows == 1
+    assert HistoryCatalog(history_dir).verify(entry.name)
@@ -0,0 +1,211 @@
+"""Tests for the bounded history store and its retention policies."""
+from decimal import Decimal
+import pytest
+from calculator.calculation import OperationRecord
+from calculator.history.history import BACKENDS, OperationHistory
+from calculator.history.retention import PerOperationCapPolicy, TtlPolicy, build_policies
+from calculator.history.store import HistoryStore
+from calculator.operations import add_numbers, div_numbers, mul_numbers, sub_numbers
+
+
+def make_record(x, op=add_numbers):
+    """Build a record with a second operand of 1."""
+    return OperationRecord.create(Decimal(x), Decimal(1), op)
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """Manually advanced clock for TTL tests."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fifo_store_keeps_newest_records():
+    """A full store overwrites its oldest record and counts the eviction."""
+    store = HistoryStore(max_size=3)
+    for x in range(5):
+        store.append(make_record(x))
+    assert [r.x for r in store] == [2, 3, 4]
+    assert store.last().x == 4
+    assert store.stats()["evictions"]["capacity"] == 2
+
+
+def test_unbounded_store_grows():
+    """Without a bound the store keeps every record in order."""
+    store = HistoryStore()
+    for x in range(200):
+        store.append(make_record(x))
+    assert len(store) == 200
+    assert [r.x for r in store][:3] == [0, 1, 2]
+
+
+def test_ttl_policy_expires_old_records():
+    """Records older than the TTL disappear on the next read."""
+    clock = FakeClock()
+    store = HistoryStore(max_size=10, policies=[TtlPolicy(5, clock=clock)])
+    store.append(make_record(1))
+    clock.now = 3
+    store.append(make_record(2))
+    clock.now = 6
+    assert [r.x for r in store] == [2]
+    assert store.evictions["ttl"] == 1
+
+
+def test_per_operation_cap_policy():
+    """Each operation keeps only its newest records."""
+    store = HistoryStore(max_size=10, policies=[PerOperationCapPolicy(2)])
+    for x in range(3):
+        store.append(make_record(x))
+    store.append(make_record(9, mul_numbers))
+    assert [r.x for r in store] == [1, 2, 9]
+    assert store.evictions["per_operation"] == 1
+
+
+def test_build_policies_rejects_unknown_names():
+    """Unknown policy names raise ValueError."""
+    assert build_policies(["fifo"]) == []
+    with pytest.raises(ValueError):
+        build_policies(["lru"])
+
+
+def test_configure_bounds_operation_history():
+    """Configuring OperationHistory keeps the newest records within the bound."""
+    OperationHistory.clear_records()
+    try:
+        OperationHistory.add_records(make_record(x) for x in range(4))
+        OperationHistory.configure(max_size=2)
+        OperationHistory.add_record(make_record(7))
+        assert [r.x for r in OperationHistory.get_all_records()] == [3, 7]
+        assert OperationHistory.eviction_stats()["evictions"]["capacity"] == 3
+    finally:
+        OperationHistory.configure()
+        OperationHistory.clear_records()
+
+
+@pytest.mark.parametrize("backend", ["object", "columnar"])
+def test_undo_redo_share_the_ring(backend):
+    """Undo moves the tail back, redo restores the same slots, append drops redo."""
+    store = BACKENDS[backend](max_size=4)
+    for x in range(6):
+        store.append(make_record(x))
+    assert [r.x for r in store.undo(2)] == [5, 4]
+    assert [r.x for r in store] == [2, 3]
+    assert store.redo_depth() == 2
+    assert [r.x for r in store.redo()] == [4]
+    assert [r.x for r in store] == [2, 3, 4]
+    store.append(make_record(9))
+    assert store.redo() == []
+    assert [r.x for r in store] == [2, 3, 4, 9]
+    assert len(store) == 4
+
+
+def test_undo_depth_is_bounded():
+    """At most undo_depth consecutive undos are possible; redo gives them back."""
+    store = HistoryStore(undo_depth=2)
+    for x in range(5):
+        store.append(make_record(x))
+    assert [r.x for r in store.undo(5)] == [4, 3]
+    assert store.undo() == []
+    store.redo()
+    assert [r.x for r in store.undo()] == [3]
+    assert HistoryStore(undo_depth=0).undo() == []
+
+
+def test_undo_keeps_policies_consistent():
+    """Undone records leave TTL and per-operation tracking through the newest end."""
+    clock = FakeClock()
+    store = HistoryStore(policies=[TtlPolicy(10, clock), PerOperationCapPolicy(2)])
+    store.append(make_record(1))
+    clock.now = 5
+    store.append(make_record(2))
+    store.undo()
+    clock.now = 12
+    assert [r.x for r in store] == []
+    store.redo()
+    assert [r.x for r in store] == [2]
+    store.append(make_record(3))
+    store.append(make_record(4))
+    assert [r.x for r in store] == [3, 4]
+
+
+def test_undo_skips_evicted_slots():
+    """Slots emptied by a policy are skipped by undo and redo."""
+    store = HistoryStore(policies=[PerOperationCapPolicy(1)])
+    store.append(make_record(1, mul_numbers))
+    store.append(make_record(2))
+    store.append(make_record(3))
+    assert [r.x for r in store] == [1, 3]
+    assert [r.x for r in store.undo(2)] == [3, 1]
+    assert [r.x for r in store.redo(2)] == [1, 3]
+    assert [r.x for r in store] == [1, 3]
+
+
+@pytest.mark.parametrize("backend", ["object", "columnar"])
+def test_policy_holes_do_not_evict_live_records(backend):
+    """Slots emptied by a policy never count against the size bound."""
+    store = BACKENDS[backend](max_size=3, policies=[PerOperationCapPolicy(1)])
+    store.append(make_record(0, mul_numbers))
+    for x in range(1, 3):
+        store.append(make_record(x))
+    store.append(OperationRecord.create(Decimal(3), Decimal(1), sub_numbers))
+    assert [r.formatted for r in store] == ['0 × 1 = 0', '2 + 1 = 3', '3 - 1 = 2']
+    assert store.evictions["capacity"] == 0
+    for x in range(4, 40):
+        store.append(make_record(x))
+    assert [r.formatted for r in store] == ['0 × 1 = 0', '3 - 1 = 2', '39 + 1 = 40']
+    store.append(make_record(5, mul_numbers))
+    store.append(make_record(6, div_numbers))
+    assert [r.formatted for r in store] == ['39 + 1 = 40', '5 × 1 = 5', '6 ÷ 1 = 6']
+    assert store.evictions["capacity"] == 1
+
+
+@pytest.mark.parametrize("backend", ["object", "columnar"])
+def test_unbounded_store_reuses_policy_holes(backend):
+    """An unbounded store compacts holes instead of growing past its live records."""
+    store = BACKENDS[backend](policies=[PerOperationCapPolicy(5)])
+    for x in range(20000):
+        store.append(make_record(x, mul_numbers if x % 1000 == 0 else add_numbers))
+    assert len(store) == 10
+    assert store._capacity <= 128  # pylint: disable=protected-access
+    assert [r.x for r in store][-5:] == [19995, 19996, 19997, 19998, 19999]
+
+
+def test_iteration_follows_compaction():
+    """An iterator started before a compaction yields each remaining record once."""
+    store = HistoryStore(max_size=300, policies=[PerOperationCapPolicy(1)])
+    store.append(make_record(-1, mul_numbers))
+    for x in range(299):
+        store.append(make_record(x, sub_numbers))
+    iterator = iter(store)
+    first = next(iterator)
+    for x in range(300, 310):
+        store.append(make_record(x))
+    assert first.x == -1
+    assert [r.x for r in iterator] == [298]
+
+
+def test_ttl_survives_middle_evictions():
+    """A per-operation eviction in the middle does not stop older records from expiring."""
+    clock = FakeClock()
+    store = HistoryStore(max_size=10, policies=[TtlPolicy(5, clock), PerOperationCapPolicy(1)])
+    store.append(make_record(0, mul_numbers))
+    store.append(make_record(1))
+    store.append(make_record(2))
+    clock.now = 100
+    assert [r.formatted for r in store] == []
+    assert store.evictions["ttl"] == 2
+
+
+def test_redo_keeps_the_original_ttl_stamp():
+    """A redone record is as old as when it was first appended, not when it was redone."""
+    clock = FakeClock()
+    store = HistoryStore(policies=[TtlPolicy(10, clock)])
+    store.append(make_record(1))
+    clock.now = 5
+    store.append(make_record(2))
+    store.undo(2)
+    clock.now = 12
+    assert [r.x for r in store.redo(2)] == [1, 2]
+    assert [r.x for r in store] == [2]
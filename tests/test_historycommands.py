@@ -4,16 +4,24 @@
 from decimal import Decimal
 
 # Local application imports
+from app.plugins.history_catalog import CatalogEntry
 from app.plugins.history_clear import HistoryClearCommand
 from app.plugins.history_facade import HistoryFacade
 from app.plugins.history_load import HistoryLoadCommand
 from app.plugins.history_show import HistoryShowCommand
 from app.plugins.last_operation import LastOpCommand
+from app.plugins.redo import RedoCommand
+from app.plugins.undo import UndoCommand
 from calculator.calculation import OperationRecord
 from calculator.history.history import OperationHistory
 from calculator.operations import add_numbers
 
 
+def _entry(name):
+    """Catalog entry for a small mock history file."""
+    return CatalogEntry(name=name, rows=2, size_bytes=40, mtime_ns=0, created=0.0,
+                        checksum="", operations={"+": 2})
+
 def test_history_clear_command():
     """Test that the history clear command properly clears all records."""
     # Add a dummy operation to history
@@ -80,8 +88,8 @@ def test_history_last_command_with_history(capsys):
 
 def test_history_load_command_no_files(capsys, monkeypatch):
     """Test HistoryLoadCommand when no history files exist."""
-    # Mock HistoryFacade.list_csv_files to return empty list
-    monkeypatch.setattr(HistoryFacade, 'list_csv_files', lambda: [])
+    # Mock HistoryFacade.list_history_files to return empty list
+    monkeypatch.setattr(HistoryFacade, 'list_history_files', lambda: [])
     # Execute the HistoryLoadCommand
     command = HistoryLoadCommand()
     command.execute()
@@ -93,13 +101,9 @@ def test_history_load_command_no_files(capsys, monkeypatch):
 def test_history_load_command_with_files(capsys, monkeypatch):
     """Test HistoryLoadCommand with available history files."""
     # Mock file objects
-    class MockFile:# pylint: disable=too-few-public-methods
-        """Simple mock file object for testing."""
-        def __init__(self, name):
-            self.name = name
-    mock_files = [MockFile("history1.csv"), MockFile("history2.csv")]
+    mock_files = [_entry("history1.csv"), _entry("history2.csv")]
     # Mock HistoryFacade methods
-    monkeypatch.setattr(HistoryFacade, 'list_csv_files', lambda: mock_files)
+    monkeypatch.setattr(HistoryFacade, 'list_history_files', lambda: mock_files)
     monkeypatch.setattr(
         HistoryFacade,
         'load_from_csv', 
@@ -114,21 +118,17 @@ def test_history_load_command_with_files(capsys, monkeypatch):
     # Capture and verify output
     captured = capsys.readouterr()
     assert "Available history files:" in captured.out
-    assert "1. history1.csv" in captured.out
-    assert "2. history2.csv" in captured.out
+    assert "1. history1.csv (2 rows, 40 B, +:2)" in captured.out
+    assert "2. history2.csv (2 rows, 40 B, +:2)" in captured.out
     assert "Successfully loaded history1.csv" in captured.out
 
 
 def test_history_load_command_with_invalid_selection(capsys, monkeypatch):
     """Test HistoryLoadCommand with invalid user input selections."""
     # Mock file objects with two files
-    class MockFile:# pylint: disable=too-few-public-methods
-        """Simple mock file object for testing."""
-        def __init__(self, name):
-            self.name = name
-    mock_files = [MockFile("history1.csv"), MockFile("history2.csv")]
+    mock_files = [_entry("history1.csv"), _entry("history2.csv")]
     # Mock HistoryFacade methods
-    monkeypatch.setattr(HistoryFacade, 'list_csv_files', lambda: mock_files)
+    monkeypatch.setattr(HistoryFacade, 'list_history_files', lambda: mock_files)
     monkeypatch.setattr(
         HistoryFacade,
         'load_from_csv',
@@ -145,3 +145,23 @@ def test_history_load_command_with_invalid_selection(capsys, monkeypatch):
     assert "Invalid selection. Please enter a valid number." in captured.out
     assert "Please enter a numeric value." in captured.out
     assert "Successfully loaded history2.csv" in captured.out
+
+
+def test_undo_and_redo_commands(capsys):
+    """undo N and redo N move operations out of and back into the history."""
+    OperationHistory.clear_records()
+    for x in range(3):
+        OperationHistory.add_record(OperationRecord.create(Decimal(x), Decimal('1'), add_numbers))
+    UndoCommand().execute("2")
+    assert capsys.readouterr().out.splitlines() == ["Undone: 2 + 1 = 3", "Undone: 1 + 1 = 2"]
+    assert HistoryFacade.get_formatted_history() == ["0 + 1 = 1"]
+    RedoCommand().execute()
+    assert capsys.readouterr().out.strip() == "Redone: 1 + 1 = 2"
+    RedoCommand().execute("5")
+    RedoCommand().execute()
+    assert capsys.readouterr().out.splitlines() == ["Redone: 2 + 1 = 3", "Nothing to redo"]
+    UndoCommand().execute("x")
+    assert capsys.readouterr().out.strip() == "Invalid count: x"
+    OperationHistory.clear_records()
+    UndoCommand().execute()
+    assert capsys.readouterr().out.strip() == "Nothing to undo"
@@ -0,0 +1,174 @@
+"""Tests for the AUTO_SAVE history journal."""
+import shutil
+from decimal import Decimal
+import pytest
+from app.app_class import App as ClassicApp
+from app.calculator_config import Config
+from app.plugins.history_facade import HistoryFacade
+from calculator import CalcEngine
+from calculator.calculation import OperationRecord
+from calculator.history.history import OperationHistory
+from calculator.history.journal import HistoryJournal
+from calculator.operations import add_numbers
+
+
+@pytest.fixture(autouse=True)
+def clean_history():
+    """Start with an empty default history and no engine journal."""
+    OperationHistory.configure()
+    OperationHistory.clear_records()
+    yield
+    CalcEngine.configure_journal(None)
+    OperationHistory.clear_records()
+
+
+def _record(i):
+    return OperationRecord.create(Decimal(i), Decimal(1), add_numbers)
+
+
+def _xs(rows):
+    return [int(row.x) for row in rows]
+
+
+def test_group_commit_batches_fsyncs(tmp_path):
+    """Many appends share a few commits, and sync() waits for all of them."""
+    with HistoryJournal(tmp_path, fsync_interval=0.05) as journal:
+        for i in range(200):
+            journal.append(_record(i))
+        journal.sync()
+        assert journal.commits < 20
+        assert _xs(journal.replay()) == list(range(200))
+
+
+def test_synchronous_mode_commits_every_append(tmp_path):
+    """With fsync_interval 0 a record is durable when append returns."""
+    with HistoryJournal(tmp_path, fsync_interval=0) as journal:
+        journal.append(_record(1))
+        journal.append(_record(2))
+        assert journal.commits == 2
+        assert _xs(journal.replay()) == [1, 2]
+
+
+def test_replay_after_crash_ignores_torn_tail(tmp_path):
+    """Records committed before a crash are replayed; a torn append is dropped."""
+    journal = HistoryJournal(tmp_path, fsync_interval=0)
+    journal.extend(_record(i) for i in range(5))
+    segment = next(tmp_path.glob("wal-*.chist"))
+    with open(segment, "ab") as data:
+        data.write(b"\x09torn")
+    # No close(): the process died here
+    recovered = HistoryJournal(tmp_path, fsync_interval=0)
+    assert _xs(recovered.replay()) == [0, 1, 2, 3, 4]
+    recovered.append(_record(5))
+    assert _xs(recovered.replay()) == [0, 1, 2, 3, 4, 5]
+    recovered.close()
+
+
+def test_background_compaction_keeps_newest(tmp_path):
+    """Full segments are merged into a bounded snapshot in the background."""
+    with HistoryJournal(tmp_path, fsync_interval=0, compact_records=10, keep=15) as journal:
+        for i in range(45):
+            journal.append(_record(i))
+    names = sorted(path.name for path in tmp_path.glob("*.chist"))
+    assert len(names) <= 3 and any(name.startswith("snapshot-") for name in names)
+    replayed = _xs(HistoryJournal(tmp_path).replay())
+    assert replayed[-1] == 44
+    assert replayed == list(range(45 - len(replayed), 45))
+    assert len(replayed) <= 25
+
+
+def test_sync_reports_failed_commits(tmp_path, monkeypatch):
+    """A commit that fails with OSError is raised by the next sync(), once."""
+    with HistoryJournal(tmp_path, fsync_interval=0.01) as journal:
+        journal.append(_record(1))
+        journal.sync()
+
+        def fail(fsync=False):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(journal._writer, "flush", fail)  # pylint: disable=protected-access
+        journal.append(_record(2))
+        with pytest.raises(OSError, match="disk full"):
+            journal.sync()
+        journal.sync()
+        monkeypatch.undo()
+
+
+def test_files_covered_by_snapshot_are_not_replayed(tmp_path):
+    """A segment left behind by a crash during compaction is not replayed twice."""
+    journal = HistoryJournal(tmp_path, fsync_interval=0)
+    journal.extend(_record(i) for i in range(3))
+    segment = next(tmp_path.glob("wal-*.chist"))
+    leftover = tmp_path / "leftover"
+    shutil.copy(segment, leftover)
+    journal.rewrite(journal.replay())
+    journal.append(_record(3))
+    journal.close()
+    shutil.copy(leftover, segment)
+    leftover.unlink()
+    (tmp_path / "snapshot-00000009.chist.tmp").write_bytes(b"partial")
+    reopened = HistoryJournal(tmp_path)
+    assert _xs(reopened.replay()) == [0, 1, 2, 3]
+    assert not list(tmp_path.glob("*.tmp"))
+    reopened.close()
+
+
+def test_engine_journals_operations_outside_sessions(tmp_path):
+    """CalcEngine journals default-history operations; clearing checkpoints the journal."""
+    journal = HistoryJournal(tmp_path, fsync_interval=0.01)
+    CalcEngine.configure_journal(journal)
+    CalcEngine.sum_values(Decimal(2), Decimal(3))
+    CalcEngine.evaluate_batch("add", [1, 2], [3, 4])
+    with OperationHistory.session():
+        CalcEngine.product(Decimal(7), Decimal(7))
+    journal.sync()
+    assert [row.formatted for row in journal.replay()] == [
+        "2 + 3 = 5", "1 + 3 = 4", "2 + 4 = 6"]
+    OperationHistory.clear_records()
+    CalcEngine.checkpoint_journal()
+    assert list(journal.replay()) == []
+
+
+def test_undo_and_redo_are_journaled_as_markers(tmp_path):
+    """Undo/redo append markers that replay and compaction apply, without a rewrite."""
+    journal = HistoryJournal(tmp_path, fsync_interval=0, compact_records=6)
+    CalcEngine.configure_journal(journal)
+    for i in range(4):
+        CalcEngine.sum_values(Decimal(i), Decimal(1))
+    HistoryFacade.undo(3)
+    assert not list(tmp_path.glob("snapshot-*.chist"))
+    HistoryFacade.redo(1)
+    assert _xs(journal.replay()) == [0, 1]
+    # The sixth entry started a compaction; the snapshot keeps the undone records
+    CalcEngine.configure_journal(None)
+    assert len(list(tmp_path.glob("snapshot-*.chist"))) == 1
+    journal = HistoryJournal(tmp_path, fsync_interval=0)
+    CalcEngine.configure_journal(journal)
+    journal.redo(1)
+    assert _xs(journal.replay()) == [0, 1, 2]
+    CalcEngine.sum_values(Decimal(9), Decimal(1))
+    journal.redo(1)
+    assert _xs(journal.replay()) == [0, 1, 2, 9]
+
+
+def test_config_replays_journal_on_startup(tmp_path, monkeypatch):
+    """Config.configure_journal restores the history saved by the previous run."""
+    monkeypatch.setattr(Config, "AUTO_SAVE", True)
+    monkeypatch.setattr(Config, "HISTORY_DIR", str(tmp_path))
+    assert Config.configure_journal() == 0
+    CalcEngine.sum_values(Decimal(1), Decimal(2))
+    CalcEngine.configure_journal(None)
+    OperationHistory.clear_records()
+    assert Config.configure_journal() == 1
+    assert OperationHistory.get_last_record().formatted == "1 + 2 = 3"
+
+
+def test_app_class_demo_is_not_journaled(tmp_path, monkeypatch):
+    """The classic app's startup demo stays out of the history and the journal."""
+    monkeypatch.setattr(Config, "AUTO_SAVE", True)
+    monkeypatch.setattr(Config, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    ClassicApp()
+    assert OperationHistory.get_all_records() == []
+    CalcEngine.active_journal().close()
+    assert list(HistoryJournal(tmp_path / "journal").replay()) == []
@@ -0,0 +1,85 @@
+"""Tests for the queue-based logging pipeline and its filters."""
+import logging
+import threading
+import pytest
+from app.logger import Logger
+from app.logging_setup import (RateLimitFilter, SampleFilter, configure_logging,
+                               shutdown_logging)
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """Detach the pipeline after each test."""
+    yield
+    shutdown_logging()
+
+
+def _record(msg, level=logging.DEBUG, *args):
+    return logging.LogRecord("bench", level, __file__, 1, msg, args, None)
+
+
+def test_records_are_written_by_background_listener(tmp_path):
+    """Log calls enqueue records; the listener thread writes the file."""
+    output = tmp_path / "logs" / "app.log"
+    writer_threads = []
+
+    class RecordingHandler(logging.Handler):
+        def emit(self, record):
+            writer_threads.append(threading.current_thread())
+
+    configure_logging(level="DEBUG", output=str(output))
+    from app import logging_setup  # pylint: disable=import-outside-toplevel
+    logging_setup._listener.handlers += (RecordingHandler(),)  # pylint: disable=protected-access
+    logging.getLogger("app.test").debug("User input: %s", "add 1 2")
+    Logger.log("legacy message")
+    shutdown_logging()
+    text = output.read_text(encoding="utf-8")
+    assert "app.test - DEBUG - User input: add 1 2" in text
+    assert "calculator - INFO - legacy message" in text
+    assert writer_threads and threading.current_thread() not in writer_threads
+
+
+def test_reconfiguring_keeps_one_handler(tmp_path):
+    """configure_logging replaces its previous handler instead of stacking."""
+    first = configure_logging(output=str(tmp_path / "a.log"))
+    second = configure_logging(output=str(tmp_path / "b.log"))
+    handlers = logging.getLogger().handlers
+    assert second in handlers and first not in handlers
+
+
+def test_rate_limit_suppresses_and_reports(monkeypatch):
+    """Bursts beyond the limit are dropped and counted on the next record."""
+    clock = [100.0]
+    monkeypatch.setattr("app.logging_setup.time.monotonic", lambda: clock[0])
+    limiter = RateLimitFilter(rate=1, burst=2)
+    passed = [limiter.filter(_record("row %s", logging.WARNING, i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limiter.filter(_record("other message"))
+    assert limiter.filter(_record("failed", logging.ERROR))
+    clock[0] += 1
+    record = _record("row %s", logging.WARNING, 6)
+    assert limiter.filter(record)
+    assert record.getMessage() == "row 6 (3 similar messages suppressed)"
+    assert limiter.suppressed == 3
+
+
+def test_sampling_keeps_every_nth_debug_record():
+    """Debug records are sampled per template; higher levels always pass."""
+    sampler = SampleFilter(every=3)
+    kept = [sampler.filter(_record("input %s", logging.DEBUG, i)) for i in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampler.filter(_record("input %s", logging.INFO, 1))
+
+
+def test_filters_track_a_bounded_number_of_templates(monkeypatch):
+    """Pre-formatted messages group by call site and old templates are forgotten."""
+    monkeypatch.setattr("app.logging_setup.time.monotonic", lambda: 100.0)
+    limiter = RateLimitFilter(rate=1, burst=2, max_templates=3)
+    passed = [limiter.filter(_record(f"row {i}", logging.WARNING)) for i in range(4)]
+    assert passed == [True, True, False, False]
+    sampler = SampleFilter(every=2, max_templates=3)
+    for i in range(10):
+        limiter.filter(_record(f"template {i} %s", logging.WARNING, i))
+        sampler.filter(_record(f"template {i} %s", logging.DEBUG, i))
+    assert len(limiter._buckets) == len(sampler._counts) == 3  # pylint: disable=protected-access
+    assert sampler.filter(_record("template 0 %s", logging.DEBUG, 0))
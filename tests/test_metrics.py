@@ -0,0 +1,119 @@
+"""Tests for latency histograms, the stats command and the Prometheus exporter."""
+import random
+from decimal import Decimal
+import pytest
+from app.commands import CommandHandler, execute_timed
+from app.plugins.stats import StatsCommand
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.metrics import (METRICS, LatencyHistogram, MetricsRegistry,
+                                PrometheusFileExporter, bucket_bounds, bucket_index)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with an empty, enabled registry."""
+    METRICS.reset()
+    METRICS.enabled = True
+    yield
+    METRICS.reset()
+
+
+def test_buckets_cover_values_in_order():
+    """Every value falls inside its bucket, and buckets never go backwards."""
+    previous = 0
+    for value in list(range(5000)) + [2 ** 40 + 12345, 2 ** 62]:
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value < high
+        assert index >= previous
+        previous = index
+        if value >= 32:
+            assert (high - low) / low <= 1 / 16
+
+
+def test_percentiles_are_within_bucket_error():
+    """p50/p95/p99 are close to the exact percentiles, and max is exact."""
+    rng = random.Random(7)
+    samples = sorted(rng.randint(1_000, 50_000_000) for _ in range(20_000))
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+    for quantile in (0.5, 0.95, 0.99):
+        exact = samples[int(quantile * len(samples)) - 1]
+        assert abs(histogram.percentile(quantile) - exact) / exact < 0.05
+    assert histogram.max == samples[-1]
+    assert histogram.count == len(samples)
+    assert LatencyHistogram().percentile(0.99) == 0
+
+
+def test_timed_decorator_counts_errors():
+    """The decorator records every call and counts the raising ones as errors."""
+    registry = MetricsRegistry()
+
+    @registry.timed("history_io", "load")
+    def load(fail):
+        if fail:
+            raise OSError("disk")
+        return "ok"
+
+    assert load(False) == "ok"
+    with pytest.raises(OSError):
+        load(True)
+    snapshot = registry.histogram("history_io", "load").snapshot()
+    assert snapshot["count"] == 2 and snapshot["errors"] == 1
+    registry.enabled = False
+    load(False)
+    assert registry.histogram("history_io", "load").count == 2
+
+
+def test_engine_operations_and_commands_are_recorded(capsys):
+    """CalcEngine operations and dispatched commands get their own histograms."""
+    CalcEngine.sum_values(Decimal(1), Decimal(2))
+    with pytest.raises(ValueError):
+        CalcEngine.quotient(Decimal(1), Decimal(0))
+    CalcEngine.evaluate_batch("add", [1, 2], [3, 4], record=False)
+    handler = CommandHandler()
+    handler.register_command("stats", StatsCommand())
+    handler.execute_command("stats")
+    execute_timed("stats", StatsCommand(), "operation")
+    table = capsys.readouterr().out
+    assert "add_numbers" in table and "div_numbers" in table
+    assert METRICS.histogram("operation", "div_numbers").errors == 1
+    assert METRICS.histogram("batch", "add_numbers").count == 1
+    assert METRICS.histogram("command", "stats").count == 2
+    OperationHistory.clear_records()
+
+
+def test_stats_command_views(capsys):
+    """stats prints a table, the Prometheus text, or resets the registry."""
+    StatsCommand().execute()
+    assert capsys.readouterr().out.strip() == "No metrics recorded yet"
+    METRICS.observe("command", "add", 2_000_000)
+    StatsCommand().execute("prometheus")
+    text = capsys.readouterr().out
+    p99 = next(line for line in text.splitlines() if 'quantile="0.99"' in line)
+    assert p99.startswith('calculator_command_latency_seconds{command="add",quantile="0.99"} ')
+    assert abs(float(p99.split()[-1]) - 0.002) < 0.002 / 16
+    assert 'calculator_command_latency_seconds_count{command="add"} 1' in text
+    assert 'calculator_command_errors_total{command="add"} 0' in text
+    StatsCommand().execute("reset")
+    StatsCommand().execute()
+    assert capsys.readouterr().out.splitlines() == [
+        "Statistics reset", "No metrics recorded yet"]
+
+
+def test_prometheus_file_exporter(tmp_path):
+    """The exporter writes the file periodically and once more on stop."""
+    registry = MetricsRegistry()
+    registry.observe("operation", 'we"ird', 1_000)
+    path = tmp_path / "metrics" / "calculator.prom"
+    exporter = PrometheusFileExporter(registry, path, interval=0.01)
+    exporter.start()
+    registry.observe("operation", "add_numbers", 5_000)
+    exporter.stop()
+    text = path.read_text(encoding="utf-8")
+    assert "# TYPE calculator_operation_latency_seconds summary" in text
+    assert 'operation="we\\"ird"' in text
+    assert 'calculator_operation_latency_seconds_count{operation="add_numbers"} 1' in text
+    assert not list(path.parent.glob("*.tmp"))
@@ -0,0 +1,103 @@
+"""Tests for precision-aware numeric modes."""
+import random
+from decimal import Decimal, getcontext
+import pytest
+from app.calculator_config import Config
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.numeric import NumericMode, canonical, quantize_result
+
+
+@pytest.fixture(autouse=True)
+def clean_history():
+    """Start with an empty history and restore Decimal's default precision."""
+    OperationHistory.clear_records()
+    yield
+    OperationHistory.clear_records()
+    CalcEngine.configure_numeric(None)
+    getcontext().prec = 28
+
+
+@pytest.mark.parametrize("value, places, expected", [
+    ("0.333333", 4, "0.3333"),
+    ("0.66666", 4, "0.6667"),
+    ("0.00005", 4, "0"),
+    ("0.00015", 4, "0.0002"),
+    ("5.00", 4, "5"),
+    ("2.50", 4, "2.5"),
+    ("6.9707E+5", 4, "697070"),
+    ("-0.00001", 4, "0"),
+    ("123.456", 0, "123"),
+])
+def test_quantize_result_is_canonical(value, places, expected):
+    """Results are rounded half-even to at most `places` decimals without trailing zeros."""
+    assert str(quantize_result(Decimal(value), places)) == expected
+
+
+def test_canonical_keeps_huge_values():
+    """Values beyond the working precision keep their exponent instead of failing."""
+    assert str(canonical(Decimal("1E+40"))) == "1E+40"
+
+
+def test_exact_mode_rounds_results_and_history():
+    """Engine results and history records are rounded the same way."""
+    CalcEngine.configure_numeric("exact", 4)
+    assert CalcEngine.quotient(Decimal(1), Decimal(3)) == Decimal("0.3333")
+    assert str(CalcEngine.sum_values(Decimal("2.50"), Decimal("2.50"))) == "5"
+    assert [record.formatted for record in OperationHistory.iter_records()] == [
+        "1 ÷ 3 = 0.3333", "2.50 + 2.50 = 5"]
+
+
+def test_working_precision_follows_places():
+    """Asking for more places than Decimal's default precision raises the precision."""
+    CalcEngine.configure_numeric("exact", 20)
+    assert getcontext().prec == 36
+    assert str(CalcEngine.quotient(Decimal(2), Decimal(3))) == "0.66666666666666666667"
+
+
+def test_fast_batch_matches_exact_batch():
+    """Float64 batches give exactly the exact-mode results, ties and zeros included."""
+    rng = random.Random(3)
+    xs = [f"{rng.randint(-10 ** 6, 10 ** 6) / 1000}" for _ in range(2000)]
+    ys = [f"{rng.randint(-10 ** 4, 10 ** 4) / 100}" for _ in range(2000)]
+    xs += ["0.00005", "1.00015", "2.5", "7", "1e300"]
+    ys += ["0", "0", "0", "0", "1e300"]
+    for op in ("add", "subtract", "multiply", "divide"):
+        CalcEngine.configure_numeric("exact", 4)
+        exact = CalcEngine.evaluate_batch(op, xs, ys, record=False)
+        CalcEngine.configure_numeric("fast", 4)
+        fast = CalcEngine.evaluate_batch(op, xs, ys, record=False)
+        assert [str(value) for value in fast.results] == [str(value) for value in exact.results]
+        assert fast.errors == exact.errors
+        stats = CalcEngine.numeric_stats()
+        assert stats["fast_results"] > 1500
+        assert stats["fallbacks"] >= 1  # ties, division by zero or overflow
+
+
+def test_fast_batch_records_decimal_operands():
+    """Recorded fast-batch elements carry Decimal operands and rounded results."""
+    CalcEngine.configure_numeric("fast", 2)
+    CalcEngine.evaluate_batch("divide", ["1", 2.5], ["3", "0"])
+    assert [record.formatted for record in OperationHistory.iter_records()] == ["1 ÷ 3 = 0.33"]
+
+
+def test_scalar_operations_stay_exact_in_fast_mode():
+    """Single operations are rounded but never computed in float."""
+    CalcEngine.configure_numeric("fast", 4)
+    assert CalcEngine.sum_values(Decimal("0.1"), Decimal("0.2")) == Decimal("0.3")
+    assert CalcEngine.numeric_stats()["fast_results"] == 0
+
+
+def test_config_applies_numeric_mode(monkeypatch):
+    """Config.configure_engine applies NUMERIC_MODE and PRECISION; "off" keeps raw results."""
+    monkeypatch.setattr(Config, "NUMERIC_MODE", "fast")
+    monkeypatch.setattr(Config, "PRECISION", 3)
+    monkeypatch.setattr(Config, "WORKER_PROCESSES", 0)
+    Config.configure_engine()
+    assert CalcEngine.numeric_stats()["mode"] == "fast"
+    assert CalcEngine.numeric_stats()["places"] == 3
+    monkeypatch.setattr(Config, "NUMERIC_MODE", "off")
+    Config.configure_engine()
+    assert CalcEngine.numeric is None
+    with pytest.raises(ValueError):
+        NumericMode("approximate")
@@ -0,0 +1,102 @@
+"""Tests for the cached plugin manifest and lazy plugin commands."""
+import os
+import sys
+from pathlib import Path
+from app import App
+from app.plugin_manifest import LazyCommand, build_manifest, load_manifest
+
+PLUGIN_SOURCE = '''
+from app.commands import Command
+
+class GreetCommand(Command):
+    def execute(self, name="world"):
+        print(f"hello {name}")
+'''
+
+
+def make_plugins(tmp_path):
+    """Create a throwaway plugin package importable as lazyplugins."""
+    package = tmp_path / "lazyplugins"
+    (package / "greet").mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "greet" / "__init__.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    return package
+
+
+def test_manifest_lists_commands_without_importing(tmp_path):
+    """The manifest is built from source without importing plugins."""
+    package = make_plugins(tmp_path)
+    manifest = build_manifest(package, "lazyplugins")
+    assert manifest["commands"] == {
+        "greet": {"module": "lazyplugins.greet", "class": "GreetCommand"}
+    }
+    assert "lazyplugins.greet" not in sys.modules
+
+
+def test_manifest_cache_tracks_mtimes(tmp_path):
+    """The cached manifest is reused until a plugin file changes."""
+    package = make_plugins(tmp_path)
+    cache = tmp_path / "cache" / "manifest.json"
+    load_manifest(package, "lazyplugins", cache)
+    cache_mtime = cache.stat().st_mtime_ns
+    load_manifest(package, "lazyplugins", cache)
+    assert cache.stat().st_mtime_ns == cache_mtime
+
+    source = package / "greet" / "__init__.py"
+    source.write_text(PLUGIN_SOURCE.replace("Greet", "Wave"), encoding="utf-8")
+    os.utime(source, ns=(0, 0))
+    manifest = load_manifest(package, "lazyplugins", cache)
+    assert list(manifest["commands"]) == ["wave"]
+
+
+def test_lazy_command_imports_on_first_use(tmp_path, monkeypatch, capfd):
+    """Plugin modules are only imported when their command first runs."""
+    make_plugins(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    command = LazyCommand("greet", "lazyplugins.greet", "GreetCommand")
+    assert "lazyplugins.greet" not in sys.modules
+    command.execute("tests")
+    assert "lazyplugins.greet" in sys.modules
+    assert "hello tests" in capfd.readouterr().out
+
+
+def test_lazy_command_reports_broken_plugin(capfd):
+    """A plugin that fails to import is reported instead of crashing the REPL."""
+    LazyCommand("ghost", "app.plugins.ghost", "GhostCommand").execute()
+    assert "Command ghost is unavailable" in capfd.readouterr().out
+
+
+def test_app_registers_plugins_lazily(tmp_path, monkeypatch):
+    """App registers every plugin command from the manifest."""
+    app = App(start_repl=False)
+    monkeypatch.setitem(app.settings, 'PLUGIN_MANIFEST', str(tmp_path / "manifest.json"))
+    app.load_plugins()
+    commands = app.command_handler.commands
+    assert {"add", "divide", "historyshow", "lastop"} <= set(commands)
+    assert isinstance(commands["add"], LazyCommand)
+    assert Path(tmp_path / "manifest.json").exists()
+
+
+def test_manifest_finds_indirect_and_reexported_commands(tmp_path, monkeypatch):
+    """Local subclasses are found by parsing; re-exports and imported bases by importing."""
+    package = make_plugins(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Earlier tests may have imported lazyplugins from another tmp_path
+    for name in [name for name in sys.modules if name.partition(".")[0] == "lazyplugins"]:
+        monkeypatch.delitem(sys.modules, name)
+    (package / "greet" / "__init__.py").write_text(
+        PLUGIN_SOURCE + "\nclass LoudGreetCommand(GreetCommand):\n    pass\n", encoding="utf-8")
+    (package / "wave").mkdir()
+    (package / "wave" / "__init__.py").write_text(
+        "from .wave import WaveCommand\n", encoding="utf-8")
+    (package / "wave" / "wave.py").write_text(
+        PLUGIN_SOURCE.replace("Greet", "Wave"), encoding="utf-8")
+    (package / "cheer.py").write_text(
+        "from lazyplugins.greet import GreetCommand as Base\n\n"
+        "class CheerCommand(Base):\n    pass\n", encoding="utf-8")
+    manifest = build_manifest(package, "lazyplugins")
+    assert manifest["commands"]["loudgreet"] == {"module": "lazyplugins.greet",
+                                                 "class": "LoudGreetCommand"}
+    assert manifest["commands"]["wave"] == {"module": "lazyplugins.wave", "class": "WaveCommand"}
+    assert manifest["commands"]["cheer"]["module"] == "lazyplugins.cheer"
+    assert str(package / "wave" / "wave.py") in manifest["files"]
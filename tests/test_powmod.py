@@ -0,0 +1,108 @@
+"""Tests for modular exponentiation and integral powers."""
+from decimal import Decimal, localcontext
+from unittest.mock import patch
+import pytest
+from app.plugins.history_facade import HistoryFacade
+from app.plugins.powmod import PowmodCommand
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.operations import power_numbers, powmod_numbers
+from calculator.workers import is_expensive
+
+
+@pytest.fixture(autouse=True)
+def clean_history():
+    """Start each test with an empty history."""
+    OperationHistory.clear_records()
+    yield
+    OperationHistory.clear_records()
+
+
+@pytest.mark.parametrize("x, y, m", [
+    (7, 12, 13), (-7, 1, 13), (-7, 3, 13), (-7, 2, 13), (7, 3, -13), (2, 10, 1), (12, 0, 5),
+])
+def test_powmod_matches_decimal_modulus(x, y, m):
+    """Integer results have the sign of x ** y, exactly like Decimal's modulus."""
+    expected = (Decimal(x) ** Decimal(y)) % Decimal(m)
+    assert powmod_numbers(Decimal(x), Decimal(y), Decimal(m)) == expected
+
+
+def test_powmod_never_builds_the_power():
+    """Exponents far beyond the context's exponent range still give exact results."""
+    assert powmod_numbers(Decimal(7), Decimal(10 ** 30), Decimal(10 ** 40 + 7)) == Decimal(
+        pow(7, 10 ** 30, 10 ** 40 + 7))
+    assert powmod_numbers(Decimal(3), Decimal(-1), Decimal(7)) == 5  # modular inverse
+
+
+def test_powmod_non_integer_and_zero_modulus():
+    """Non-integer operands fall back to (x ** y) % m; a zero modulus is rejected."""
+    assert powmod_numbers(Decimal("2.5"), Decimal(2), Decimal(3)) == Decimal("0.25")
+    with pytest.raises(ValueError, match="zero divisor"):
+        powmod_numbers(Decimal(2), Decimal(3), Decimal(0))
+
+
+def test_engine_records_powmod_with_modulus():
+    """CalcEngine.powmod records its modulus along with the base and exponent."""
+    assert CalcEngine.powmod(Decimal(7), Decimal(10000000), Decimal(13)) == 9
+    record = OperationHistory.get_last_record()
+    assert record.symbol == "^%" and record.modulus == 13
+    assert record.formatted == "7 ^ 10000000 mod 13 = 9"
+
+
+def test_powmod_modulus_survives_columnar_and_binary_history(tmp_path):
+    """The columnar backend and binary history files keep the modulus."""
+    CalcEngine.powmod(Decimal(7), Decimal(10000000), Decimal(13))
+    CalcEngine.sum_values(Decimal(2), Decimal(3))
+    expected = ["7 ^ 10000000 mod 13 = 9", "2 + 3 = 5"]
+    try:
+        OperationHistory.configure(backend="columnar")
+        assert HistoryFacade.get_formatted_history() == expected
+        with patch('app.plugins.history_facade.HistoryFacade._get_history_dir',
+                   return_value=tmp_path):
+            HistoryFacade.save_to_binary()
+            OperationHistory.clear_records()
+            HistoryFacade.load_from_binary(next(tmp_path.glob("*.chist")).name)
+        assert HistoryFacade.get_formatted_history() == expected
+    finally:
+        OperationHistory.configure()
+
+
+def test_powmod_command(capfd):
+    """The powmod command prints the result or the error."""
+    PowmodCommand().execute("7", "10000000", "13")
+    PowmodCommand().execute("2", "3", "0")
+    PowmodCommand().execute("2", "x", "5")
+    out = capfd.readouterr().out
+    assert "The result of 7 ^ 10000000 mod 13 is 9" in out
+    assert "An error occurred: Cannot perform modulus with zero divisor" in out
+    assert "Invalid number: 2, x or 5 is not a valid number." in out
+
+
+def test_integral_powers_stay_in_process():
+    """Integral exponents need one multiplication per bit and are not offloaded early."""
+    with localcontext() as context:
+        context.prec = 500
+        assert not is_expensive(power_numbers, Decimal(2), Decimal(100000))
+        assert is_expensive(power_numbers, Decimal(2), Decimal("0.5"))
+        context.prec = 5000
+        assert is_expensive(power_numbers, Decimal(2), Decimal(100000))
+
+
+def test_powmod_history_round_trip(tmp_path):
+    """Saved powmod rows load with their stored result and are rejected when it is missing."""
+    CalcEngine.powmod(Decimal(7), Decimal(10000000), Decimal(13))
+    CalcEngine.sum_values(Decimal(2), Decimal(3))
+    with patch('app.plugins.history_facade.HistoryFacade._get_history_dir',
+               return_value=tmp_path):
+        HistoryFacade.stream_to_csv()
+        name = next(tmp_path.glob("*.csv")).name
+        assert "Loaded 2 entries" in HistoryFacade.load_from_csv(name)
+        assert HistoryFacade.get_formatted_history() == ["7 ^% 10000000 = 9", "2 + 3 = 5"]
+
+        message = HistoryFacade.load_from_csv(name, trust_results=False)
+        assert "Loaded 1 entries" in message
+        assert "cannot recompute ^% without a stored result" in message
+        (tmp_path / "bad.csv").write_text(
+            "operand1,operand2,operation,result\n7,3,^%,NaN\n7,3,^%,\n", encoding="utf-8")
+        assert "Loaded 0 entries" in HistoryFacade.load_from_csv("bad.csv")
+        assert HistoryFacade.csv_to_binary(tmp_path / "bad.csv", tmp_path / "bad.chist") == (0, 2)
@@ -0,0 +1,70 @@
+"""Tests for the CalcEngine result cache."""
+from decimal import Decimal, localcontext
+import pytest
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers
+from calculator.result_cache import ResultCache
+
+
+@pytest.fixture(autouse=True)
+def result_cache():
+    """Enable a fresh cache for each test and disable it afterwards."""
+    OperationHistory.clear_records()
+    CalcEngine.configure_result_cache(1 << 20)
+    yield CalcEngine.result_cache
+    CalcEngine.configure_result_cache(0)
+
+
+def test_cache_hits_still_record_history(result_cache):
+    """Repeated operations hit the cache but are recorded every time."""
+    for _ in range(3):
+        assert CalcEngine.power(Decimal(3), Decimal(40)) == Decimal(3) ** 40
+    records = OperationHistory.get_all_records()
+    assert len(records) == 3
+    assert all(r.result == Decimal(3) ** 40 for r in records)
+    stats = CalcEngine.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert result_cache.size_bytes > 0
+
+
+def test_cache_key_uses_exact_operands_and_context():
+    """Equal but differently written operands and context changes do not share entries."""
+    assert str(CalcEngine.sum_values(Decimal("1.0"), Decimal(1))) == "2.0"
+    assert str(CalcEngine.sum_values(Decimal(1), Decimal(1))) == "2"
+    with localcontext() as context:
+        context.prec = 3
+        assert CalcEngine.quotient(Decimal(1), Decimal(3)) == Decimal("0.333")
+    assert CalcEngine.quotient(Decimal(1), Decimal(3)) != Decimal("0.333")
+    assert CalcEngine.cache_stats()["hits"] == 0
+
+
+def test_errors_are_not_cached():
+    """Failing operations raise every time and are not recorded."""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            CalcEngine.quotient(Decimal(1), Decimal(0))
+    assert CalcEngine.cache_stats()["entries"] == 0
+    assert OperationHistory.get_all_records() == []
+
+
+def test_lru_eviction_respects_byte_budget():
+    """Least recently used entries are evicted once the budget is exceeded."""
+    cache = ResultCache(2000)
+    keys = [cache.make_key(add_numbers, Decimal(i), Decimal(i)) for i in range(20)]
+    for i, key in enumerate(keys):
+        cache.put(key, Decimal(2 * i))
+        cache.get(keys[0])
+    assert cache.size_bytes <= 2000
+    assert cache.evictions == 20 - len(cache)
+    assert cache.get(keys[0]) == 0
+    assert cache.get(keys[1]) is None
+
+
+def test_cache_disabled_by_default():
+    """A zero budget disables the cache."""
+    CalcEngine.configure_result_cache(0)
+    CalcEngine.sum_values(Decimal(1), Decimal(2))
+    assert CalcEngine.cache_stats() is None
+    with pytest.raises(ValueError):
+        ResultCache(0)
@@ -0,0 +1,68 @@
+"""Tests for exact nth roots."""
+from decimal import Decimal, localcontext
+import pytest
+from app.plugins.root import root_number
+from calculator import CalcEngine
+from calculator.roots import integer_root, nth_root
+
+
+def test_integer_root_is_floor():
+    """integer_root returns the largest integer whose nth power does not exceed the value."""
+    for n in range(1, 7):
+        for value in range(2000):
+            root = integer_root(value, n)
+            assert root ** n <= value < (root + 1) ** n
+    assert integer_root(123456789 ** 7, 7) == 123456789
+
+
+@pytest.mark.parametrize("x, n, expected", [
+    ("27", "3", "3"),
+    ("16", "2", "4"),
+    ("0.008", "3", "0.2"),
+    ("1E+6", "3", "1E+2"),
+    ("-27", "3", "-3"),
+    ("8", "-3", "0.5"),
+    ("0", "5", "0"),
+])
+def test_perfect_powers_are_exact(x, n, expected):
+    """Perfect powers give exact results instead of rounded approximations."""
+    assert nth_root(Decimal(x), Decimal(n)) == Decimal(expected)
+
+
+def test_roots_respect_precision():
+    """Inexact roots are correctly rounded to the active precision."""
+    assert str(nth_root(Decimal(2), Decimal(3))) == "1.259921049894873164767210607"
+    with localcontext() as context:
+        context.prec = 150
+        assert nth_root(Decimal(2), Decimal(2)) == Decimal(2).sqrt()
+        root = nth_root(Decimal("12345.678"), Decimal(7))
+        assert len(root.as_tuple().digits) == 150
+        context.prec = 160
+        assert abs(root ** 7 - Decimal("12345.678")) < Decimal("1E-140")
+
+
+def test_non_integer_degree_falls_back_to_power():
+    """Fractional degrees are still computed as x ** (1 / n)."""
+    assert nth_root(Decimal(8), Decimal("0.5")) == Decimal(64)
+
+
+def test_invalid_roots_raise():
+    """A zero degree or an even root of a negative number is rejected."""
+    with pytest.raises(ValueError, match="cannot be zero"):
+        CalcEngine.root(Decimal(8), Decimal(0))
+    with pytest.raises(ValueError, match="even root"):
+        CalcEngine.root(Decimal(-16), Decimal(2))
+    assert root_number("-16", "2") == "Error: Cannot take an even root of a negative number."
+    assert root_number("8", "0") == "Error: Root degree cannot be zero."
+    assert root_number("27", "3") == Decimal(3)
+
+
+@pytest.mark.parametrize("x, n", [("0.5", "1E+6"), ("2", "1000001"), ("1E+6", "1E+6")])
+def test_large_degrees_skip_the_exact_attempt(x, n):
+    """Huge degrees never build the shifted integer and stay close to 1."""
+    with localcontext() as context:
+        context.prec = 20
+        root = nth_root(Decimal(x), Decimal(n))
+    assert root != 1 and abs(root - 1) < Decimal("1E-4")
+    assert nth_root(Decimal("1E+600000"), Decimal(100000)) == Decimal("1E+6")
+    assert nth_root(Decimal("8.000"), Decimal(3)) == 2
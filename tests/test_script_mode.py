@@ -0,0 +1,73 @@
+"""Tests for non-interactive script/filter mode."""
+import io
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+import pytest
+from app import App
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def clear_history_before_tests():
+    """Start every test with an empty history."""
+    OperationHistory.clear_records()
+
+
+def test_run_script_executes_commands_in_order():
+    """Commands run in order; comments and blank lines are skipped."""
+    app = App(start_repl=False)
+    output = io.StringIO()
+    script = ["add 1 2\n", "# comment\n", "\n", "divide 9 3\n", "lastop\n", "exit\n", "add 5 5\n"]
+    executed = app.run_script(script, output=output, flush_lines=2)
+    assert executed == 3
+    assert output.getvalue().splitlines() == [
+        "The result of 1 + 2 is 3",
+        "The result of 9 / 3 is 3",
+        "Last operation: 9 ÷ 3 = 3",
+    ]
+    assert len(OperationHistory.get_all_records()) == 2
+
+
+def test_run_script_flushes_output_on_uncaught_exception():
+    """Output buffered before an uncaught exception is still written."""
+    app = App(start_repl=False)
+    output = io.StringIO()
+
+    def script():
+        yield "add 1 2\n"
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        app.run_script(script(), output=output)
+    assert output.getvalue() == "The result of 1 + 2 is 3\n"
+
+
+def test_run_script_quiet_still_records_history():
+    """Quiet mode prints nothing but still records every operation."""
+    app = App(start_repl=False)
+    output = io.StringIO()
+    app.run_script((f"multiply {i} 2" for i in range(30)), quiet=True, output=output)
+    assert output.getvalue() == ""
+    assert len(OperationHistory.get_all_records()) == 30
+
+
+def test_batched_history_flushes_before_reads():
+    """Buffered records are visible to readers before the batch ends."""
+    with OperationHistory.batched(size=100):
+        CalcEngine.sum_values(Decimal(1), Decimal(1))
+        assert OperationHistory.get_last_record().result == 2
+        CalcEngine.sum_values(Decimal(2), Decimal(2))
+    assert len(OperationHistory.get_all_records()) == 2
+
+
+def test_main_reads_piped_stdin():
+    """main.py switches to filter mode when stdin is not a TTY."""
+    result = subprocess.run([sys.executable, "main.py"], input="add 2 3\nsubtract 9 4\n",
+                            capture_output=True, text=True, cwd=ROOT, timeout=60, check=True)
+    assert result.stdout.splitlines() == ["The result of 2 + 3 is 5",
+                                          "The result of 9 - 4 is 5"]
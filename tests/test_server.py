@@ -0,0 +1,146 @@
+"""Tests for the asyncio line-delimited JSON server."""
+import asyncio
+import json
+import sys
+import threading
+import pytest
+from app import App
+from app.commands import execute_timed
+from app.server import CalculatorServer, RequestError, parse_request
+from app.settings import get_settings
+from calculator.history.history import OperationHistory
+
+
+@pytest.fixture(name="handler", scope="module")
+def fixture_handler():
+    """Command handler with all plugins registered."""
+    return App(start_repl=False).command_handler
+
+
+async def _call(reader, writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def test_parse_request_forms():
+    """Requests may give a command with args or a whole command line."""
+    assert parse_request(b'{"id": 1, "command": "ADD", "args": [2, "3"]}') == (1, "add", ["2", "3"])
+    assert parse_request(b'{"line": "calc 2 + 3"}') == (None, "calc", ["2", "+", "3"])
+    for bad in (b"not json", b"[1]", b'{"args": []}', b'{"command": "add", "args": "1 2"}'):
+        with pytest.raises(RequestError):
+            parse_request(bad)
+
+
+def test_connections_have_separate_histories(handler, tmp_path):
+    """Each TCP or UNIX connection records into its own history."""
+    OperationHistory.clear_records()
+
+    async def scenario():
+        server = CalculatorServer(handler)
+        servers = await server.start("127.0.0.1", 0, str(tmp_path / "calc.sock"))
+        port = servers[0].sockets[0].getsockname()[1]
+        tcp = await asyncio.open_connection("127.0.0.1", port)
+        unix = await asyncio.open_unix_connection(str(tmp_path / "calc.sock"))
+        try:
+            first = await _call(*tcp, {"id": 1, "command": "add", "args": ["2", "3"]})
+            second = await _call(*unix, {"id": 2, "line": "multiply 4 5"})
+            last_tcp = await _call(*tcp, {"id": 3, "line": "lastop"})
+            last_unix = await _call(*unix, {"id": 4, "line": "lastop"})
+            missing = await _call(*tcp, {"id": 5, "line": "nosuch 1"})
+            goodbye = await _call(*tcp, {"id": 6, "line": "exit"})
+            closed = await tcp[0].readline()
+        finally:
+            for _, writer in (tcp, unix):
+                writer.close()
+            await server.close()
+        return first, second, last_tcp, last_unix, missing, goodbye, closed
+
+    first, second, last_tcp, last_unix, missing, goodbye, closed = asyncio.run(scenario())
+    assert first == {"id": 1, "ok": True, "output": "The result of 2 + 3 is 5"}
+    assert second["output"] == "The result of 4 * 5 is 20"
+    assert last_tcp["output"] == "Last operation: 2 + 3 = 5"
+    assert last_unix["output"] == "Last operation: 4 × 5 = 20"
+    assert missing == {"id": 5, "ok": False, "error": "No such command: nosuch"}
+    assert goodbye["ok"] and closed == b""
+    assert OperationHistory.get_all_records() == []
+
+
+def test_history_io_runs_in_thread_pool_with_session(handler, tmp_path, monkeypatch):
+    """historysave runs off the event loop but saves the connection's history."""
+    monkeypatch.setitem(get_settings(), "HISTORY_PATH", str(tmp_path))
+
+    async def scenario():
+        server = CalculatorServer(handler, io_workers=1)
+        servers = await server.start("127.0.0.1", 0)
+        port = servers[0].sockets[0].getsockname()[1]
+        connection = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await _call(*connection, {"line": "subtract 9 4"})
+            saved = await _call(*connection, {"line": "historysave"})
+            prompt = await _call(*connection, {"line": "historyload"})
+        finally:
+            connection[1].close()
+            await server.close()
+        return saved, prompt
+
+    saved, prompt = asyncio.run(scenario())
+    assert saved["ok"] and "1 rows" in saved["output"]
+    csv_files = list(tmp_path.glob("*.csv"))
+    assert len(csv_files) == 1
+    assert "9,4" in csv_files[0].read_text(encoding="utf-8")
+    assert prompt["ok"] is False
+
+
+def test_overlong_line_closes_connection(handler):
+    """Lines over the size limit get an error and the connection is closed."""
+    async def scenario():
+        server = CalculatorServer(handler, max_line_bytes=64)
+        servers = await server.start("127.0.0.1", 0)
+        port = servers[0].sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(b'{"line": "add ' + b"1" * 200 + b' 2"}\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            closed = await reader.readline()
+        finally:
+            writer.close()
+            await server.close()
+        return response, closed
+
+    response, closed = asyncio.run(scenario())
+    assert response["error"] == "Request line too long"
+    assert closed == b""
+
+
+def test_every_command_runs_in_thread_pool(handler, monkeypatch):
+    """Arithmetic runs off the event loop; stdout is restored after the last server closes."""
+    threads = []
+    original_stdout = sys.stdout
+
+    def recording_execute(name, command, *args):
+        threads.append(threading.current_thread().name)
+        return execute_timed(name, command, *args)
+
+    monkeypatch.setattr("app.server.execute_timed", recording_execute)
+
+    async def scenario():
+        first, second = CalculatorServer(handler), CalculatorServer(handler)
+        servers = await first.start("127.0.0.1", 0)
+        await second.start("127.0.0.1", 0)
+        port = servers[0].sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            response = await _call(reader, writer, {"line": "add 2 3"})
+        finally:
+            writer.close()
+            await second.close()
+            still_proxied = sys.stdout is not original_stdout
+            await first.close()
+        return response, still_proxied
+
+    response, still_proxied = asyncio.run(scenario())
+    assert response["output"] == "The result of 2 + 3 is 5"
+    assert threads and all(name.startswith("calc-io") for name in threads)
+    assert still_proxied and sys.stdout is original_stdout
@@ -0,0 +1,50 @@
+"""Startup cost tests: deferred heavy imports and time-to-first-prompt."""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Generous default so slow CI machines pass; tighten locally via the env var
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+
+def run_python(code, stdin=""):
+    """Run code in a fresh interpreter from the project root."""
+    return subprocess.run([sys.executable, "-c", code], input=stdin, capture_output=True,
+                          text=True, cwd=ROOT, timeout=60, check=True)
+
+
+def test_startup_does_not_import_pandas():
+    """Building the app and its plugins leaves pandas and numpy unimported."""
+    result = run_python(
+        "import sys\n"
+        "import app.app_class\n"
+        "from app import App\n"
+        "App(start_repl=False)\n"
+        "print('pandas' in sys.modules, 'numpy' in sys.modules)\n"
+    )
+    assert result.stdout.strip().splitlines()[-1] == "False False"
+
+
+def test_config_is_lazy():
+    """Importing the config neither parses it nor creates directories."""
+    result = run_python(
+        "from app.calculator_config import Config\n"
+        "import app.settings\n"
+        "print(app.settings._settings is None, 'LOG_DIR' in Config.__dict__)\n"
+    )
+    assert result.stdout.strip() == "True False"
+
+
+@pytest.mark.slow
+def test_main_time_to_first_prompt():
+    """main.py reaches its prompt and exits within the startup budget."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "main.py", "--interactive"], input="exit\n",
+                            capture_output=True, text=True, cwd=ROOT, timeout=60, check=True)
+    elapsed = time.perf_counter() - started
+    assert "> " in result.stdout
+    assert elapsed < STARTUP_BUDGET_SECONDS, f"startup took {elapsed:.2f}s"
@@ -0,0 +1,98 @@
+"""Tests for offloading expensive operations to worker processes."""
+import time
+from decimal import Decimal, localcontext
+import pytest
+from calculator import CalcEngine
+from calculator.history.history import OperationHistory
+from calculator.operations import add_numbers, power_numbers, root_numbers
+from calculator.workers import START_METHOD, OperationTimeout, WorkerPool, is_expensive
+
+
+@pytest.fixture(autouse=True)
+def worker_pool():
+    """Give each test a fresh pool and empty history."""
+    OperationHistory.clear_records()
+    CalcEngine.configure_worker_pool(1, timeout=30, chunk_size=2)
+    yield CalcEngine.worker_pool
+    CalcEngine.configure_worker_pool(0)
+
+
+def test_classification():
+    """Only powers and roots at high precision or with long operands are expensive."""
+    assert not is_expensive(power_numbers, Decimal(2), Decimal(3))
+    assert not is_expensive(add_numbers, Decimal("1" * 500), Decimal(1))
+    assert is_expensive(root_numbers, Decimal("1" * 500), Decimal(2))
+    with localcontext() as context:
+        context.prec = 500
+        assert is_expensive(power_numbers, Decimal(2), Decimal("0.5"))
+
+
+def test_cheap_operations_stay_in_process(worker_pool):
+    """Cheap operations never start worker processes."""
+    assert CalcEngine.power(Decimal(2), Decimal(10)) == 1024
+    assert worker_pool._executor is None  # pylint: disable=protected-access
+
+
+def test_offloaded_result_uses_caller_context_and_history(worker_pool):
+    """Offloaded operations use the caller's precision and are recorded."""
+    with localcontext() as context:
+        context.prec = 150
+        result = CalcEngine.root(Decimal(2), Decimal(2))
+        expected = Decimal(2).sqrt()
+    assert worker_pool._executor is not None  # pylint: disable=protected-access
+    assert abs(result - expected) < Decimal("1e-145")
+    assert OperationHistory.get_last_record().result == result
+
+
+def test_runaway_operation_times_out_and_pool_recovers():
+    """A runaway power is stopped by the timeout without blocking later work."""
+    CalcEngine.configure_worker_pool(1, timeout=0.5)
+    started = time.perf_counter()
+    with localcontext() as context:
+        context.prec = 20000
+        with pytest.raises(OperationTimeout):
+            CalcEngine.power(Decimal(2), Decimal("0.5"))
+    assert time.perf_counter() - started < 10
+    assert CalcEngine.sum_values(Decimal(1), Decimal(2)) == 3
+    assert OperationHistory.get_all_records()[-1].result == 3
+    with localcontext() as context:
+        context.prec = 120
+        assert CalcEngine.power(Decimal(3), Decimal(2)) == 9
+    assert CalcEngine.worker_pool.timeouts == 1
+
+
+def test_batch_fans_out_in_chunks():
+    """Expensive batches are split into chunks and keep their order."""
+    with localcontext() as context:
+        context.prec = 120
+        batch = CalcEngine.evaluate_batch("power", [2, 3, 4, 5, -8], [10, 2, "0.5", 3, "0.5"])
+    assert batch.results[:4] == [Decimal(1024), Decimal(9), Decimal(2), Decimal(125)]
+    assert list(batch.errors) == [False, False, False, False, True]
+    assert len(OperationHistory.get_all_records()) == 4
+
+
+def test_operation_errors_propagate():
+    """Exceptions raised in a worker are re-raised in the caller."""
+    pool = WorkerPool(1)
+    try:
+        with pytest.raises(ValueError):
+            pool.run(root_numbers, Decimal(8), Decimal(0))
+    finally:
+        pool.shutdown()
+
+
+def test_terminate_stops_busy_workers():
+    """terminate() stops a running operation in a forkserver or spawn worker."""
+    pool = WorkerPool(1)
+    with localcontext() as context:
+        context.prec = 200000
+        future = pool.submit(power_numbers, Decimal(2), Decimal("0.5"))
+    ready = pool.submit(add_numbers, Decimal(1), Decimal(1))
+    time.sleep(0.5)
+    started = time.perf_counter()
+    pool.terminate()
+    with pytest.raises(Exception):  # BrokenProcessPool or CancelledError
+        future.result(timeout=10)
+    assert ready.cancelled() or ready.done()
+    assert time.perf_counter() - started < 10
+    assert START_METHOD != "fork"